@@ -0,0 +1,183 @@
+"""
+Sylva Aggregation
+Vectorized group-by counts, sums and averages over a DetectionTable
+TamAir - Conrad Challenge 2026
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.detection_index import CATEGORICAL_FIELDS, NUMERIC_FIELDS, DetectionTable
+
+METRIC_FUNCTIONS = ("count", "sum", "avg", "min", "max")
+
+# Short names accepted in group_by and metrics
+FIELD_ALIASES = {
+    "weight": "estimated_weight_kg",
+    "size": "size_m2",
+    "water_risk": "water_risk_level",
+    "water_proximity": "water_proximity_m",
+}
+
+# Numeric columns that make sense as group keys
+NUMERIC_GROUP_FIELDS = ("month",)
+
+_METRIC_PATTERN = re.compile(r"^(\w+)(?:\((\w*)\))?$")
+
+Metric = Tuple[str, Optional[str], str]  # (function, column, output key)
+
+
+def _resolve(field: str) -> str:
+    return FIELD_ALIASES.get(field, field)
+
+
+def parse_group_by(value: Optional[str]) -> List[str]:
+    """
+    Parse 'location,month' into column names.
+
+    Raises:
+        ValueError: For an unknown or repeated field
+    """
+    fields = [f.strip() for f in (value or "").split(",") if f.strip()]
+    columns = []
+    for field in fields:
+        column = _resolve(field)
+        if column not in CATEGORICAL_FIELDS and column not in NUMERIC_GROUP_FIELDS:
+            allowed = ", ".join(CATEGORICAL_FIELDS + NUMERIC_GROUP_FIELDS)
+            raise ValueError(f"Cannot group by '{field}' (allowed: {allowed})")
+        if column in columns:
+            raise ValueError(f"Duplicate group_by field '{field}'")
+        columns.append(column)
+    return columns
+
+
+def parse_metrics(value: Optional[str]) -> List[Metric]:
+    """
+    Parse 'count,sum(weight),avg(confidence)'.
+
+    Returns:
+        List of (function, column or None, output key) - e.g. ('sum', 'estimated_weight_kg', 'sum_weight')
+
+    Raises:
+        ValueError: For an unknown function or field
+    """
+    metrics = []
+    for spec in [m.strip() for m in (value or "count").split(",") if m.strip()]:
+        match = _METRIC_PATTERN.match(spec.replace(" ", ""))
+        if not match or match.group(1) not in METRIC_FUNCTIONS:
+            raise ValueError(f"Unknown metric '{spec}' (use {', '.join(METRIC_FUNCTIONS)}, e.g. sum(weight))")
+
+        function, field = match.group(1), match.group(2)
+        if function == "count":
+            metrics.append(("count", None, "count"))
+            continue
+        if not field:
+            raise ValueError(f"Metric '{function}' needs a field, e.g. {function}(weight)")
+
+        column = _resolve(field)
+        if column not in NUMERIC_FIELDS:
+            raise ValueError(f"Cannot aggregate '{field}' (numeric fields: {', '.join(NUMERIC_FIELDS)})")
+        metrics.append((function, column, f"{function}_{field}"))
+    return metrics
+
+
+def _group_codes(table: DetectionTable, column: str, rows: Optional[np.ndarray]) -> Tuple[np.ndarray, List]:
+    """Dense codes and their display values for one group_by column."""
+    if column in CATEGORICAL_FIELDS:
+        raw = table.codes[column] if rows is None else table.codes[column][rows]
+        used, codes = np.unique(raw, return_inverse=True)
+        vocab = table.vocab[column]
+        labels = [vocab[code] if code >= 0 and vocab[code] != "" else None for code in used.tolist()]
+    else:
+        values, codes = np.unique(table.column(column, rows), return_inverse=True)
+        labels = [None if np.isnan(v) else int(v) if float(v).is_integer() else v for v in values.tolist()]
+    return codes.reshape(-1), labels
+
+
+def _round(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+def aggregate(
+    table: DetectionTable,
+    group_by: List[str],
+    metrics: List[Metric],
+    rows: Optional[np.ndarray] = None,
+) -> List[Dict]:
+    """
+    Group detections and compute metrics in one vectorized pass.
+
+    Group columns are turned into dense integer codes and combined into a
+    single key per row, so every metric is one np.bincount (or one
+    reduceat over the rows sorted by group) regardless of the number of groups.
+
+    Args:
+        table: Detection table
+        group_by: Column names to group by (empty for a single overall group)
+        metrics: Parsed metrics from parse_metrics
+        rows: Optional subset of rows (e.g. a bbox query)
+
+    Returns:
+        One dict per group with the group values and metric results, sorted by group
+    """
+    n = len(table) if rows is None else len(rows)
+    if n == 0:
+        return []
+
+    key_codes = []
+    key_labels = []
+    for column in group_by:
+        codes, labels = _group_codes(table, column, rows)
+        key_codes.append(codes)
+        key_labels.append(labels)
+
+    if key_codes:
+        keys = np.ravel_multi_index(key_codes, [len(labels) for labels in key_labels])
+        unique_keys, group = np.unique(keys, return_inverse=True)
+        group = group.reshape(-1)
+        group_parts = np.unravel_index(unique_keys, [len(labels) for labels in key_labels])
+    else:
+        group = np.zeros(n, dtype=np.int64)
+        group_parts = ()
+    n_groups = int(group.max()) + 1
+
+    results: Dict[str, np.ndarray] = {}
+    counts = np.bincount(group, minlength=n_groups)
+    order = starts = None
+
+    for function, column, key in metrics:
+        if function == "count":
+            results[key] = counts
+            continue
+
+        values = table.column(column, rows)
+        present = ~np.isnan(values)
+
+        if function in ("sum", "avg"):
+            sums = np.bincount(group, weights=np.where(present, values, 0.0), minlength=n_groups)
+            if function == "sum":
+                results[key] = sums
+            else:
+                n_present = np.bincount(group, weights=present, minlength=n_groups)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    results[key] = np.where(n_present > 0, sums / n_present, np.nan)
+        else:
+            # min/max: sort rows by group once, then reduce each contiguous run
+            if order is None:
+                order = np.argsort(group, kind="stable")
+                starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            fill = np.inf if function == "min" else -np.inf
+            reducer = np.minimum if function == "min" else np.maximum
+            reduced = reducer.reduceat(np.where(present, values, fill)[order], starts)
+            results[key] = np.where(np.isinf(reduced), np.nan, reduced)
+
+    groups = []
+    for g in range(n_groups):
+        entry = {column: key_labels[i][int(group_parts[i][g])] for i, column in enumerate(group_by)}
+        for _, _, key in metrics:
+            value = results[key][g]
+            entry[key] = int(value) if key == "count" else _round(value)
+        groups.append(entry)
+    return groups
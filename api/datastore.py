@@ -0,0 +1,161 @@
+"""
+Sylva Dataset Store
+Shared in-memory cache for the JSON/GeoJSON files served by the API
+TamAir - Conrad Challenge 2026
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# (st_mtime_ns, st_size) - cheap fingerprint of a file on disk
+Version = Tuple[int, int]
+
+
+class _Entry:
+    """One loaded file plus anything derived from it."""
+
+    __slots__ = ("version", "data", "derived")
+
+    def __init__(self, version: Version, data: Any):
+        self.version = version
+        self.data = data
+        self.derived: Dict[str, Any] = {}
+
+
+class DatasetStore:
+    """
+    Load each dataset file once and keep it in memory.
+
+    Every access does a single stat() call and compares mtime and size with the
+    cached copy. The file is only re-read when it actually changed, and the new
+    entry replaces the old one in a single assignment so concurrent readers see
+    either the old or the new data, never a half-loaded mix.
+
+    Cached objects are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[Path, str], _Entry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[Version]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _read_json(path: Path) -> Any:
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _read_bytes(path: Path) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _entry(self, path: Path, kind: str, loader: Callable[[Path], Any]) -> Optional[_Entry]:
+        """Return an up-to-date entry for path, loading it if needed."""
+        path = Path(path)
+        version = self._stat(path)
+        if version is None:
+            return None
+
+        key = (path, kind)
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            with self._lock:
+                self.hits += 1
+            return entry
+
+        try:
+            data = loader(path)
+        except (OSError, ValueError):
+            # File is being rewritten - keep serving the previous copy
+            if entry is not None:
+                return entry
+            raise
+
+        new_entry = _Entry(version, data)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+            self._entries[key] = new_entry
+        return new_entry
+
+    def get(self, path: Path, default: Any = None) -> Any:
+        """Get the parsed contents of a JSON file, or default if it does not exist."""
+        entry = self._entry(path, "json", self._read_json)
+        return default if entry is None else entry.data
+
+    def get_bytes(self, path: Path) -> Optional[bytes]:
+        """Get the raw bytes of a file without parsing it."""
+        entry = self._entry(path, "bytes", self._read_bytes)
+        return None if entry is None else entry.data
+
+    def derive(self, path: Path, name: str, builder: Callable[..., Any], raw: bool = False,
+               versioned: bool = False) -> Any:
+        """
+        Get a value computed from a file's contents, cached alongside the file.
+
+        The builder runs once per file version and its result is dropped together
+        with the file when it changes on disk.
+
+        Args:
+            path: Source file
+            name: Cache key for the derived value
+            builder: Called with the parsed JSON (or raw bytes if raw=True)
+            raw: Build from the raw bytes instead of the parsed JSON
+            versioned: Also pass the Version of the contents being built from,
+                as builder(data, version)
+
+        Returns:
+            The builder's result, or None if the file does not exist
+        """
+        if raw:
+            entry = self._entry(path, "bytes", self._read_bytes)
+        else:
+            entry = self._entry(path, "json", self._read_json)
+        if entry is None:
+            return None
+
+        derived = entry.derived
+        if name not in derived:
+            derived[name] = builder(entry.data, entry.version) if versioned else builder(entry.data)
+        return derived[name]
+
+    def version(self, path: Path) -> Optional[Version]:
+        """Get the current on-disk fingerprint of a file."""
+        return self._stat(Path(path))
+
+    def invalidate(self, path: Optional[Path] = None):
+        """Drop one file (or everything) from the cache."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                path = Path(path)
+                for key in [k for k in self._entries if k[0] == path]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict:
+        """Get cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.reloads
+            return {
+                "files_cached": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,235 @@
+"""
+Sylva Detection Index
+Columnar NumPy view of a detection FeatureCollection for fast filtering
+TamAir - Conrad Challenge 2026
+"""
+
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from api.spatial import GridIndex
+from simulation.clustering import ClusterIndex
+from simulation.columnar import ColumnarDataset
+
+# Detection properties stored as float64 columns (missing values become NaN)
+NUMERIC_FIELDS = (
+    "confidence",
+    "estimated_weight_kg",
+    "size_m2",
+    "month",
+    "water_proximity_m",
+)
+
+# Detection properties stored as dictionary-encoded int32 codes
+CATEGORICAL_FIELDS = (
+    "location",
+    "category",
+    "priority",
+    "water_risk_level",
+)
+
+
+class _LazyColumns(dict):
+    """Columns built by their builder the first time they are looked up."""
+
+    def __init__(self, builders: Dict[str, Callable[[], np.ndarray]]):
+        super().__init__()
+        self._builders = builders
+
+    def __missing__(self, name: str) -> np.ndarray:
+        if name not in self._builders:
+            raise KeyError(name)
+        column = self[name] = self._builders[name]()
+        return column
+
+
+def _float_column(dataset: ColumnarDataset, name: str) -> np.ndarray:
+    """A sidecar column as float64 with missing rows as NaN (copies int columns and columns with nulls)."""
+    values = np.asarray(dataset.column(name), dtype=np.float64)
+    missing = dataset.missing(name)
+    return values if missing is None else np.where(missing, np.nan, values)
+
+
+class DetectionTable:
+    """
+    Column-oriented copy of detection features.
+
+    Built once per dataset version. Coordinates and numeric properties live in
+    NumPy arrays, string properties are stored as integer codes into a small
+    vocabulary, so filters become vectorized boolean masks. The original
+    Feature dicts are kept so only matching rows are ever touched when
+    building a response.
+
+    Every mask method takes an optional `rows` array. When given, the mask is
+    computed for those rows only (e.g. the result of a bounding-box query), so
+    the cost follows the candidate set rather than the whole table.
+
+    A table opened from a column sidecar (see from_columnar) has no Feature
+    dicts in memory; features are rebuilt from the columns for returned rows.
+    """
+
+    def __init__(
+        self,
+        lon: np.ndarray,
+        lat: np.ndarray,
+        numeric: Dict[str, np.ndarray],
+        codes: Dict[str, np.ndarray],
+        vocab: Dict[str, List[str]],
+        features: Optional[List[Dict]],
+        columns: Optional[ColumnarDataset] = None,
+    ):
+        self.lon = lon
+        self.lat = lat
+        self.numeric = numeric
+        self.codes = codes
+        self.vocab = vocab
+        self.features = features
+        self.columns = columns
+        self._spatial_index: Optional[GridIndex] = None
+        self._cluster_index: Optional[ClusterIndex] = None
+
+    @classmethod
+    def from_geojson(cls, data: Dict) -> "DetectionTable":
+        """Build a table from a GeoJSON FeatureCollection of Point features."""
+        features = data.get("features", []) if data else []
+        props = [f.get("properties") or {} for f in features]
+
+        coords = np.array(
+            [f["geometry"]["coordinates"][:2] for f in features],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+
+        numeric = {
+            name: np.array([p.get(name) for p in props], dtype=np.float64)
+            for name in NUMERIC_FIELDS
+        }
+
+        codes = {}
+        vocab = {}
+        for name in CATEGORICAL_FIELDS:
+            values = np.array([str(p.get(name) or "") for p in props], dtype=str)
+            uniques, inverse = np.unique(values, return_inverse=True)
+            codes[name] = inverse.astype(np.int32)
+            vocab[name] = uniques.tolist()
+
+        return cls(coords[:, 0], coords[:, 1], numeric, codes, vocab, features)
+
+    @classmethod
+    def from_columnar(cls, dataset: ColumnarDataset) -> "DetectionTable":
+        """
+        Build a table over a memory-mapped column sidecar without parsing JSON.
+
+        Coordinates, float64 columns without nulls and string codes are used
+        in place (no copy), so pages are only read from disk when a filter
+        actually touches them. Int columns (month) and columns with a null mask
+        need a float64 copy with NaN for missing rows; that copy is made the
+        first time the column is used, not when the table is built.
+        """
+        n = len(dataset)
+
+        builders = {}
+        for name in NUMERIC_FIELDS:
+            if name not in dataset or dataset.kind(name) not in ("float", "int"):
+                builders[name] = partial(np.full, n, np.nan)
+            else:
+                builders[name] = partial(_float_column, dataset, name)
+        numeric = _LazyColumns(builders)
+
+        codes = {}
+        vocab = {}
+        for name in CATEGORICAL_FIELDS:
+            if name in dataset and dataset.kind(name) == "str":
+                codes[name] = dataset.column(name)  # missing rows are -1 and never match
+                vocab[name] = dataset.vocab(name)
+            else:
+                codes[name] = np.full(n, -1, dtype=np.int32)
+                vocab[name] = []
+
+        return cls(dataset.lon, dataset.lat, numeric, codes, vocab, None, columns=dataset)
+
+    def __len__(self) -> int:
+        return len(self.lon)
+
+    @property
+    def confidence(self) -> np.ndarray:
+        return self.numeric["confidence"]
+
+    @property
+    def weight(self) -> np.ndarray:
+        return self.numeric["estimated_weight_kg"]
+
+    @property
+    def spatial_index(self) -> GridIndex:
+        """Grid index over the detection points, built on first use."""
+        if self._spatial_index is None:
+            self._spatial_index = GridIndex(self.lon, self.lat)
+        return self._spatial_index
+
+    @property
+    def cluster_index(self) -> ClusterIndex:
+        """Zoom-level cluster index over the detection points, built on first use."""
+        if self._cluster_index is None:
+            priorities = (self.vocab["priority"] + [""])
+            self._cluster_index = ClusterIndex(
+                self.lon,
+                self.lat,
+                self.weight,
+                [priorities[code] for code in self.codes["priority"].tolist()],
+            )
+        return self._cluster_index
+
+    def column(self, name: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Get a numeric column, optionally restricted to some rows."""
+        values = self.numeric[name]
+        return values if rows is None else values[rows]
+
+    def all_rows(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Boolean mask selecting every row."""
+        return np.ones(len(self) if rows is None else len(rows), dtype=bool)
+
+    def mask_equals(self, field: str, value: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rows whose categorical field equals value exactly."""
+        codes = self.codes[field] if rows is None else self.codes[field][rows]
+        try:
+            code = self.vocab[field].index(value)
+        except ValueError:
+            return np.zeros(len(codes), dtype=bool)
+        return codes == code
+
+    def mask_where(self, field: str, predicate: Callable[[str], bool], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Rows whose categorical field satisfies predicate.
+
+        The predicate runs once per distinct value rather than once per row.
+        """
+        codes = self.codes[field] if rows is None else self.codes[field][rows]
+        matching = [i for i, value in enumerate(self.vocab[field]) if predicate(value)]
+        if not matching:
+            return np.zeros(len(codes), dtype=bool)
+        return np.isin(codes, matching)
+
+    def features_at(self, indices: np.ndarray) -> List[Dict]:
+        """Get the Feature dicts for the given row indices (shared, read-only)."""
+        if self.features is None:
+            return self.columns.features_at(indices)
+        features = self.features
+        return [features[i] for i in indices.tolist()]
+
+
+def select_rows(mask: np.ndarray, limit: Optional[int] = None, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Turn a boolean mask into row indices, keeping file order.
+
+    Args:
+        mask: Mask over the whole table, or over `rows` if given
+        limit: Keep at most this many rows
+        rows: Sorted candidate rows the mask was computed for
+    """
+    indices = np.flatnonzero(mask)
+    if rows is not None:
+        indices = rows[indices]
+    if limit:
+        indices = indices[:limit]
+    return indices
@@ -0,0 +1,232 @@
+"""
+Sylva Jobs
+Background jobs with progress tracking for long-running requests
+TamAir - Conrad Challenge 2026
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+from api.workers import MAX_CPU_BACKLOG
+
+MAX_ACTIVE_JOBS = MAX_CPU_BACKLOG  # queued + running; more are refused
+MAX_FINISHED_JOBS = 200  # finished jobs kept for polling, oldest dropped first
+TIMING_WINDOW = 200  # recent jobs used for the wait/run time metrics
+HEARTBEAT_SECONDS = 15.0
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """
+    One background job and its progress.
+
+    A job is queued until its first progress report (or its result) arrives,
+    so wait_seconds measures time spent waiting for a free worker.
+    """
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.status = QUEUED
+        self.stage: Optional[str] = None
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now().isoformat()
+        self._created = time.monotonic()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self.version = 0  # bumped on every change
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def wait_seconds(self) -> float:
+        return (self._started or time.monotonic()) - self._created
+
+    @property
+    def run_seconds(self) -> float:
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.monotonic()) - self._started
+
+    def _touch(self):
+        self.version += 1
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _start(self):
+        if self._started is None:
+            self._started = time.monotonic()
+            self.status = RUNNING
+
+    def report(self, stage: str, fraction: float):
+        """Progress callback: (stage name, overall fraction done)."""
+        if self.finished:
+            return  # a late report from the worker
+        self._start()
+        self.stage = stage
+        self.progress = max(self.progress, min(fraction, 1.0))
+        self._touch()
+
+    def _finish(self, status: str, result: Any = None, error: Optional[str] = None):
+        self._start()
+        self._finished = time.monotonic()
+        self.status = status
+        self.result = result
+        self.error = error
+        if status == DONE:
+            self.progress = 1.0
+        self._touch()
+
+    async def updates(self, heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[Optional[Dict]]:
+        """
+        Yield the job's state now and after every change, until it finishes.
+
+        Yields None when nothing changed for heartbeat seconds.
+        """
+        version = None
+        while True:
+            if self.version != version:
+                version = self.version
+                yield self.to_dict()
+                if self.finished:
+                    return
+                continue
+            try:
+                await asyncio.wait_for(self._changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "created_at": self.created_at,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "run_seconds": round(self.run_seconds, 3),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Track background jobs so slow requests can answer with a job id at once.
+
+    The work itself runs wherever the job's coroutine sends it (normally the
+    bounded CPU pool in api.workers); the queue limits how many jobs may be
+    queued or running, keeps finished ones around for polling, and records
+    queue depth, wait and run times for sizing the pool.
+
+    Admission is decided here only: an accepted job's coroutine should wait
+    for the CPU pool (run_cpu(..., wait=True)) rather than fail when
+    synchronous requests have filled its backlog, so wait_seconds covers
+    that wait too.
+    """
+
+    def __init__(self, max_active: int = MAX_ACTIVE_JOBS, max_finished: int = MAX_FINISHED_JOBS):
+        self.max_active = max_active
+        self.max_finished = max_finished
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._waits: Deque[float] = deque(maxlen=TIMING_WINDOW)
+        self._runs: Deque[float] = deque(maxlen=TIMING_WINDOW)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def submit(self, kind: str, run: Callable[[Job], Awaitable[Any]]) -> Optional[Job]:
+        """
+        Start run(job) in the background.
+
+        run should pass job.report on as its progress callback; its return
+        value becomes the job's result and an exception marks it failed.
+
+        Returns:
+            The new job, or None when max_active jobs are already in progress
+        """
+        if len(self._tasks) >= self.max_active:
+            self.rejected += 1
+            return None
+
+        job = Job(kind)
+        self.jobs[job.id] = job
+        self.submitted += 1
+        self._tasks[job.id] = asyncio.create_task(self._run(job, run))
+        self._evict()
+        return job
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[Any]]):
+        try:
+            result = await run(job)
+        except asyncio.CancelledError:
+            job._finish(FAILED, error="cancelled")
+            raise
+        except Exception as e:
+            self.failed += 1
+            job._finish(FAILED, error=str(e) or type(e).__name__)
+        else:
+            self.completed += 1
+            job._finish(DONE, result=result)
+        finally:
+            self._tasks.pop(job.id, None)
+            self._waits.append(job.wait_seconds)
+            self._runs.append(job.run_seconds)
+
+    def _evict(self):
+        """Drop the oldest finished jobs beyond max_finished."""
+        excess = len(self.jobs) - len(self._tasks) - self.max_finished
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished][:max(excess, 0)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def shutdown(self):
+        """Cancel every job still queued or running."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    @staticmethod
+    def _timings(values: Deque[float]) -> Dict:
+        if not values:
+            return {"avg": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(values)
+        return {
+            "avg": round(sum(ordered) / len(ordered), 3),
+            "p95": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)], 3),
+            "max": round(ordered[-1], 3),
+        }
+
+    def stats(self) -> Dict:
+        """Queue depth, counters, and wait/run times (seconds) of recent jobs."""
+        active = [self.jobs[job_id] for job_id in self._tasks if job_id in self.jobs]
+        queued = [job for job in active if job.status == QUEUED]
+        return {
+            "queue_depth": len(queued),
+            "running": len(active) - len(queued),
+            "max_active": self.max_active,
+            "oldest_queued_seconds": round(max((job.wait_seconds for job in queued), default=0.0), 3),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_seconds": self._timings(self._waits),
+            "run_seconds": self._timings(self._runs),
+        }
@@ -0,0 +1,830 @@
+"""
+Sylva Live Demo
+Precomputed playback schedules for the /ws/live demo stream
+TamAir - Conrad Challenge 2026
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import struct
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+from fastapi import WebSocketDisconnect
+
+from api.responses import dumps_json
+
+logger = logging.getLogger(__name__)
+
+MAX_LIVE_SESSIONS = 200  # concurrent /ws/live connections per process
+DEFAULT_TARGET_FPS = 20  # frames per second sent unless the client asks otherwise
+MAX_TARGET_FPS = 60
+SUBSCRIBER_QUEUE_SIZE = 64  # messages buffered per broadcast viewer before the oldest is dropped
+
+GRID_CELL_STEPS = 4  # nearest-frame grid cell size, in typical frame spacings
+MAX_GRID_RINGS = 8  # detections still unresolved after this many rings are brute-forced
+
+
+def parse_epoch(timestamp: Optional[str]) -> float:
+    """
+    ISO-8601 timestamp to epoch seconds (naive timestamps are taken as UTC).
+
+    Returns:
+        Seconds since the epoch, or NaN for a missing or malformed timestamp
+    """
+    if not timestamp:
+        return np.nan
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return np.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class RevealSchedule:
+    """
+    When each detection appears during playback.
+
+    A detection is revealed on the first frame whose timestamp is at or after
+    its own; detections without a timestamp are never revealed, and only the
+    first detection seen with a given id is kept. Detections are sorted once
+    by reveal frame (ties keep their input order), so the reveals up to any
+    frame are a prefix of that order and each tick only touches the
+    detections it actually reveals.
+    """
+
+    def __init__(self, frames: Sequence[Dict], detections: Sequence[Dict]):
+        frame_times = np.array([parse_epoch(f.get("timestamp")) for f in frames], dtype=np.float64)
+        # Frames without a timestamp reveal nothing new; a frame reveals everything
+        # up to the latest timestamp seen so far
+        frame_times = np.maximum.accumulate(np.where(np.isnan(frame_times), -np.inf, frame_times))
+        det_times = np.array(
+            [parse_epoch(d["properties"].get("timestamp")) for d in detections],
+            dtype=np.float64,
+        )
+
+        reveal_frame = np.searchsorted(frame_times, det_times, side="left")
+        reveal_frame[np.isnan(det_times)] = len(frames)  # never
+        order = np.argsort(reveal_frame, kind="stable")
+
+        seen_ids = set()
+        kept = []
+        for idx in order.tolist():
+            if reveal_frame[idx] >= len(frames):
+                break
+            det_id = detections[idx]["properties"]["id"]
+            if det_id not in seen_ids:
+                seen_ids.add(det_id)
+                kept.append(idx)
+
+        self.detections: List[Dict] = [detections[idx] for idx in kept]
+        self.reveal_frame = reveal_frame[kept]
+        self.total_frames = len(frames)
+        self.frame_elapsed = np.maximum.accumulate(
+            np.array([f.get("elapsed_seconds", 0.0) for f in frames], dtype=np.float64)
+        )
+
+    def __len__(self) -> int:
+        return len(self.detections)
+
+    def revealed_by(self, frame_idx: int) -> int:
+        """Number of detections visible once frame_idx has been shown."""
+        return int(np.searchsorted(self.reveal_frame, frame_idx, side="right"))
+
+    def reveal(self, shown: int, frame_idx: int) -> List[Dict]:
+        """
+        Detections newly visible at frame_idx, given `shown` already sent.
+
+        Frames may be skipped; everything due up to frame_idx is returned.
+        """
+        return self.detections[shown:self.revealed_by(frame_idx)]
+
+    def frame_at_elapsed(self, seconds: float) -> int:
+        """Last frame at or before an elapsed flight time."""
+        return max(int(np.searchsorted(self.frame_elapsed, seconds, side="right")) - 1, 0)
+
+    def seek(self, kind: str, value: float, n_waypoints: int, start_frame: int = 0) -> int:
+        """
+        Resolve a jump request to a frame index within the flight.
+
+        Args:
+            kind: "frame", "elapsed" (seconds), "waypoint" or "reset" (back to start_frame)
+        """
+        if kind == "reset":
+            target = start_frame
+        elif kind == "waypoint":
+            target = waypoint_frame(int(value), n_waypoints, self.total_frames)
+        elif kind == "elapsed":
+            target = self.frame_at_elapsed(float(value))
+        else:
+            target = int(value)
+        return min(max(target, 0), self.total_frames - 1)
+
+    def snapshot(self, frame_idx: int) -> Dict:
+        """
+        Everything shown once frame_idx has played, as one message.
+
+        Built with a single binary search instead of replaying the frames
+        before it; the frame itself then reveals nothing new.
+        """
+        shown = self.revealed_by(frame_idx)
+        return {
+            "type": "snapshot",
+            "frame_index": frame_idx,
+            "total_shown": shown,
+            "reset_detections": True,
+            "detections": self.detections[:shown],
+        }
+
+
+def _ring_offsets(r: int) -> np.ndarray:
+    """(dx, dy) offsets of the cells at Chebyshev distance r."""
+    if r == 0:
+        return np.zeros((1, 2), dtype=np.int64)
+    side = np.arange(-r, r + 1)
+    edge = np.arange(-r + 1, r)
+    return np.concatenate([
+        np.column_stack([side, np.full_like(side, -r)]),
+        np.column_stack([side, np.full_like(side, r)]),
+        np.column_stack([np.full_like(edge, -r), edge]),
+        np.column_stack([np.full_like(edge, r), edge]),
+    ])
+
+
+def nearest_frames(
+    frame_lon: np.ndarray,
+    frame_lat: np.ndarray,
+    lon: np.ndarray,
+    lat: np.ndarray,
+) -> np.ndarray:
+    """
+    Index of the closest frame for each point (planar distance in degrees).
+
+    Frames are bucketed into a uniform grid a few frame spacings wide and each
+    point searches outwards ring by ring until no unvisited cell can hold a
+    closer frame, so the cost follows the number of nearby frames rather than
+    the length of the flight. Ties go to the earliest frame, matching a linear
+    scan.
+
+    Returns:
+        Frame index per point (0 when there are no frames)
+    """
+    frame_lon = np.asarray(frame_lon, dtype=np.float64)
+    frame_lat = np.asarray(frame_lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    n, m = len(lon), len(frame_lon)
+    if n == 0 or m == 0:
+        return np.zeros(n, dtype=np.int64)
+
+    steps = np.hypot(np.diff(frame_lon), np.diff(frame_lat))
+    steps = steps[steps > 0]
+    span = max(np.ptp(frame_lon), np.ptp(frame_lat))
+    cell = max(float(np.median(steps)) * GRID_CELL_STEPS if len(steps) else 0.0, span / 2048)
+    if cell == 0:
+        return np.zeros(n, dtype=np.int64)  # every frame at the same spot
+
+    lon0, lat0 = frame_lon.min(), frame_lat.min()
+    fx = np.floor((frame_lon - lon0) / cell).astype(np.int64)
+    fy = np.floor((frame_lat - lat0) / cell).astype(np.int64)
+    width, height = int(fx.max()) + 1, int(fy.max()) + 1
+    frame_order = np.argsort(fy * width + fx, kind="stable")
+    frame_keys = (fy * width + fx)[frame_order]
+
+    px = np.floor((lon - lon0) / cell).astype(np.int64)
+    py = np.floor((lat - lat0) / cell).astype(np.int64)
+    best_dist = np.full(n, np.inf)
+    best = np.zeros(n, dtype=np.int64)
+    pending = np.arange(n)
+
+    for r in range(MAX_GRID_RINGS + 1):
+        offsets = _ring_offsets(r)
+        cx = (px[pending][:, None] + offsets[:, 0]).ravel()
+        cy = (py[pending][:, None] + offsets[:, 1]).ravel()
+        owner = np.repeat(pending, len(offsets))
+        inside = (cx >= 0) & (cx < width) & (cy >= 0) & (cy < height)
+        owner, keys = owner[inside], (cy * width + cx)[inside]
+
+        starts = np.searchsorted(frame_keys, keys, "left")
+        lengths = np.searchsorted(frame_keys, keys, "right") - starts
+        if lengths.sum():
+            owner = np.repeat(owner, lengths)
+            offsets_in = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            cand = frame_order[np.repeat(starts, lengths) + offsets_in]
+            dist = np.sqrt((frame_lat[cand] - lat[owner]) ** 2 + (frame_lon[cand] - lon[owner]) ** 2)
+
+            # Best candidate per point: smallest distance, then earliest frame
+            order = np.lexsort((cand, dist, owner))
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = owner[order][1:] != owner[order][:-1]
+            pick = order[first]
+            owner, cand, dist = owner[pick], cand[pick], dist[pick]
+            better = (dist < best_dist[owner]) | ((dist == best_dist[owner]) & (cand < best[owner]))
+            best_dist[owner[better]] = dist[better]
+            best[owner[better]] = cand[better]
+
+        # Frames in rings beyond r are at least r cells away
+        pending = pending[best_dist[pending] >= r * cell * (1 - 1e-9)]
+        if not len(pending):
+            return best
+
+    # Points far from the flight: plain vectorized scan, in chunks
+    chunk = max(1, 2_000_000 // m)
+    for i in range(0, len(pending), chunk):
+        rows = pending[i:i + chunk]
+        dist = np.sqrt((frame_lat[None, :] - lat[rows, None]) ** 2 + (frame_lon[None, :] - lon[rows, None]) ** 2)
+        best[rows] = np.argmin(dist, axis=1)
+    return best
+
+
+class DemoPlan:
+    """
+    Playback plan for one location: detections in flight-path order plus their
+    reveal schedule. Depends only on the data files, so it is built once and
+    shared by every demo run.
+    """
+
+    def __init__(self, frames: Sequence[Dict], detections: Sequence[Dict]):
+        coords = np.array([d["geometry"]["coordinates"][:2] for d in detections], dtype=np.float64).reshape(-1, 2)
+        nearest = nearest_frames(
+            np.array([f["lon"] for f in frames], dtype=np.float64),
+            np.array([f["lat"] for f in frames], dtype=np.float64),
+            coords[:, 0],
+            coords[:, 1],
+        )
+        self.frames = frames
+        self.detections: List[Dict] = [detections[i] for i in np.argsort(nearest, kind="stable").tolist()]
+        self.schedule = RevealSchedule(frames, self.detections)
+
+
+def waypoint_frame(waypoint: int, n_waypoints: int, total_frames: int) -> int:
+    """First animation frame of a waypoint leg (legs are spread evenly over the flight)."""
+    if n_waypoints <= 0 or waypoint <= 0:
+        return 0
+    return int((waypoint / n_waypoints) * total_frames)
+
+
+# =============================================================================
+# BINARY PROTOCOL
+# =============================================================================
+
+BINARY_SUBPROTOCOL = "sylva.live.v1"
+
+# Frame messages are binary, little-endian:
+#   u8  kind (1 = frame)   u8  flags          u16 waypoint (0xFFFF = none)
+#   u32 frame_index        f32 progress       f32 elapsed_seconds
+#   u32 reveal_start       u32 reveal_count   f32 altitude
+# then either i32 lat, i32 lon in 1e-7 degrees (FLAG_KEYFRAME) or i16 dlat,
+# i16 dlon relative to the previous frame message. Newly revealed detections
+# are catalog[reveal_start:reveal_start + reveal_count], where catalog is the
+# "detections" list sent once in demo_start. All other messages stay JSON text.
+FRAME_HEADER = struct.Struct("<BBHIffIIf")
+KEY_POSITION = struct.Struct("<ii")
+DELTA_POSITION = struct.Struct("<hh")
+FRAME_KIND = 1
+FLAG_KEYFRAME = 1
+FLAG_DETECTION_EVENT = 2  # last revealed detection goes to the CV panel
+NO_WAYPOINT = 0xFFFF
+POSITION_SCALE = 1e7
+
+Encoded = Union[str, bytes]
+
+
+class FrameEncoder:
+    """
+    Encoder for the binary subprotocol, one per outgoing stream.
+
+    Frames shrink from a few hundred bytes of JSON (plus full detection
+    Features) to 30-34 bytes: detections are referenced by their index in the
+    catalog sent with demo_start and positions are deltas from the previous
+    frame, falling back to a keyframe when a delta does not fit in 16 bits.
+    """
+
+    def __init__(self):
+        self._position: Optional[Tuple[int, int]] = None
+
+    def frame(self, message: Dict) -> Tuple[bytes, bytes]:
+        """
+        Encode a frame message.
+
+        Returns:
+            (chained, keyframe) - the frame as the next message of this stream,
+            and as a standalone keyframe for a receiver that missed frames
+        """
+        position = message["position"]
+        lat = int(round(position["lat"] * POSITION_SCALE))
+        lon = int(round(position["lon"] * POSITION_SCALE))
+        new = message.get("new_detections") or []
+        shown = message.get("total_shown", message.get("detections_shown", 0))
+        flags = FLAG_DETECTION_EVENT if message.get("detection_event") else 0
+        waypoint = message.get("current_waypoint")
+        header = (
+            NO_WAYPOINT if waypoint is None else waypoint,
+            message["frame_index"],
+            message.get("progress", 0.0),
+            message.get("elapsed_seconds", 0.0),
+            shown - len(new),
+            len(new),
+            position.get("altitude", message.get("altitude", 0.0)),
+        )
+
+        keyframe = FRAME_HEADER.pack(FRAME_KIND, flags | FLAG_KEYFRAME, *header) + KEY_POSITION.pack(lat, lon)
+        previous, self._position = self._position, (lat, lon)
+        if previous is None:
+            return keyframe, keyframe
+        dlat, dlon = lat - previous[0], lon - previous[1]
+        if max(abs(dlat), abs(dlon)) > 32767:
+            return keyframe, keyframe
+        return FRAME_HEADER.pack(FRAME_KIND, flags, *header) + DELTA_POSITION.pack(dlat, dlon), keyframe
+
+    def encode(self, message: Dict, detections: Optional[List[Dict]] = None) -> Encoded:
+        """
+        Encode any message: frames as binary, everything else as JSON text.
+
+        Args:
+            detections: Catalog to include with demo_start
+        """
+        kind = message.get("type")
+        if kind == "frame":
+            return self.frame(message)[0]
+        if kind == "demo_start":
+            self._position = None
+            message = {**message, "protocol": BINARY_SUBPROTOCOL, "detections": detections or []}
+        elif kind == "snapshot":
+            # Shown detections are always a catalog prefix: total_shown is enough
+            message = {k: v for k, v in message.items() if k != "detections"}
+        return dumps_json(message).decode("utf-8")
+
+
+def decode_frame(data: bytes, previous: Optional[Tuple[int, int]] = None) -> Dict:
+    """
+    Decode a binary frame (reference for clients; checked in benchmarks/binary_frames.py).
+
+    Args:
+        previous: (lat, lon) in 1e-7 degrees from the previous frame, for deltas
+    """
+    _, flags, waypoint, frame_index, progress, elapsed, start, count, altitude = FRAME_HEADER.unpack_from(data)
+    if flags & FLAG_KEYFRAME:
+        lat, lon = KEY_POSITION.unpack_from(data, FRAME_HEADER.size)
+    else:
+        dlat, dlon = DELTA_POSITION.unpack_from(data, FRAME_HEADER.size)
+        lat, lon = previous[0] + dlat, previous[1] + dlon
+    return {
+        "frame_index": frame_index,
+        "progress": progress,
+        "elapsed_seconds": elapsed,
+        "current_waypoint": None if waypoint == NO_WAYPOINT else waypoint,
+        "reveal": (start, count),
+        "detection_event": bool(flags & FLAG_DETECTION_EVENT),
+        "altitude": altitude,
+        "position": (lat, lon),
+    }
+
+
+async def send_encoded(websocket: Any, data: Encoded):
+    if isinstance(data, bytes):
+        await websocket.send_bytes(data)
+    else:
+        await websocket.send_text(data)
+
+
+# =============================================================================
+# COMMAND VALUES
+# =============================================================================
+
+class InvalidCommand(ValueError):
+    """A /ws/live command value of the wrong type or out of range."""
+
+
+def command_number(data: Dict, key: str, default: Optional[float] = None,
+                   integer: bool = False, positive: bool = False) -> Union[int, float]:
+    """
+    Read a numeric command value, checked before it reaches the session.
+
+    Args:
+        default: Used when key is missing (None makes the key required)
+        integer: Require a whole number (returned as int)
+        positive: Require > 0 instead of >= 0
+
+    Raises:
+        InvalidCommand: When the value is not a finite number in range
+    """
+    value = data.get(key, default)
+    kind = "a whole number" if integer else "a number"
+    bound = "> 0" if positive else ">= 0"
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise InvalidCommand(f"{key} must be {kind} {bound}")
+    if (value <= 0 if positive else value < 0) or (integer and value != int(value)):
+        raise InvalidCommand(f"{key} must be {kind} {bound}")
+    return int(value) if integer else float(value)
+
+
+# =============================================================================
+# SESSIONS
+# =============================================================================
+
+class LiveSession:
+    """
+    One /ws/live connection: its own playback state and demo task.
+
+    Pause, speed and reset only touch this session's state, and the demo runs
+    as a separate asyncio task so the connection keeps reading commands while
+    frames stream out. Commands set a wake-up event that the demo task waits
+    on between frames, so they take effect before the next frame is sent.
+
+    Frames are paced by a monotonic playback clock (see advance) and sessions
+    that negotiated BINARY_SUBPROTOCOL get binary frames.
+    """
+
+    def __init__(self, session_id: int, websocket: Any, binary: bool = False):
+        self.id = session_id
+        self.websocket = websocket
+        self.encoder = FrameEncoder() if binary else None
+        self.state: Dict[str, Any] = {
+            "is_running": False,
+            "current_frame": 0,
+            "speed_multiplier": 1.0,
+            "location": "stinson_beach",
+            "start_waypoint": 0,
+            "target_fps": DEFAULT_TARGET_FPS,
+        }
+        self.task: Optional[asyncio.Task] = None
+        self.pending_jump: Optional[Tuple[str, float]] = None
+        self._changed = asyncio.Event()
+
+        # Playback clock: fractional frame position, advanced at the current speed while running
+        self._interval = 0.05
+        self._position = 0.0
+        self._stamp = time.monotonic()
+        self._last_slot = self._stamp
+
+    @property
+    def demo_running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    async def send(self, message: Dict, detections: Optional[List[Dict]] = None):
+        """
+        Send a message in this session's protocol.
+
+        Args:
+            detections: Detection catalog, passed with demo_start (used by binary clients)
+        """
+        if self.encoder is None:
+            await self.websocket.send_json(message)
+        else:
+            await send_encoded(self.websocket, self.encoder.encode(message, detections))
+
+    # Control side (called from the receive loop)
+
+    def update(self, **changes):
+        """Change playback state (is_running, speed_multiplier, target_fps) and wake the demo."""
+        self._settle()  # time so far counts at the old speed
+        if "target_fps" in changes:
+            changes["target_fps"] = min(max(float(changes["target_fps"]), 1.0), MAX_TARGET_FPS)
+        self.state.update(changes)
+        self._changed.set()
+
+    def jump(self, kind: str, value: float = 0):
+        """Ask the demo to move: jump("frame", 120), jump("elapsed", 90.0), jump("waypoint", 3) or jump("reset")."""
+        self.pending_jump = (kind, value)
+        self._changed.set()
+
+    # Demo side (called from the demo task)
+
+    def poll(self) -> Optional[Tuple[str, float]]:
+        """Acknowledge pending commands and take the requested jump, if any."""
+        self._changed.clear()
+        target, self.pending_jump = self.pending_jump, None
+        return target
+
+    async def wait_running(self):
+        """Block while paused."""
+        while not self.state["is_running"]:
+            self._changed.clear()
+            await self._changed.wait()
+
+    async def pace(self, delay: float):
+        """Sleep between frames, cut short as soon as a command arrives."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _speed(self) -> float:
+        return max(float(self.state["speed_multiplier"]), 1e-3)
+
+    def _settle(self):
+        """Bring the playback clock up to now."""
+        now = time.monotonic()
+        if self.state["is_running"]:
+            self._position += (now - self._stamp) * self._speed() / self._interval
+        self._stamp = now
+
+    def start_clock(self, frame_idx: int, interval: float):
+        """
+        Put the playback clock at a frame (demo start, jumps, seeks).
+
+        Args:
+            interval: Seconds per frame at speed 1
+        """
+        self._interval = interval
+        self._position = float(frame_idx)
+        self._stamp = self._last_slot = time.monotonic()
+
+    async def advance(self, frame_idx: int, last_frame: int) -> int:
+        """
+        Wait for the next send slot and return the frame to show in it.
+
+        Slots are one frame interval apart (at least 1/target_fps) on a
+        monotonic clock and are scheduled from the previous slot rather than
+        from when the last send finished, so serialization and network time
+        do not add up to drift. The frame shown is wherever the playback clock
+        is, so frames between slots - at high speeds, or after a slow send -
+        are skipped; their detections are revealed with the next frame sent.
+        Skipping never passes last_frame, so the final reveals always go out.
+        Returns early when a jump is pending or the demo is paused.
+        """
+        while True:
+            slot = max(self._interval / self._speed(), 1.0 / self.state["target_fps"])
+            due = self._last_slot + slot
+            remaining = due - time.monotonic()
+            if remaining <= 0 or self.pending_jump is not None or not self.state["is_running"]:
+                break
+            self._changed.clear()
+            await self.pace(remaining)  # a speed or fps change re-plans the slot
+
+        now = time.monotonic()
+        self._last_slot = due if due > now - slot else now  # far behind: restart the grid, no burst
+        self._settle()
+        return max(frame_idx + 1, min(int(self._position), last_frame))
+
+    async def _run(self, demo: Awaitable):
+        try:
+            await demo
+        except (WebSocketDisconnect, RuntimeError):
+            # Client went away mid-stream (sending on a closed socket raises
+            # RuntimeError); the receive loop cleans up the session
+            self.state["is_running"] = False
+        except Exception:
+            logger.exception("Live demo failed")
+            self.state["is_running"] = False
+            try:
+                await self.send({"type": "error", "message": "Live demo stopped by a server error"})
+            except (WebSocketDisconnect, RuntimeError):
+                pass
+
+    async def start(self, demo: Awaitable):
+        """Run a demo coroutine as this session's task, replacing any running one."""
+        await self.stop()
+        self.pending_jump = None  # a jump sent while nothing played must not move the new demo
+        self.task = asyncio.create_task(self._run(demo))
+
+    async def stop(self):
+        """Cancel the running demo, if any."""
+        if self.task is None:
+            return
+        task, self.task = self.task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+class SessionRegistry:
+    """Live demo sessions in this process, capped at max_sessions."""
+
+    def __init__(self, max_sessions: int = MAX_LIVE_SESSIONS):
+        self.max_sessions = max_sessions
+        self.sessions: Dict[int, LiveSession] = {}
+        self._ids = itertools.count(1)
+        self.opened = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def open(self, websocket: Any, binary: bool = False) -> Optional[LiveSession]:
+        """Register a connection, or return None when the registry is full."""
+        if len(self.sessions) >= self.max_sessions:
+            self.rejected += 1
+            return None
+        session = LiveSession(next(self._ids), websocket, binary)
+        self.sessions[session.id] = session
+        self.opened += 1
+        return session
+
+    async def close(self, session: LiveSession):
+        """Stop a session's demo and forget it."""
+        self.sessions.pop(session.id, None)
+        await session.stop()
+
+    def stats(self) -> Dict:
+        return {
+            "active_sessions": len(self.sessions),
+            "running_demos": sum(1 for s in self.sessions.values() if s.demo_running),
+            "max_sessions": self.max_sessions,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+# =============================================================================
+# BROADCAST
+# =============================================================================
+
+# One broadcast message in every wire form: (JSON text, binary-protocol form, binary keyframe)
+Payload = Tuple[str, Encoded, Encoded]
+
+
+class Subscriber:
+    """
+    One viewer of a broadcast channel: a bounded queue of encoded messages.
+
+    When the queue is full the oldest message is dropped, so a slow viewer
+    only ever falls behind itself. Dropping a plain position frame is harmless
+    (binary viewers get a keyframe next); dropping anything that carries state
+    (detection reveals, demo_start, ...) replaces the whole backlog with a
+    snapshot, so detections are never lost.
+    """
+
+    def __init__(self, channel: "BroadcastChannel", binary: bool = False, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.channel = channel
+        self.binary = binary
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.needs_keyframe = True
+        self.dropped = 0
+        self.resyncs = 0
+
+    def offer(self, payload: Optional[Payload], essential: bool, is_frame: bool):
+        """Queue a message (None ends the stream)."""
+        if self.queue.full():
+            _, dropped_essential = self.queue.get_nowait()
+            self.dropped += 1
+            self.needs_keyframe = True
+            if dropped_essential:
+                self.resync()
+                if is_frame:
+                    return  # already covered by the snapshot
+        self.queue.put_nowait((payload, essential))
+
+    def resync(self):
+        """Replace the backlog with the channel's current state."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.resyncs += 1
+        for payload in self.channel.catch_up():
+            self.queue.put_nowait((payload, False))
+
+    async def messages(self):
+        """Encoded messages in this viewer's protocol until the channel ends."""
+        while True:
+            payload, _ = await self.queue.get()
+            if payload is None:
+                return
+            text, binary, keyframe = payload
+            if not self.binary:
+                yield text
+            elif self.needs_keyframe and isinstance(keyframe, bytes):
+                self.needs_keyframe = False
+                yield keyframe
+            else:
+                yield binary
+
+
+class BroadcastChannel(LiveSession):
+    """
+    One demo stream shared by every viewer of a location.
+
+    The regular demo loop runs once with the channel as its session: each
+    message is encoded a single time per protocol and the same payload is
+    queued to every subscriber. Late joiners get demo_start plus a snapshot of
+    the detections revealed so far. Viewers cannot pause or seek a shared stream.
+    """
+
+    def __init__(self, key: str):
+        super().__init__(0, None)
+        self.key = key
+        self.subscribers: Set[Subscriber] = set()
+        self.binary_encoder = FrameEncoder()
+        self.start_payload: Optional[Payload] = None
+        self.last_frame: Optional[int] = None
+        self.revealed: List[Dict] = []
+        self._snapshot: Optional[Tuple[Tuple, Payload]] = None
+        self.messages_sent = 0
+
+    def _encode(self, message: Dict, detections: Optional[List[Dict]] = None) -> Payload:
+        text = dumps_json(message).decode("utf-8")
+        if message.get("type") == "frame":
+            return (text, *self.binary_encoder.frame(message))
+        binary = self.binary_encoder.encode(message, detections)
+        return text, binary, binary
+
+    async def send(self, message: Dict, detections: Optional[List[Dict]] = None):
+        payload = self._encode(message, detections)
+        kind = message.get("type")
+        is_frame = kind == "frame"
+        if kind == "demo_start":
+            self.start_payload = payload
+            self.last_frame = None
+            self.revealed = []
+        elif is_frame:
+            self.last_frame = message["frame_index"]
+            self.revealed.extend(message.get("new_detections", []))
+
+        essential = not is_frame or bool(message.get("new_detections"))
+        for subscriber in list(self.subscribers):
+            subscriber.offer(payload, essential, is_frame)
+        self.messages_sent += 1
+
+    def snapshot(self) -> Payload:
+        """Everything revealed up to the last frame sent, as one message (cached per frame)."""
+        key = (self.last_frame, len(self.revealed))
+        if self._snapshot is None or self._snapshot[0] != key:
+            payload = self._encode({
+                "type": "snapshot",
+                "frame_index": self.last_frame,
+                "total_shown": len(self.revealed),
+                "reset_detections": True,
+                "detections": self.revealed,
+            })
+            self._snapshot = (key, payload)
+        return self._snapshot[1]
+
+    def catch_up(self) -> List[Payload]:
+        """Messages that bring a new (or lagging) viewer to the current state."""
+        payloads = [self.start_payload] if self.start_payload is not None else []
+        if self.last_frame is not None:
+            payloads.append(self.snapshot())
+        return payloads
+
+    def subscribe(self, binary: bool = False) -> Subscriber:
+        subscriber = Subscriber(self, binary)
+        for payload in self.catch_up():
+            subscriber.queue.put_nowait((payload, False))
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def close(self):
+        """End the stream for every subscriber."""
+        for subscriber in list(self.subscribers):
+            subscriber.offer(None, True, False)
+
+
+class BroadcastHub:
+    """Broadcast channels by key; a channel starts with its first viewer and stops with its last."""
+
+    def __init__(self):
+        self.channels: Dict[str, BroadcastChannel] = {}
+
+    async def _produce(self, channel: BroadcastChannel, demo: Awaitable):
+        try:
+            await demo
+        finally:
+            channel.close()
+            if self.channels.get(channel.key) is channel:
+                del self.channels[channel.key]
+
+    async def watch(self, session: LiveSession, key: str, demo_factory: Callable[[BroadcastChannel], Awaitable]):
+        """
+        Stream a shared channel to one session until the channel ends.
+
+        Args:
+            session: Viewer's session (its task runs this coroutine)
+            key: Channel key, e.g. the location id
+            demo_factory: Builds the producer coroutine for a new channel
+        """
+        channel = self.channels.get(key)
+        if channel is None:
+            channel = BroadcastChannel(key)
+            self.channels[key] = channel
+            channel.task = asyncio.create_task(self._produce(channel, demo_factory(channel)))
+
+        subscriber = channel.subscribe(binary=session.encoder is not None)
+        session.state.update({"is_running": True, "location": key, "mode": "broadcast"})
+        try:
+            async for data in subscriber.messages():
+                await send_encoded(session.websocket, data)
+        finally:
+            channel.subscribers.discard(subscriber)
+            session.state["is_running"] = False
+            if not channel.subscribers and self.channels.get(key) is channel:
+                del self.channels[key]
+                await channel.stop()
+
+    def stats(self) -> Dict:
+        subscribers = [s for channel in self.channels.values() for s in channel.subscribers]
+        return {
+            "channels": len(self.channels),
+            "subscribers": len(subscribers),
+            "messages_sent": sum(c.messages_sent for c in self.channels.values()),
+            "dropped_messages": sum(s.dropped for s in subscribers),
+            "resyncs": sum(s.resyncs for s in subscribers),
+        }
@@ -12,20 +12,41 @@ from pathlib import Path
 # Add parent directory to path for simulation imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-import asyncio
 import json
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Tuple
 from datetime import datetime
+from functools import partial
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException
+import numpy as np
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from api.models import (
     FlightListResponse, DetectionResponse, CategoriesResponse,
     StatsResponse, LocationsResponse, HealthResponse,
     AnnualSummaryResponse, WaterRiskResponse, ExecutiveSummaryResponse
 )
+from api.aggregation import aggregate, parse_group_by, parse_metrics
+from api.datastore import DatasetStore
+from api.live_demo import (
+    BINARY_SUBPROTOCOL, DEFAULT_TARGET_FPS, BroadcastHub, DemoPlan, InvalidCommand, LiveSession, RevealSchedule,
+    SessionRegistry, command_number, waypoint_frame,
+)
+from api.detection_index import DetectionTable, select_rows
+from api.spatial import parse_bbox
+from simulation.heatmap import (
+    MAX_HEATMAP_ZOOM, bin_heatmap, cells_in_bbox, cells_to_list, heatmap_intensity, load_pyramid, priority_boost,
+)
+from api.tiles import MVT_MEDIA_TYPE, TileCache, encode_tile, feature_layer, point_layer, valid_tile
+from api.workers import PoolBusy, WorkerPools
+from api.jobs import Job, JobQueue
+from api.path_store import CustomPathStore, normalize_waypoints, simulation_key
+from simulation.columnar import ColumnarDataset, open_sidecar, sidecar_path
+from api.pagination import encode_cursor, decode_cursor, paginate
+from api.responses import (
+    FastJSONResponse, StaticPayload, event_stream, negotiate_stream_format, static_response, stream_features,
+)
 
 # Initialize FastAPI app with comprehensive documentation
 app = FastAPI(
@@ -77,10 +98,12 @@ TamAir - Conrad Challenge 2026
         {"name": "Flights", "description": "Drone flight paths and survey routes"},
         {"name": "Detections", "description": "Trash detection data with filtering options"},
         {"name": "Statistics", "description": "Summary statistics and heatmap data"},
+        {"name": "Tiles", "description": "Mapbox Vector Tiles for map layers"},
         {"name": "Analytics", "description": "Annual and monthly analytics reports"},
         {"name": "Water Risk", "description": "Water proximity risk assessments"},
         {"name": "Reports", "description": "Government-ready report exports"},
         {"name": "Custom Paths", "description": "Create and manage custom survey routes"},
+        {"name": "Jobs", "description": "Progress and results of background jobs"},
         {"name": "Geography", "description": "Geographic features (water, roads, shorelines)"},
         {"name": "Locations", "description": "Available survey locations"},
         {"name": "Live Demo", "description": "Real-time flight simulation via WebSocket"},
@@ -99,13 +122,113 @@ app.add_middleware(
 # Data directory - resolve to absolute path for production
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
+# Shared in-memory copy of every data file, reloaded only when it changes on disk
+store = DatasetStore()
+
+# Blocking file reads/writes run on threads, simulation runs in worker processes
+workers = WorkerPools()
+
+# Background jobs (e.g. POST /api/custom-path?background=true), polled via /api/jobs
+jobs = JobQueue()
+
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    jobs.shutdown()
+    workers.shutdown()
+
 
 def load_json(filepath: Path) -> Dict:
-    """Load JSON file safely."""
-    if not filepath.exists():
-        return {}
-    with open(filepath) as f:
-        return json.load(f)
+    """Load JSON file safely (cached - treat the result as read-only)."""
+    return store.get(filepath, {})
+
+
+def load_detection_columns(filepath: Path) -> Optional[ColumnarDataset]:
+    """Get the memory-mapped column sidecar for a GeoJSON file, if one is current."""
+    meta_file = sidecar_path(filepath) / "meta.json"
+    if store.version(meta_file) is None:
+        return None
+    dataset = store.derive(meta_file, "columnar_dataset", lambda _: open_sidecar(filepath), raw=True)
+    if dataset is None or not dataset.is_current(filepath):
+        return None
+    return dataset
+
+
+def load_detection_table(filepath: Path) -> Optional[DetectionTable]:
+    """
+    Get the columnar index for a detection GeoJSON file (built once per file version).
+
+    Uses the binary column sidecar when it matches the file, so the GeoJSON is
+    never parsed; otherwise falls back to parsing it.
+    """
+    dataset = load_detection_columns(filepath)
+    if dataset is not None:
+        return store.derive(sidecar_path(filepath) / "meta.json", "detection_table",
+                            lambda _: DetectionTable.from_columnar(dataset), raw=True)
+    return store.derive(filepath, "detection_table", DetectionTable.from_geojson)
+
+
+def bbox_rows(table: DetectionTable, bbox: Optional[str]) -> Optional[np.ndarray]:
+    """Rows inside a 'west,south,east,north' box, or None when no bbox was given."""
+    if not bbox:
+        return None
+    try:
+        bounds = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid bbox: {e}")
+    return table.spatial_index.query(*bounds)
+
+
+def detection_page(
+    filepath: Path,
+    mask: np.ndarray,
+    rows: Optional[np.ndarray],
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> Tuple[np.ndarray, Optional[str]]:
+    """
+    Apply limit/cursor paging to filtered detection rows.
+
+    Returns:
+        Tuple of (row indices for this page, cursor for the next page or None)
+    """
+    version = store.version(filepath)
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, version)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    indices, last_row = paginate(select_rows(mask, rows=rows), limit, after)
+    next_cursor = encode_cursor(version, last_row) if last_row is not None else None
+    return indices, next_cursor
+
+
+def stream_format(format: Optional[str], request: Request) -> Optional[str]:
+    """Pick the streamed output format from ?format= or the Accept header."""
+    try:
+        return negotiate_stream_format(format, request.headers.get("accept"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def file_response(request: Request, filepath: Path, media_type: str = "application/json") -> Response:
+    """
+    Serve a data file as-is from precompressed bodies.
+
+    Responses carry a strong ETag and Last-Modified, so unchanged files are
+    answered with 304 Not Modified. Both come from the file version the body
+    was read from; a file removed since the caller checked it gives 404.
+    """
+    payload = store.derive(
+        filepath, "static_payload",
+        lambda body, version: StaticPayload(body, version[0] / 1e9),
+        raw=True, versioned=True,
+    )
+    if payload is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    return static_response(request, payload, media_type)
 
 
 def save_json(filepath: Path, data: Dict):
@@ -131,7 +254,7 @@ async def list_flights():
 
     for geojson_file in flights_dir.glob("*_flight.geojson"):
         location_key = geojson_file.stem.replace("_flight", "")
-        data = load_json(geojson_file)
+        data = await workers.run_io(load_json, geojson_file)
 
         if data and "features" in data:
             line_feature = next(
@@ -151,7 +274,7 @@ async def list_flights():
 
 
 @app.get("/api/flights/{flight_id}", tags=["Flights"])
-async def get_flight(flight_id: str) -> Dict:
+async def get_flight(request: Request, flight_id: str) -> Dict:
     """
     Get flight path GeoJSON by ID.
 
@@ -166,11 +289,11 @@ async def get_flight(flight_id: str) -> Dict:
     if not flight_file.exists():
         raise HTTPException(status_code=404, detail=f"Flight {flight_id} not found")
 
-    return load_json(flight_file)
+    return await workers.run_io(file_response, request, flight_file)
 
 
 @app.get("/api/flights/{flight_id}/animation", tags=["Flights", "Live Demo"])
-async def get_flight_animation(flight_id: str) -> List[Dict]:
+async def get_flight_animation(request: Request, flight_id: str) -> List[Dict]:
     """
     Get flight animation data for live demo.
 
@@ -182,7 +305,7 @@ async def get_flight_animation(flight_id: str) -> List[Dict]:
     if not animation_file.exists():
         raise HTTPException(status_code=404, detail=f"Animation data for {flight_id} not found")
 
-    return load_json(animation_file)
+    return await workers.run_io(file_response, request, animation_file)
 
 
 @app.get("/api/flights/{flight_id}/waypoints", tags=["Flights"])
@@ -224,13 +347,17 @@ async def get_flight_waypoints(flight_id: str) -> Dict:
 # DETECTION ENDPOINTS
 # =============================================================================
 
-@app.get("/api/detections", tags=["Detections"], response_model=DetectionResponse)
+@app.get("/api/detections", tags=["Detections"], response_model=DetectionResponse, response_class=FastJSONResponse)
 async def get_detections(
+    request: Request,
     location: Optional[str] = Query(None, description="Filter by location ID (e.g., 'stinson_beach', 'lake_erie')"),
     category: Optional[str] = Query(None, description="Filter by trash category (e.g., 'plastic_bottles', 'tires')"),
     priority: Optional[str] = Query(None, description="Filter by priority level: 'critical', 'high', 'medium', or 'low'"),
     min_confidence: Optional[float] = Query(None, ge=0, le=1, description="Minimum detection confidence (0.0 to 1.0)"),
     limit: Optional[int] = Query(None, ge=1, le=10000, description="Maximum number of results to return"),
+    bbox: Optional[str] = Query(None, description="Only detections inside 'west,south,east,north' (degrees)"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    format: Optional[str] = Query(None, description="'json' (default), 'ndjson' or 'geojsonseq' to stream one feature per line"),
 ):
     """
     Get trash detections with optional filtering.
@@ -247,45 +374,65 @@ async def get_detections(
     - All detections: `/api/detections`
     - High priority only: `/api/detections?priority=high`
     - Stinson Beach plastics: `/api/detections?location=stinson_beach&category=plastic_bottles`
+    - Current map viewport: `/api/detections?bbox=-122.73,37.88,-122.61,37.91`
+
+    **Paging and streaming:** with `limit`, the response carries a `next_cursor`
+    to pass back as `cursor` for the following page. `format=ndjson` or
+    `format=geojsonseq` (or the matching Accept header) streams features one per
+    line instead of building a FeatureCollection; the next cursor is then sent
+    in the `X-Next-Cursor` header.
     """
     all_detections_file = DATA_DIR / "detections" / "all_detections.geojson"
-    data = load_json(all_detections_file)
+    streaming = stream_format(format, request)
+    table = await workers.run_io(load_detection_table, all_detections_file)
 
-    if not data or "features" not in data:
-        return {"type": "FeatureCollection", "features": [], "count": 0}
+    if table is None or not len(table):
+        return FastJSONResponse({
+            "type": "FeatureCollection", "features": [], "count": 0,
+            "next_cursor": None, "filters_applied": None,
+        })
 
-    features = data["features"]
+    rows = bbox_rows(table, bbox)
+    mask = table.all_rows(rows)
 
     if location:
-        features = [f for f in features if location in f["properties"].get("location", "").lower().replace(" ", "_")]
+        mask &= table.mask_where("location", lambda value: location in value.lower().replace(" ", "_"), rows)
 
     if category:
-        features = [f for f in features if f["properties"].get("category") == category]
+        mask &= table.mask_equals("category", category, rows)
 
     if priority:
-        features = [f for f in features if f["properties"].get("priority") == priority]
+        mask &= table.mask_equals("priority", priority, rows)
 
     if min_confidence:
-        features = [f for f in features if f["properties"].get("confidence", 0) >= min_confidence]
+        mask &= table.column("confidence", rows) >= min_confidence
 
-    if limit:
-        features = features[:limit]
+    indices, next_cursor = detection_page(all_detections_file, mask, rows, limit, cursor)
 
-    return {
+    if streaming:
+        return stream_features(table, indices, streaming, {"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+    features = table.features_at(indices)
+
+    # Features come straight from the data file, so skip response_model validation
+    return FastJSONResponse({
         "type": "FeatureCollection",
         "features": features,
         "count": len(features),
+        "next_cursor": next_cursor,
         "filters_applied": {
             "location": location,
             "category": category,
             "priority": priority,
             "min_confidence": min_confidence,
+            "bbox": bbox,
         },
-    }
+    })
 
 
 @app.get("/api/detections/geojson", tags=["Detections"])
 async def get_detections_geojson(
+    request: Request,
     location: Optional[str] = Query(None, description="Filter by location ID")
 ) -> Dict:
     """
@@ -301,7 +448,7 @@ async def get_detections_geojson(
     if not detection_file.exists():
         raise HTTPException(status_code=404, detail="Detection data not found")
 
-    return load_json(detection_file)
+    return await workers.run_io(file_response, request, detection_file)
 
 
 @app.get("/api/detections/categories", tags=["Detections"], response_model=CategoriesResponse)
@@ -333,6 +480,7 @@ async def get_categories():
 
 @app.get("/api/stats", tags=["Statistics"])
 async def get_stats(
+    request: Request,
     location: Optional[str] = Query(None, description="Filter by location ID for location-specific stats")
 ) -> Dict:
     """
@@ -353,33 +501,86 @@ async def get_stats(
     if not stats_file.exists():
         raise HTTPException(status_code=404, detail="Statistics not found")
 
-    return load_json(stats_file)
+    return await workers.run_io(file_response, request, stats_file)
+
+
+def detection_intensity(table: DetectionTable, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Heatmap intensity for the rows of a detection table (all rows if None)."""
+    codes = table.codes["priority"] if rows is None else table.codes["priority"][rows]
+    boost = priority_boost(table.vocab["priority"] + [""])[codes]  # code -1 -> ""
+    return heatmap_intensity(table.column("estimated_weight_kg", rows), boost)
+
+
+def load_heatmap_pyramid(detections_file: Path) -> Optional[Dict[int, np.ndarray]]:
+    """Get the pre-binned heatmap pyramid, or None if missing or built from older data."""
+    pyramid_file = DATA_DIR / "summary" / "heatmap_pyramid.npz"
+    if store.version(pyramid_file) is None:
+        return None
+    levels, source = store.derive(pyramid_file, "heatmap_pyramid", load_pyramid, raw=True)
+    return levels if source == store.version(detections_file) else None
 
 
 @app.get("/api/heatmap", tags=["Statistics"])
-async def get_heatmap() -> List[List]:
+async def get_heatmap(
+    request: Request,
+    zoom: Optional[int] = Query(None, ge=0, le=MAX_HEATMAP_ZOOM, description="Map zoom level - detections are summed into ~16px cells"),
+    bbox: Optional[str] = Query(None, description="Only cells inside 'west,south,east,north' (degrees), usually the viewport"),
+) -> List[List]:
     """
     Get heatmap data for density visualization.
 
     Returns array of [latitude, longitude, intensity] points for creating pollution density heatmaps.
-    Intensity values range from 0.0 to 1.0 based on estimated weight.
-    """
-    heatmap_file = DATA_DIR / "summary" / "heatmap_data.json"
+    Without `zoom`, each point is one detection and intensity ranges from 0.0 to 1.0
+    based on estimated weight and priority.
 
-    if not heatmap_file.exists():
-        all_detections = load_json(DATA_DIR / "detections" / "all_detections.geojson")
-        heatmap_data = []
+    With `zoom` (and optionally `bbox`), detections are binned on the server
+    into screen-sized cells and each point carries the summed intensity of its
+    cell, so the payload is bounded by the viewport rather than the number of
+    detections. Summed intensities are unbounded (a cell of n detections can
+    reach n, and low zooms regularly exceed 1) - scale the heatmap gradient to
+    the largest value returned.
 
-        if all_detections and "features" in all_detections:
-            for feature in all_detections["features"]:
-                coords = feature["geometry"]["coordinates"]
-                weight = feature["properties"]["estimated_weight_kg"]
-                intensity = min(1.0, weight / 10.0)
-                heatmap_data.append([coords[1], coords[0], intensity])
-
-        return heatmap_data
+    **Example:** `/api/heatmap?zoom=12&bbox=-122.8,37.85,-122.55,37.95`
+    """
+    detections_file = DATA_DIR / "detections" / "all_detections.geojson"
+
+    if zoom is None:
+        if bbox:
+            raise HTTPException(status_code=400, detail="bbox requires zoom")
+
+        heatmap_file = DATA_DIR / "summary" / "heatmap_data.json"
+        if heatmap_file.exists():
+            return await workers.run_io(file_response, request, heatmap_file)
+
+        table = await workers.run_io(load_detection_table, detections_file)
+        if table is None or not len(table):
+            return []
+        intensity = detection_intensity(table).tolist()
+        return FastJSONResponse([
+            [lat, lon, round(i, 3)]
+            for lat, lon, i in zip(table.lat.tolist(), table.lon.tolist(), intensity)
+        ])
+
+    bounds = None
+    if bbox:
+        try:
+            bounds = parse_bbox(bbox)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid bbox: {e}")
+
+    table = await workers.run_io(load_detection_table, detections_file)
+    if table is None or not len(table):
+        return []
+
+    pyramid = await workers.run_io(load_heatmap_pyramid, detections_file)
+    if pyramid is not None and zoom in pyramid:
+        cells = cells_in_bbox(pyramid[zoom], bounds)
+    else:
+        # Deep zooms (or no pyramid yet): bin just the detections in view
+        rows = table.spatial_index.query(*bounds) if bounds else np.arange(len(table))
+        cells = bin_heatmap(table.lon[rows], table.lat[rows], detection_intensity(table, rows), zoom)
 
-    return load_json(heatmap_file)
+    return FastJSONResponse(cells_to_list(cells))
 
 
 # =============================================================================
@@ -388,59 +589,211 @@ async def get_heatmap() -> List[List]:
 
 @app.get("/api/clusters", tags=["Statistics"])
 async def get_clusters(
-    location: Optional[str] = Query(None, description="Filter clusters by location ID")
-) -> Dict:
+    request: Request,
+    location: Optional[str] = Query(None, description="Filter clusters by location ID"),
+    zoom: Optional[int] = Query(None, ge=0, le=MAX_HEATMAP_ZOOM, description="Map zoom level - clusters sized for this zoom"),
+    bbox: Optional[str] = Query(None, description="Only clusters inside 'west,south,east,north' (degrees)"),
+):
     """
     Get high-density trash clusters.
 
     Returns GeoJSON of clustered detection areas where multiple trash items were found in close proximity.
     Useful for identifying dumping hotspots and prioritizing cleanup efforts.
+
+    With `zoom` (and optionally `bbox`), clusters come from a multi-resolution
+    index instead: every detection is in exactly one feature, either a cluster
+    (`cluster: true`, `point_count`, `total_weight_kg`, `priority`) or the
+    detection itself when it stands alone at that zoom.
+
+    **Example:** `/api/clusters?zoom=11&bbox=-123.0,37.7,-122.4,38.0`
     """
+    if zoom is None:
+        if bbox:
+            raise HTTPException(status_code=400, detail="bbox requires zoom")
+
+        if location:
+            clusters_file = DATA_DIR / "detections" / f"{location}_clusters.geojson"
+        else:
+            clusters_file = DATA_DIR / "detections" / "all_clusters.geojson"
+
+        if not clusters_file.exists():
+            return {"type": "FeatureCollection", "features": []}
+
+        return await workers.run_io(file_response, request, clusters_file)
+
     if location:
-        clusters_file = DATA_DIR / "detections" / f"{location}_clusters.geojson"
+        detections_file = DATA_DIR / "detections" / f"{location}_detections.geojson"
     else:
-        clusters_file = DATA_DIR / "detections" / "all_clusters.geojson"
+        detections_file = DATA_DIR / "detections" / "all_detections.geojson"
+
+    if not detections_file.exists():
+        raise HTTPException(status_code=404, detail="Detection data not found")
 
-    if not clusters_file.exists():
-        return {"type": "FeatureCollection", "features": []}
+    bounds = None
+    if bbox:
+        try:
+            bounds = parse_bbox(bbox)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid bbox: {e}")
 
-    return load_json(clusters_file)
+    table = await workers.run_io(load_detection_table, detections_file)
+    clusters = table.cluster_index.query(zoom, bounds)
+
+    singles = [c["row"] for c in clusters if c["count"] == 1]
+    detections = dict(zip(singles, table.features_at(np.array(singles, dtype=np.int64))))
+
+    features = []
+    for cluster in clusters:
+        if cluster["count"] == 1:
+            features.append(detections[cluster["row"]])
+            continue
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [cluster["lon"], cluster["lat"]]},
+            "properties": {
+                "cluster": True,
+                "cluster_id": cluster["cluster_id"],
+                "point_count": cluster["count"],
+                "total_weight_kg": round(cluster["weight"], 2),
+                "priority": cluster["priority"],
+            },
+        })
+
+    return FastJSONResponse({"type": "FeatureCollection", "zoom": zoom, "features": features})
+
+
+# =============================================================================
+# AGGREGATION ENDPOINTS
+# =============================================================================
+
+def detection_dataset_file(dataset: str) -> Path:
+    """Map an aggregate ?dataset= name to its detection GeoJSON file."""
+    if dataset == "all":
+        return DATA_DIR / "detections" / "all_detections.geojson"
+    if dataset.startswith("annual_") and dataset[len("annual_"):].isdigit():
+        return ANNUAL_DIR / f"detections_{dataset[len('annual_'):]}.geojson"
+    return DATA_DIR / "detections" / f"{dataset}_detections.geojson"
+
+
+@app.get("/api/aggregate", tags=["Statistics"])
+async def get_aggregate(
+    dataset: str = Query("all", description="'all', a location ID (e.g. 'stinson_beach') or 'annual_<year>'"),
+    group_by: Optional[str] = Query(None, description="Comma-separated fields: location, category, priority, water_risk_level, month"),
+    metrics: str = Query("count", description="Comma-separated metrics: count, sum(f), avg(f), min(f), max(f)"),
+    bbox: Optional[str] = Query(None, description="Only detections inside 'west,south,east,north' (degrees)"),
+) -> Dict:
+    """
+    Group detections and compute summary metrics on the fly.
+
+    Metric fields: `confidence`, `weight` (estimated_weight_kg), `size` (size_m2),
+    `month`, `water_proximity` (water_proximity_m).
+
+    **Example:** `/api/aggregate?dataset=annual_2026&group_by=location,month,category&metrics=count,sum(weight),avg(confidence)`
+    """
+    try:
+        group_columns = parse_group_by(group_by)
+        metric_specs = parse_metrics(metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    detections_file = detection_dataset_file(dataset)
+    if not dataset.replace("_", "").isalnum() or not detections_file.exists():
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset} not found")
+
+    table = await workers.run_io(load_detection_table, detections_file)
+    groups = aggregate(table, group_columns, metric_specs, bbox_rows(table, bbox))
+
+    return {
+        "dataset": dataset,
+        "group_by": group_columns,
+        "metrics": [key for _, _, key in metric_specs],
+        "groups": groups,
+        "count": len(groups),
+    }
+
+
+# =============================================================================
+# VECTOR TILE ENDPOINTS
+# =============================================================================
+
+# Layer name -> (source file, properties copied onto tile features; None = all scalars)
+TILE_LAYERS = {
+    "detections": (
+        DATA_DIR / "detections" / "all_detections.geojson",
+        ("id", "category", "category_name", "priority", "confidence", "estimated_weight_kg", "color", "location"),
+    ),
+    "clusters": (DATA_DIR / "detections" / "all_clusters.geojson", None),
+    "flights": (DATA_DIR / "flights" / "all_flights.geojson", None),
+}
+
+tile_cache = TileCache()
+
+
+def render_tile(layer: str, z: int, x: int, y: int) -> bytes:
+    """Encode one layer of one tile from the current data files."""
+    source, properties = TILE_LAYERS[layer]
+    if layer == "flights":
+        features = load_json(source).get("features", [])
+        builder = feature_layer(layer, features, z, x, y, properties)
+    else:
+        builder = point_layer(layer, load_detection_table(source), z, x, y, properties)
+    return encode_tile([builder])
+
+
+@app.get("/api/tiles/{layer}/{z}/{x}/{y}.mvt", tags=["Tiles"])
+async def get_tile(request: Request, layer: str, z: int, x: int, y: int):
+    """
+    Get a Mapbox Vector Tile for one map layer.
+
+    Layers: `detections`, `clusters`, `flights`. Only the tiles in view are
+    fetched, so panning a long corridor never downloads the whole dataset.
+    Dense tiles are thinned to about one point per screen pixel, with a
+    `point_count` on each kept point.
+
+    **Example:** `/api/tiles/detections/14/2615/6330.mvt`
+    """
+    if layer not in TILE_LAYERS:
+        raise HTTPException(status_code=404, detail=f"Unknown tile layer: {layer}")
+    if not valid_tile(z, x, y):
+        raise HTTPException(status_code=400, detail=f"Invalid tile {z}/{x}/{y}")
+
+    source, _ = TILE_LAYERS[layer]
+    version = store.version(source)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"No data for layer {layer}")
+
+    key = (layer, z, x, y, version)
+    payload = tile_cache.get(key)
+    if payload is None:
+        payload = StaticPayload(await workers.run_io(render_tile, layer, z, x, y), version[0] / 1e9)
+        tile_cache.put(key, payload)
+    return static_response(request, payload, MVT_MEDIA_TYPE)
 
 
 # =============================================================================
 # LIVE DEMO WEBSOCKET - Enhanced with waypoint support
 # =============================================================================
 
-class ConnectionManager:
-    """Manage WebSocket connections for live demo."""
-
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.demo_state = {
-            "is_running": False,
-            "current_frame": 0,
-            "speed_multiplier": 1.0,
-            "location": "stinson_beach",
-            "start_waypoint": 0,
-        }
+# One LiveSession per connection - each viewer has its own playback state
+sessions = SessionRegistry()
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+# Shared streams for start commands with mode="broadcast" - one producer per location
+broadcasts = BroadcastHub()
 
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+# Per-location playback plans, keyed by the versions of the files they were built from
+demo_plans: Dict[str, Tuple[Tuple, DemoPlan]] = {}
 
-    async def broadcast(self, message: Dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                pass
 
+def load_demo_plan(animation_file: Path, detections_file: Path) -> DemoPlan:
+    """Get the cached playback plan for a location, rebuilding it when its files change."""
+    versions = (store.version(animation_file), store.version(detections_file))
+    cached = demo_plans.get(str(animation_file))
+    if cached is not None and cached[0] == versions:
+        return cached[1]
 
-manager = ConnectionManager()
+    plan = DemoPlan(load_json(animation_file), load_json(detections_file).get("features", []))
+    demo_plans[str(animation_file)] = (versions, plan)
+    return plan
 
 
 @app.websocket("/ws/live")
@@ -454,49 +807,97 @@ async def websocket_live_demo(websocket: WebSocket):
     - resume: Resume demo
     - reset: Reset to beginning
     - speed: Set speed multiplier
+    - target_fps: Cap on frames sent per second (frames in between are skipped)
     - jump_to_waypoint: Jump to specific waypoint
+    - seek: Jump to a frame, elapsed_seconds or waypoint
+
+    Every connection gets its own session; the demo streams from a separate
+    task so commands are read while it plays. Clients that request the
+    "sylva.live.v1" subprotocol get compact binary frames (see api/live_demo.py). Starting with mode="broadcast"
+    joins the shared stream for that location instead (real-time speed, no
+    pause or jumps); late joiners receive a snapshot of what was revealed.
     """
-    await manager.connect(websocket)
+    binary = BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=BINARY_SUBPROTOCOL if binary else None)
+    session = sessions.open(websocket, binary)
+    if session is None:
+        await websocket.send_json({
+            "type": "error",
+            "message": "Too many live demo sessions, try again later",
+        })
+        await websocket.close(code=1013)
+        return
 
     try:
         while True:
             data = await websocket.receive_json()
             command = data.get("command")
 
-            if command == "start":
-                location = data.get("location", "stinson_beach")
-                speed = data.get("speed", 1.0)
-                start_waypoint = data.get("start_waypoint", 0)
-                custom_path_id = data.get("custom_path_id")  # For custom paths
-
-                if custom_path_id:
-                    await start_custom_path_demo(websocket, custom_path_id, speed)
-                else:
-                    await start_enhanced_demo(websocket, location, speed, start_waypoint)
-
-            elif command == "pause":
-                manager.demo_state["is_running"] = False
-
-            elif command == "resume":
-                manager.demo_state["is_running"] = True
-
-            elif command == "reset":
-                manager.demo_state["current_frame"] = 0
-
-            elif command == "speed":
-                manager.demo_state["speed_multiplier"] = data.get("speed", 1.0)
-
-            elif command == "get_state":
-                await websocket.send_json({
-                    "type": "state",
-                    "data": manager.demo_state,
-                })
+            # Bad values get an error reply; the connection stays open
+            try:
+                if command == "start":
+                    location = data.get("location", "stinson_beach")
+                    speed = command_number(data, "speed", 1.0, positive=True)
+                    start_waypoint = command_number(data, "start_waypoint", 0, integer=True)
+                    custom_path_id = data.get("custom_path_id")  # For custom paths
+                    if "target_fps" in data:
+                        session.update(target_fps=command_number(data, "target_fps", positive=True))
+
+                    if data.get("mode") == "broadcast":
+                        if custom_path_id:
+                            key = f"custom:{custom_path_id}"
+                            factory = partial(start_custom_path_demo, path_id=custom_path_id, speed=1.0)
+                        else:
+                            key = location
+                            factory = partial(start_enhanced_demo, location=location, speed=1.0)
+                        await session.start(broadcasts.watch(session, key, factory))
+                    elif custom_path_id:
+                        await session.start(start_custom_path_demo(session, custom_path_id, speed))
+                    else:
+                        await session.start(start_enhanced_demo(session, location, speed, start_waypoint))
+
+                elif command == "pause":
+                    session.update(is_running=False)
+
+                elif command == "resume":
+                    session.update(is_running=True)
+
+                elif command == "reset":
+                    session.jump("reset")
+
+                elif command == "speed":
+                    session.update(speed_multiplier=command_number(data, "speed", 1.0, positive=True))
+
+                elif command == "target_fps":
+                    session.update(target_fps=command_number(data, "target_fps", DEFAULT_TARGET_FPS, positive=True))
+
+                elif command == "jump_to_waypoint":
+                    session.jump("waypoint", command_number(data, "waypoint", 0, integer=True))
+
+                elif command == "seek":
+                    if "frame" in data:
+                        session.jump("frame", command_number(data, "frame", integer=True))
+                    elif "elapsed_seconds" in data:
+                        session.jump("elapsed", command_number(data, "elapsed_seconds"))
+                    else:
+                        session.jump("waypoint", command_number(data, "waypoint", 0, integer=True))
+
+                elif command == "get_state":
+                    await session.send({
+                        "type": "state",
+                        "data": session.state,
+                    })
+
+            except InvalidCommand as e:
+                await session.send({"type": "error", "message": str(e)})
 
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        pass
+    finally:
+        await sessions.close(session)
 
 
-async def start_enhanced_demo(websocket: WebSocket, location: str, speed: float, start_waypoint: int = 0):
+async def start_enhanced_demo(session: LiveSession, location: str, speed: float, start_waypoint: int = 0):
     """
     Run enhanced live demo simulation with individual detection streaming.
 
@@ -512,31 +913,17 @@ async def start_enhanced_demo(websocket: WebSocket, location: str, speed: float,
     detections_file = DATA_DIR / "detections" / f"{location}_detections.geojson"
 
     if not animation_file.exists() or not detections_file.exists():
-        await websocket.send_json({
+        await session.send({
             "type": "error",
             "message": f"Data for location {location} not found",
         })
         return
 
-    animation_data = load_json(animation_file)
-    detections_data = load_json(detections_file)
-    all_detections = detections_data.get("features", [])
-
-    # Sort detections along the flight path based on proximity to waypoints
-    # This ensures detections appear in order as the drone flies
-    def get_detection_path_position(detection):
-        det_lon, det_lat = detection["geometry"]["coordinates"]
-        min_dist = float('inf')
-        best_idx = 0
-        # Find which animation frame this detection is closest to
-        for idx, frame in enumerate(animation_data):
-            dist = ((frame["lat"] - det_lat) ** 2 + (frame["lon"] - det_lon) ** 2) ** 0.5
-            if dist < min_dist:
-                min_dist = dist
-                best_idx = idx
-        return best_idx
-
-    all_detections = sorted(all_detections, key=get_detection_path_position)
+    # Detections sorted along the flight path (by nearest animation frame) so they
+    # appear in order as the drone flies - built once per data version
+    plan = await workers.run_io(load_demo_plan, animation_file, detections_file)
+    animation_data = plan.frames
+    all_detections = plan.detections
 
     # Get location config for waypoints
     location_config = LOCATIONS.get(location, {})
@@ -546,13 +933,10 @@ async def start_enhanced_demo(websocket: WebSocket, location: str, speed: float,
 
     # Calculate start frame based on waypoint
     total_frames = len(animation_data)
-    if start_waypoint > 0 and len(waypoints) > 0:
-        start_frame = int((start_waypoint / len(waypoints)) * total_frames)
-    else:
-        start_frame = 0
+    start_frame = waypoint_frame(start_waypoint, len(waypoints), total_frames)
 
     # Update state
-    manager.demo_state.update({
+    session.state.update({
         "is_running": True,
         "current_frame": start_frame,
         "speed_multiplier": speed,
@@ -562,7 +946,7 @@ async def start_enhanced_demo(websocket: WebSocket, location: str, speed: float,
     })
 
     # Send initial state with waypoints
-    await websocket.send_json({
+    await session.send({
         "type": "demo_start",
         "location": location,
         "location_name": location_config.get("name", location),
@@ -572,24 +956,38 @@ async def start_enhanced_demo(websocket: WebSocket, location: str, speed: float,
         "altitude": altitude,
         "speed": survey_speed,
         "start_frame": start_frame,
-    })
+    }, detections=plan.schedule.detections)
 
     # POSITION-BASED DETECTION SYNC
     # Detections appear based on drone position, not time delays
     # Only show detections whose timestamp <= current drone timestamp
+    schedule = plan.schedule
 
-    shown_detection_ids = set()  # Track which detections have been shown
+    current_detection_count = 0
     last_cv_detection_idx = 0
 
-    for frame_idx in range(start_frame, total_frames):
-        if not manager.demo_state["is_running"]:
-            while not manager.demo_state["is_running"]:
-                await asyncio.sleep(0.1)
-                if manager.demo_state.get("stop_requested"):
-                    manager.demo_state["stop_requested"] = False
-                    return
-
-        manager.demo_state["current_frame"] = frame_idx
+    # Frame pacing - ultra smooth movement
+    # With 10m interpolation we have very granular frames (~0.5s real time each)
+    # Use 50ms per frame for buttery smooth animation
+    base_delay = 0.05
+
+    frame_idx = start_frame
+    session.start_clock(frame_idx, base_delay)
+    while frame_idx < total_frames:
+        await session.wait_running()
+
+        # Apply reset / jump_to_waypoint / seek before building the frame: the
+        # shown detections at the target come from one binary search and go out
+        # as a single snapshot
+        jump = session.poll()
+        if jump is not None:
+            frame_idx = schedule.seek(*jump, n_waypoints=len(waypoints), start_frame=start_frame)
+            snapshot = schedule.snapshot(frame_idx)
+            current_detection_count = last_cv_detection_idx = snapshot["total_shown"]
+            session.start_clock(frame_idx, base_delay)
+            await session.send(snapshot)
+
+        session.state["current_frame"] = frame_idx
         frame = animation_data[frame_idx]
 
         # Calculate progress (0.0 to 1.0)
@@ -603,25 +1001,9 @@ async def start_enhanced_demo(websocket: WebSocket, location: str, speed: float,
             current_waypoint_name = waypoints[current_waypoint_idx].get("name", f"Waypoint {current_waypoint_idx + 1}")
 
         # POSITION-BASED: Only show detections the drone has ACTUALLY passed
-        # Compare drone position to each detection's position
-        current_lat = frame["lat"]
-        current_lon = frame["lon"]
-
-        # Get current frame timestamp for comparison
-        current_timestamp = frame.get("timestamp", "")
-
-        # Find all detections that are BEHIND the drone (already scanned)
-        new_detections = []
-        for det in all_detections:
-            det_timestamp = det["properties"].get("timestamp", "")
-            # Only show if detection timestamp <= current frame timestamp
-            if det_timestamp and current_timestamp and det_timestamp <= current_timestamp:
-                det_id = det["properties"]["id"]
-                if det_id not in shown_detection_ids:
-                    shown_detection_ids.add(det_id)
-                    new_detections.append(det)
-
-        current_detection_count = len(shown_detection_ids)
+        # (already scanned by the time of this frame)
+        new_detections = schedule.reveal(current_detection_count, frame_idx)
+        current_detection_count += len(new_detections)
 
         # For CV panel: only send one detection periodically (every 5th detection)
         # This keeps CV panel updating without overwhelming it
@@ -659,88 +1041,86 @@ async def start_enhanced_demo(websocket: WebSocket, location: str, speed: float,
             frame_data["new_detection"] = cv_detection
             frame_data["detection_event"] = True
 
-        await websocket.send_json(frame_data)
+        await session.send(frame_data)
 
-        # Delay based on speed - ultra smooth movement
-        # With 10m interpolation we have very granular frames (~0.5s real time each)
-        # Use 50ms delay for buttery smooth animation
-        base_delay = 0.05
-        delay = base_delay / manager.demo_state["speed_multiplier"]
-        await asyncio.sleep(delay)
+        # Next frame due on the playback clock (skips frames at high speed)
+        frame_idx = await session.advance(frame_idx, total_frames - 1)
 
     # Demo complete
-    manager.demo_state["is_running"] = False
-    await websocket.send_json({
+    session.state["is_running"] = False
+    await session.send({
         "type": "demo_complete",
         "total_detections": len(all_detections),
         "location": location,
     })
 
 
-async def start_custom_path_demo(websocket: WebSocket, path_id: str, speed: float):
+async def start_custom_path_demo(session: LiveSession, path_id: str, speed: float):
     """
     Run live demo simulation for a user-created custom path.
     """
-    if path_id not in custom_paths:
-        await websocket.send_json({
+    path_data = await workers.run_io(custom_paths.get, path_id)
+    if path_data is None:
+        await session.send({
             "type": "error",
             "message": f"Custom path {path_id} not found"
         })
         return
 
-    path_data = custom_paths[path_id]
     animation_frames = path_data.get("animation_data", [])
     all_detections = path_data.get("detections", {}).get("features", [])
 
     if not animation_frames:
-        await websocket.send_json({
+        await session.send({
             "type": "error",
             "message": "No animation data for this path"
         })
         return
 
     # Initialize demo state
-    manager.demo_state["is_running"] = True
-    manager.demo_state["location"] = "custom"
-    manager.demo_state["current_frame"] = 0
-    manager.demo_state["speed_multiplier"] = speed
+    session.state["is_running"] = True
+    session.state["location"] = "custom"
+    session.state["current_frame"] = 0
+    session.state["speed_multiplier"] = speed
 
+    waypoints = path_data.get("config", {}).get("waypoints", [])
     total_frames = len(animation_frames)
     base_interval = 0.08  # 80ms per frame
 
+    # Timestamp-based detection sync - only show detections drone has passed
+    schedule = RevealSchedule(animation_frames, all_detections)
+
     # Send start event
-    await websocket.send_json({
+    await session.send({
         "type": "demo_start",
         "location": path_data["name"],
         "total_frames": total_frames,
         "total_detections": len(all_detections),
-    })
+    }, detections=schedule.detections)
 
-    # Timestamp-based detection sync - only show detections drone has passed
-    shown_detection_ids = set()
+    current_detection_count = 0
     last_cv_detection_idx = 0
 
-    for frame_idx in range(total_frames):
-        if not manager.demo_state["is_running"]:
-            await asyncio.sleep(0.1)
-            continue
+    frame_idx = 0
+    session.start_clock(frame_idx, base_interval)
+    while frame_idx < total_frames:
+        await session.wait_running()
+
+        jump = session.poll()
+        if jump is not None:
+            frame_idx = schedule.seek(*jump, n_waypoints=len(waypoints))
+            snapshot = schedule.snapshot(frame_idx)
+            current_detection_count = last_cv_detection_idx = snapshot["total_shown"]
+            session.start_clock(frame_idx, base_interval)
+            await session.send(snapshot)
 
+        session.state["current_frame"] = frame_idx
         frame = animation_frames[frame_idx]
-        current_speed = manager.demo_state["speed_multiplier"]
         progress = frame_idx / total_frames
-        current_timestamp = frame.get("timestamp", "")
 
-        # Find detections the drone has passed (by timestamp comparison)
-        new_detections = []
-        for det in all_detections:
-            det_timestamp = det["properties"].get("timestamp", "")
-            if det_timestamp and current_timestamp and det_timestamp <= current_timestamp:
-                det_id = det["properties"]["id"]
-                if det_id not in shown_detection_ids:
-                    shown_detection_ids.add(det_id)
-                    new_detections.append(det)
-
-        current_detection_count = len(shown_detection_ids)
+        # Find detections the drone has passed (by timestamp)
+        new_detections = schedule.reveal(current_detection_count, frame_idx)
+        current_detection_count += len(new_detections)
 
         # CV panel detection (every 5th)
         cv_detection = None
@@ -770,12 +1150,12 @@ async def start_custom_path_demo(websocket: WebSocket, path_id: str, speed: floa
             frame_data["new_detection"] = cv_detection
             frame_data["detection_event"] = True
 
-        await websocket.send_json(frame_data)
-        await asyncio.sleep(base_interval / current_speed)
+        await session.send(frame_data)
+        frame_idx = await session.advance(frame_idx, total_frames - 1)
 
     # Demo complete
-    manager.demo_state["is_running"] = False
-    await websocket.send_json({
+    session.state["is_running"] = False
+    await session.send({
         "type": "demo_complete",
         "total_detections": len(all_detections),
         "location": path_data["name"],
@@ -886,13 +1266,74 @@ async def get_population_density(location: Optional[str] = None) -> Dict:
 # CUSTOM PATH ENDPOINTS
 # =============================================================================
 
-# In-memory storage for custom paths (in production, use a database)
-custom_paths = {}
-custom_path_results = {}
+# Custom paths live in SQLite (shared by all server processes, kept across
+# restarts); only recently used ones are held in memory
+CUSTOM_PATH_DB = DATA_DIR / "custom_paths.db"
+custom_paths = CustomPathStore(CUSTOM_PATH_DB)
+
+
+async def get_custom_path_or_404(path_id: str) -> Dict:
+    path = await workers.run_io(custom_paths.get, path_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Custom path not found")
+    return path
+
+
+async def generate_custom_path(
+    path_id: str,
+    name: str,
+    custom_config: Dict,
+    on_progress: Optional[Callable[[str, float], None]] = None,
+    wait: bool = False,
+) -> Dict:
+    """
+    Simulate a custom path in the CPU pool and store it.
+
+    Simulations are cached by content: a route whose normalized config was
+    simulated before (by any user, under any name) is stored straight away
+    from the cached result, without touching the CPU pool.
+
+    Args:
+        on_progress: Called with (stage, overall fraction) as generation advances
+        wait: Queue for the CPU pool when its backlog is full instead of
+            raising PoolBusy (for jobs that were already accepted)
+
+    Returns:
+        The creation summary returned by POST /api/custom-path
+    """
+    from simulation.config import SIMULATION
+    from simulation.data_generator import simulate_custom_path
+
+    key = simulation_key(custom_config, seed=SIMULATION["random_seed"])
+    result = custom_paths.peek_simulation(key) or await workers.run_io(custom_paths.get_simulation, key)
+    if result is None:
+        result = await workers.run_cpu(simulate_custom_path, custom_config, on_progress=on_progress, wait=wait)
+        await workers.run_io(custom_paths.put_simulation, key, result)
+    detections = result["detections"]
+
+    await workers.run_io(custom_paths.put, {
+        "id": path_id,
+        "name": name,
+        "config": custom_config,
+        "detection_count": len(detections.get("features", [])),
+        "created_at": datetime.now().isoformat(),
+        "simulation_key": key,
+    })
+
+    return {
+        "id": path_id,
+        "name": name,
+        "waypoint_count": len(custom_config["waypoints"]),
+        "detection_count": len(detections.get("features", [])),
+        "message": "Custom path created successfully",
+    }
 
 
 @app.post("/api/custom-path", tags=["Custom Paths"])
-async def create_custom_path(data: Dict) -> Dict:
+async def create_custom_path(
+    data: Dict,
+    background: bool = Query(False, description="Answer at once with a job id and generate in the background"),
+) -> Dict:
     """
     Create a custom flight path from user-drawn waypoints.
 
@@ -916,10 +1357,19 @@ async def create_custom_path(data: Dict) -> Dict:
     ```
 
     Returns the created path ID for use with other endpoints.
+
+    Long routes can take a while to simulate. With `?background=true` the
+    request returns 202 immediately with a `job_id`; follow progress at
+    `/api/jobs/{job_id}` or as Server-Sent Events at `/api/jobs/{job_id}/events`.
+    The finished job's `result` is the response this endpoint would have sent.
+
+    Simulation runs in a worker process; when too many paths are already being
+    generated the request is refused with 503. Results are cached by route,
+    altitude and speed (waypoints rounded to 6 decimals), so re-submitting a
+    route returns at once - cache hit rates are under `custom_paths` in
+    `/api/metrics`.
     """
     import uuid
-    from simulation.flight_paths import FlightPathGenerator
-    from simulation.trash_detector import TrashDetector
 
     path_id = str(uuid.uuid4())[:8]
     name = data.get("name", f"Custom Path {path_id}")
@@ -934,8 +1384,7 @@ async def create_custom_path(data: Dict) -> Dict:
     custom_config = {
         "name": name,
         "type": "custom",
-        "waypoints": [{"lat": wp["lat"], "lon": wp["lon"], "name": f"Point {i+1}"}
-                      for i, wp in enumerate(waypoints)],
+        "waypoints": normalize_waypoints(waypoints),
         "survey_altitude_m": altitude,
         "survey_speed_ms": speed,
         "flight_pattern": "corridor",
@@ -943,52 +1392,44 @@ async def create_custom_path(data: Dict) -> Dict:
         "population_density": 100,
     }
 
-    # Generate flight path using custom config
-    generator = FlightPathGenerator(custom_config=custom_config)
-    path_waypoints = generator.generate_path()
-
-    # Convert to GeoJSON
-    flight_path = generator.to_geojson()
-
-    # Generate detections using the trash detector
-    detector = TrashDetector("stinson_beach")
-    detections = detector.simulate_detections(flight_path, custom_config)
-
-    # Generate animation data
-    animation_data = generator.to_animation_data()
-
-    # Store in memory
-    custom_paths[path_id] = {
-        "id": path_id,
-        "name": name,
-        "config": custom_config,
-        "flight_path": flight_path,
-        "detections": detections,
-        "animation_data": animation_data,
-        "created_at": datetime.now().isoformat(),
-    }
+    busy = HTTPException(status_code=503, detail="Too many custom paths being generated, try again shortly")
+
+    if background:
+        # An accepted job waits for the CPU pool rather than failing when
+        # synchronous requests have filled its backlog
+        job = jobs.submit(
+            "custom_path",
+            lambda job: generate_custom_path(path_id, name, custom_config, job.report, wait=True),
+        )
+        if job is None:
+            raise busy
+        return JSONResponse(status_code=202, content={
+            "job_id": job.id,
+            "status": job.status,
+            "path_id": path_id,
+            "status_url": f"/api/jobs/{job.id}",
+            "events_url": f"/api/jobs/{job.id}/events",
+        })
 
-    return {
-        "id": path_id,
-        "name": name,
-        "waypoint_count": len(waypoints),
-        "detection_count": len(detections.get("features", [])),
-        "message": "Custom path created successfully",
-    }
+    # Generate flight path, detections and animation off the event loop
+    try:
+        return await generate_custom_path(path_id, name, custom_config)
+    except PoolBusy:
+        raise busy
 
 
 @app.get("/api/custom-path/{path_id}", tags=["Custom Paths"])
 async def get_custom_path(path_id: str) -> Dict:
     """Get custom path details including configuration and detection count."""
-    if path_id not in custom_paths:
+    path = await workers.run_io(custom_paths.info, path_id)
+    if path is None:
         raise HTTPException(status_code=404, detail="Custom path not found")
 
-    path = custom_paths[path_id]
     return {
         "id": path_id,
         "name": path["name"],
         "config": path["config"],
-        "detection_count": len(path["detections"].get("features", [])),
+        "detection_count": path["detection_count"],
         "created_at": path["created_at"],
     }
 
@@ -996,53 +1437,34 @@ async def get_custom_path(path_id: str) -> Dict:
 @app.get("/api/custom-path/{path_id}/detections", tags=["Custom Paths"])
 async def get_custom_path_detections(path_id: str) -> Dict:
     """Get simulated detections for a custom path as GeoJSON."""
-    if path_id not in custom_paths:
-        raise HTTPException(status_code=404, detail="Custom path not found")
-
-    return custom_paths[path_id]["detections"]
+    return (await get_custom_path_or_404(path_id))["detections"]
 
 
 @app.get("/api/custom-path/{path_id}/flight", tags=["Custom Paths"])
 async def get_custom_path_flight(path_id: str) -> Dict:
     """Get flight path GeoJSON for a custom path."""
-    if path_id not in custom_paths:
-        raise HTTPException(status_code=404, detail="Custom path not found")
-
-    return custom_paths[path_id]["flight_path"]
+    return (await get_custom_path_or_404(path_id))["flight_path"]
 
 
 @app.get("/api/custom-paths", tags=["Custom Paths"])
 async def list_custom_paths() -> Dict:
-    """List all custom paths created in this session."""
-    paths = []
-    for path_id, path in custom_paths.items():
-        paths.append({
-            "id": path_id,
-            "name": path["name"],
-            "waypoint_count": len(path["config"]["waypoints"]),
-            "detection_count": len(path["detections"].get("features", [])),
-            "created_at": path["created_at"],
-        })
-    return {"paths": paths}
+    """List all stored custom paths."""
+    return {"paths": await workers.run_io(custom_paths.list)}
 
 
 @app.delete("/api/custom-path/{path_id}", tags=["Custom Paths"])
 async def delete_custom_path(path_id: str) -> Dict:
     """Delete a custom path and its associated data."""
-    if path_id not in custom_paths:
+    if not await workers.run_io(custom_paths.delete, path_id):
         raise HTTPException(status_code=404, detail="Custom path not found")
 
-    del custom_paths[path_id]
     return {"message": "Custom path deleted"}
 
 
 @app.post("/api/custom-path/{path_id}/save-results")
 async def save_custom_path_results(path_id: str) -> Dict:
     """Save custom path results to disk for export."""
-    if path_id not in custom_paths:
-        raise HTTPException(status_code=404, detail="Custom path not found")
-
-    path = custom_paths[path_id]
+    path = await get_custom_path_or_404(path_id)
 
     # Create custom paths directory
     custom_dir = DATA_DIR / "custom_paths"
@@ -1050,18 +1472,15 @@ async def save_custom_path_results(path_id: str) -> Dict:
 
     # Save flight path
     flight_file = custom_dir / f"{path_id}_flight.geojson"
-    with open(flight_file, "w") as f:
-        json.dump(path["flight_path"], f, indent=2)
+    await workers.run_io(save_json, flight_file, path["flight_path"])
 
     # Save detections
     detections_file = custom_dir / f"{path_id}_detections.geojson"
-    with open(detections_file, "w") as f:
-        json.dump(path["detections"], f, indent=2)
+    await workers.run_io(save_json, detections_file, path["detections"])
 
     # Save animation data
     animation_file = custom_dir / f"{path_id}_animation.json"
-    with open(animation_file, "w") as f:
-        json.dump(path["animation_data"], f, indent=2)
+    await workers.run_io(save_json, animation_file, path["animation_data"])
 
     # Generate stats
     detections = path["detections"].get("features", [])
@@ -1086,8 +1505,7 @@ async def save_custom_path_results(path_id: str) -> Dict:
     }
 
     stats_file = custom_dir / f"{path_id}_stats.json"
-    with open(stats_file, "w") as f:
-        json.dump(stats, f, indent=2)
+    await workers.run_io(save_json, stats_file, stats)
 
     return {
         "message": "Results saved successfully",
@@ -1104,10 +1522,7 @@ async def save_custom_path_results(path_id: str) -> Dict:
 @app.get("/api/custom-path/{path_id}/export")
 async def export_custom_path(path_id: str, format: str = "geojson") -> Dict:
     """Export custom path data in various formats."""
-    if path_id not in custom_paths:
-        raise HTTPException(status_code=404, detail="Custom path not found")
-
-    path = custom_paths[path_id]
+    path = await get_custom_path_or_404(path_id)
     detections = path["detections"].get("features", [])
 
     if format == "geojson":
@@ -1154,6 +1569,49 @@ async def export_custom_path(path_id: str, format: str = "geojson") -> Dict:
         raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
 
 
+# =============================================================================
+# JOB ENDPOINTS
+# =============================================================================
+
+def get_job_or_404(job_id: str) -> Job:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/api/jobs/{job_id}", tags=["Jobs"])
+async def get_job(job_id: str) -> Dict:
+    """
+    Get the status of a background job.
+
+    `status` is `queued`, `running`, `done` or `failed`; `progress` goes from 0
+    to 1 and `stage` names the current step. Once done, `result` holds the
+    job's output (for custom paths, the usual creation response).
+    """
+    return get_job_or_404(job_id).to_dict()
+
+
+@app.get("/api/jobs/{job_id}/events", tags=["Jobs"])
+async def get_job_events(job_id: str):
+    """
+    Follow a background job as Server-Sent Events.
+
+    Each event is named after the job status (`queued`, `running`, `done`,
+    `failed`) and carries the same JSON as `/api/jobs/{job_id}`. The stream
+    ends after the `done` or `failed` event.
+
+    **Example:** `new EventSource("/api/jobs/3f2a9c1b7d4e/events")`
+    """
+    job = get_job_or_404(job_id)
+
+    async def events():
+        async for state in job.updates():
+            yield None if state is None else (state["status"], state)
+
+    return event_stream(events())
+
+
 # =============================================================================
 # GEOGRAPHY ENDPOINTS
 # =============================================================================
@@ -1188,7 +1646,7 @@ async def get_geography(location: str) -> Dict:
     for filename in file_mappings[location]:
         filepath = GEOGRAPHY_DIR / filename
         if filepath.exists():
-            data = load_json(filepath)
+            data = await workers.run_io(load_json, filepath)
             if data and "features" in data:
                 features.extend(data["features"])
 
@@ -1206,7 +1664,7 @@ async def list_geography() -> Dict:
 
     if GEOGRAPHY_DIR.exists():
         for f in GEOGRAPHY_DIR.glob("*.geojson"):
-            data = load_json(f)
+            data = await workers.run_io(load_json, f)
             available.append({
                 "filename": f.name,
                 "name": data.get("name", f.stem),
@@ -1224,7 +1682,7 @@ ANNUAL_DIR = DATA_DIR / "annual"
 
 
 @app.get("/api/analytics/annual/{year}", tags=["Analytics"])
-async def get_annual_summary(year: int) -> Dict:
+async def get_annual_summary(request: Request, year: int) -> Dict:
     """
     Get comprehensive annual statistics for a year.
 
@@ -1242,7 +1700,7 @@ async def get_annual_summary(year: int) -> Dict:
     if not summary_file.exists():
         raise HTTPException(status_code=404, detail=f"Annual data for {year} not found")
 
-    return load_json(summary_file)
+    return await workers.run_io(file_response, request, summary_file)
 
 
 @app.get("/api/analytics/monthly/{year}/{month}", tags=["Analytics"])
@@ -1263,7 +1721,7 @@ async def get_monthly_report(year: int, month: int) -> Dict:
     if not monthly_file.exists():
         raise HTTPException(status_code=404, detail=f"Monthly report for {year}/{month} not found")
 
-    return load_json(monthly_file)
+    return await workers.run_io(load_json, monthly_file)
 
 
 @app.get("/api/analytics/months/{year}", tags=["Analytics"])
@@ -1280,7 +1738,7 @@ async def list_monthly_reports(year: int) -> Dict:
     for month in range(1, 13):
         monthly_file = monthly_dir / f"{year}_{month:02d}_report.json"
         if monthly_file.exists():
-            data = load_json(monthly_file)
+            data = await workers.run_io(load_json, monthly_file)
             reports.append({
                 "month": month,
                 "month_name": data.get("month_name", ""),
@@ -1300,7 +1758,7 @@ async def get_hotspot_evolution(year: int) -> Dict:
     if not hotspots_file.exists():
         raise HTTPException(status_code=404, detail=f"Hotspot data for {year} not found")
 
-    hotspots = load_json(hotspots_file)
+    hotspots = await workers.run_io(load_json, hotspots_file)
 
     return {
         "year": year,
@@ -1323,7 +1781,7 @@ async def get_cleanup_events(year: int) -> Dict:
     if not cleanups_file.exists():
         raise HTTPException(status_code=404, detail=f"Cleanup data for {year} not found")
 
-    cleanups = load_json(cleanups_file)
+    cleanups = await workers.run_io(load_json, cleanups_file)
 
     total_items = sum(c.get("items_removed", 0) for c in cleanups)
     total_weight = sum(c.get("weight_removed_kg", 0) for c in cleanups)
@@ -1337,43 +1795,60 @@ async def get_cleanup_events(year: int) -> Dict:
     }
 
 
-@app.get("/api/analytics/detections/{year}")
+@app.get("/api/analytics/detections/{year}", response_class=FastJSONResponse)
 async def get_annual_detections(
+    request: Request,
     year: int,
     location: Optional[str] = None,
     month: Optional[int] = None,
     water_risk: Optional[str] = None,
     limit: Optional[int] = Query(None, ge=1, le=50000),
+    bbox: Optional[str] = Query(None, description="Only detections inside 'west,south,east,north' (degrees)"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    format: Optional[str] = Query(None, description="'json' (default), 'ndjson' or 'geojsonseq' to stream one feature per line"),
 ) -> Dict:
-    """Get annual detections with optional filtering."""
+    """
+    Get annual detections with optional filtering.
+
+    Page through large years with `limit` plus the returned `next_cursor`, or
+    stream them with `format=ndjson` / `format=geojsonseq` (next cursor in the
+    `X-Next-Cursor` header).
+    """
     detections_file = ANNUAL_DIR / f"detections_{year}.geojson"
 
     if not detections_file.exists():
         raise HTTPException(status_code=404, detail=f"Detection data for {year} not found")
 
-    data = load_json(detections_file)
-    features = data.get("features", [])
+    streaming = stream_format(format, request)
+    table = await workers.run_io(load_detection_table, detections_file)
+    rows = bbox_rows(table, bbox)
+    mask = table.all_rows(rows)
 
     # Apply filters
     if location:
-        features = [f for f in features if location.lower() in f["properties"].get("location", "").lower()]
+        mask &= table.mask_where("location", lambda value: location.lower() in value.lower(), rows)
 
     if month:
-        features = [f for f in features if f["properties"].get("month") == month]
+        mask &= table.column("month", rows) == month
 
     if water_risk:
-        features = [f for f in features if f["properties"].get("water_risk_level") == water_risk]
+        mask &= table.mask_equals("water_risk_level", water_risk, rows)
 
-    if limit:
-        features = features[:limit]
+    indices, next_cursor = detection_page(detections_file, mask, rows, limit, cursor)
 
-    return {
+    if streaming:
+        return stream_features(table, indices, streaming, {"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+    features = table.features_at(indices)
+
+    return FastJSONResponse({
         "type": "FeatureCollection",
         "year": year,
         "features": features,
         "count": len(features),
-        "filters": {"location": location, "month": month, "water_risk": water_risk},
-    }
+        "next_cursor": next_cursor,
+        "filters": {"location": location, "month": month, "water_risk": water_risk, "bbox": bbox},
+    })
 
 
 @app.get("/api/analytics/flights/{year}")
@@ -1384,7 +1859,7 @@ async def get_annual_flights(year: int) -> Dict:
     if not flights_file.exists():
         raise HTTPException(status_code=404, detail=f"Flight data for {year} not found")
 
-    flights = load_json(flights_file)
+    flights = await workers.run_io(load_json, flights_file)
 
     return {
         "year": year,
@@ -1417,7 +1892,7 @@ async def get_water_risk_summary(
     if not summary_file.exists():
         raise HTTPException(status_code=404, detail=f"Annual data for {year} not found")
 
-    data = load_json(summary_file)
+    data = await workers.run_io(load_json, summary_file)
     water_risk = data.get("water_risk_summary", {})
 
     return {
@@ -1443,7 +1918,7 @@ async def get_water_risk_hotspots(
     if not hotspots_file.exists():
         raise HTTPException(status_code=404, detail=f"Hotspot data for {year} not found")
 
-    hotspots = load_json(hotspots_file)
+    hotspots = await workers.run_io(load_json, hotspots_file)
 
     if risk_level:
         hotspots = [h for h in hotspots if h.get("water_risk") == risk_level]
@@ -1480,8 +1955,8 @@ async def get_executive_summary(year: int) -> Dict:
     if not summary_file.exists():
         raise HTTPException(status_code=404, detail=f"Annual data for {year} not found")
 
-    summary = load_json(summary_file)
-    hotspots = load_json(hotspots_file) if hotspots_file.exists() else []
+    summary = await workers.run_io(load_json, summary_file)
+    hotspots = await workers.run_io(load_json, hotspots_file) if hotspots_file.exists() else []
 
     # Calculate key metrics
     water_risk = summary.get("water_risk_summary", {})
@@ -1545,6 +2020,48 @@ async def get_executive_summary(year: int) -> Dict:
     }
 
 
+# CSV export: output column -> detection property ("lat"/"lon" are the coordinates)
+CSV_EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("date", "timestamp"),
+    ("latitude", "lat"),
+    ("longitude", "lon"),
+    ("category", "category_name"),
+    ("weight_kg", "estimated_weight_kg"),
+    ("priority", "priority"),
+    ("water_risk", "water_risk_level"),
+    ("water_proximity_m", "water_proximity_m"),
+    ("location", "location"),
+    ("drone_id", "drone_id"),
+    ("flight_id", "flight_id"),
+]
+
+
+def export_columns(detections_file: Path) -> Dict[str, List]:
+    """
+    Read the properties used by the CSV export, one list per property.
+
+    With a column sidecar only those columns are read; otherwise the GeoJSON
+    is parsed.
+    """
+    fields = [field for _, field in CSV_EXPORT_COLUMNS if field not in ("lat", "lon")]
+    dataset = load_detection_columns(detections_file)
+
+    if dataset is not None:
+        columns = {field: dataset.values(field) for field in fields}
+        columns["lat"] = dataset.lat.tolist()
+        columns["lon"] = dataset.lon.tolist()
+    else:
+        features = load_json(detections_file).get("features", [])
+        props = [f["properties"] for f in features]
+        columns = {field: [p.get(field) for p in props] for field in fields}
+        columns["lat"] = [f["geometry"]["coordinates"][1] for f in features]
+        columns["lon"] = [f["geometry"]["coordinates"][0] for f in features]
+
+    columns["timestamp"] = [(t or "")[:10] for t in columns["timestamp"]]
+    return columns
+
+
 @app.get("/api/reports/export/{year}", tags=["Reports"])
 async def export_annual_data(
     year: int,
@@ -1566,33 +2083,16 @@ async def export_annual_data(
         raise HTTPException(status_code=404, detail=f"Annual data for {year} not found")
 
     if format == "json":
-        return load_json(summary_file)
+        return await workers.run_io(load_json, summary_file)
 
     elif format == "csv":
         # Return CSV-ready detection data
         if not detections_file.exists():
             raise HTTPException(status_code=404, detail="Detection data not found")
 
-        data = load_json(detections_file)
-        rows = []
-
-        for f in data.get("features", []):
-            props = f["properties"]
-            coords = f["geometry"]["coordinates"]
-            rows.append({
-                "id": props.get("id"),
-                "date": props.get("timestamp", "")[:10],
-                "latitude": coords[1],
-                "longitude": coords[0],
-                "category": props.get("category_name"),
-                "weight_kg": props.get("estimated_weight_kg"),
-                "priority": props.get("priority"),
-                "water_risk": props.get("water_risk_level"),
-                "water_proximity_m": props.get("water_proximity_m"),
-                "location": props.get("location"),
-                "drone_id": props.get("drone_id"),
-                "flight_id": props.get("flight_id"),
-            })
+        columns = await workers.run_io(export_columns, detections_file)
+        names = [name for name, _ in CSV_EXPORT_COLUMNS]
+        rows = [dict(zip(names, values)) for values in zip(*(columns[field] for _, field in CSV_EXPORT_COLUMNS))]
 
         return {"format": "csv", "rows": rows, "count": len(rows)}
 
@@ -1610,6 +2110,20 @@ async def health_check():
     }
 
 
+@app.get("/api/metrics")
+async def get_metrics() -> Dict:
+    """Internal cache and performance counters."""
+    return {
+        "dataset_store": store.stats(),
+        "tile_cache": tile_cache.stats(),
+        "live_sessions": sessions.stats(),
+        "broadcast": broadcasts.stats(),
+        "workers": workers.stats(),
+        "jobs": jobs.stats(),
+        "custom_paths": await workers.run_io(custom_paths.stats),
+    }
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API info."""
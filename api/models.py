@@ -49,6 +49,7 @@ class DetectionResponse(BaseModel):
     type: str = Field(default="FeatureCollection", example="FeatureCollection")
     features: List[DetectionFeature]
     count: int = Field(..., example=247)
+    next_cursor: Optional[str] = Field(None, example="djE6MTc2ODQwMDAwMDAwMDAwMDAwMDoyNjg5NDY6OTk")
     filters_applied: Optional[Dict[str, Any]] = Field(None, example={"location": "stinson_beach", "priority": "high"})
 
 class CategoryInfo(BaseModel):
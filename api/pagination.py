@@ -0,0 +1,69 @@
+"""
+Sylva Pagination
+Opaque keyset cursors for paging through detection results
+TamAir - Conrad Challenge 2026
+"""
+
+import base64
+from typing import Optional, Tuple
+
+import numpy as np
+
+from api.datastore import Version
+
+CURSOR_PREFIX = "v1"
+
+
+def encode_cursor(version: Version, last_row: int) -> str:
+    """
+    Build a cursor pointing just after last_row.
+
+    The dataset version is embedded so a cursor cannot silently skip or repeat
+    rows after the file has been regenerated.
+    """
+    raw = f"{CURSOR_PREFIX}:{version[0]}:{version[1]}:{last_row}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, version: Version) -> int:
+    """
+    Get the last row returned by the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another dataset version
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, mtime_ns, size, last_row = base64.urlsafe_b64decode(padded).decode().split(":")
+        cursor_version = (int(mtime_ns), int(size))
+        last_row = int(last_row)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Malformed cursor")
+
+    if prefix != CURSOR_PREFIX:
+        raise ValueError("Malformed cursor")
+    if cursor_version != tuple(version):
+        raise ValueError("Cursor has expired because the dataset changed, restart from the first page")
+    return last_row
+
+
+def paginate(indices: np.ndarray, limit: Optional[int], after: Optional[int] = None) -> Tuple[np.ndarray, Optional[int]]:
+    """
+    Cut one page out of sorted row indices.
+
+    Args:
+        indices: All matching row indices, ascending
+        limit: Page size (None returns everything that is left)
+        after: Last row of the previous page
+
+    Returns:
+        Tuple of (page indices, last row of the page if more rows follow, else None)
+    """
+    if after is not None:
+        indices = indices[np.searchsorted(indices, after, "right"):]
+
+    if not limit or len(indices) <= limit:
+        return indices, None
+
+    page = indices[:limit]
+    return page, int(page[-1])
@@ -0,0 +1,489 @@
+"""
+Sylva Custom Path Store
+SQLite-backed storage for user-created flight paths with a bounded in-memory working set
+TamAir - Conrad Challenge 2026
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from api.responses import dumps_json
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # paths nobody opened for a week are dropped
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024  # JSON size of the simulations kept in memory
+MAX_CACHED_PATHS = 10000  # path metadata rows kept in memory (a few hundred bytes each)
+TOUCH_INTERVAL = 60.0  # seconds between last-access writes for the same path
+EXPIRE_INTERVAL = 300.0  # seconds between TTL sweeps
+
+# Bump when the simulation changes its output, so old cached results are not reused
+SIMULATION_VERSION = 1
+WAYPOINT_DECIMALS = 6  # ~0.1 m; routes closer than this share one simulation
+
+# Large parts of a path, stored per simulation as one compressed JSON blob
+PAYLOAD_FIELDS = ("flight_path", "detections", "animation_data")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS simulations (
+    key TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    payload_size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS custom_paths (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    accessed_at REAL NOT NULL,
+    waypoint_count INTEGER NOT NULL,
+    detection_count INTEGER NOT NULL,
+    config TEXT NOT NULL,
+    simulation_key TEXT NOT NULL REFERENCES simulations (key)
+);
+CREATE INDEX IF NOT EXISTS custom_paths_accessed ON custom_paths (accessed_at);
+CREATE INDEX IF NOT EXISTS custom_paths_simulation ON custom_paths (simulation_key);
+CREATE INDEX IF NOT EXISTS simulations_accessed ON simulations (accessed_at);
+"""
+
+
+# =============================================================================
+# SIMULATION KEYS
+# =============================================================================
+
+def normalize_waypoints(waypoints: List[Dict]) -> List[Dict]:
+    """Round waypoint coordinates to WAYPOINT_DECIMALS and name them Point 1..n."""
+    return [
+        {
+            "lat": round(float(wp["lat"]), WAYPOINT_DECIMALS),
+            "lon": round(float(wp["lon"]), WAYPOINT_DECIMALS),
+            "name": f"Point {i + 1}",
+        }
+        for i, wp in enumerate(waypoints)
+    ]
+
+
+def simulation_key(custom_config: Dict, seed: int) -> str:
+    """
+    Content hash of everything that shapes a custom path simulation.
+
+    The display name is left out - it only labels the output (see _named) -
+    so two users drawing the same route share one result.
+    """
+    canonical = [
+        SIMULATION_VERSION,
+        seed,
+        [[wp["lat"], wp["lon"]] for wp in custom_config["waypoints"]],
+        float(custom_config["survey_altitude_m"]),
+        float(custom_config["survey_speed_ms"]),
+        custom_config.get("flight_pattern"),
+        custom_config.get("corridor_width_m"),
+        custom_config.get("population_density"),
+    ]
+    return hashlib.sha256(json.dumps(canonical, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def _named(payload: Dict, name: str) -> Dict:
+    """
+    A simulation labelled with a path's name.
+
+    The name only appears in the flight line's and the detection collection's
+    "location" properties; everything else is shared with the cached payload.
+    """
+    flight_path = payload["flight_path"]
+    features = list(flight_path.get("features", []))
+    for i, feature in enumerate(features):
+        if feature["geometry"]["type"] == "LineString":
+            features[i] = {**feature, "properties": {**feature["properties"], "location": name}}
+            break
+    detections = payload["detections"]
+    return {
+        "flight_path": {**flight_path, "features": features},
+        "detections": {**detections, "properties": {**detections.get("properties", {}), "location": name}},
+        "animation_data": payload["animation_data"],
+    }
+
+
+class _LRU:
+    """Least-recently-used map bounded by a total cost (bytes or entries)."""
+
+    def __init__(self, max_cost: int):
+        self.max_cost = max_cost
+        self.cost = 0
+        self.evicted = 0
+        self._items: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Any:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        self._items.move_to_end(key)
+        return item[0]
+
+    def put(self, key: str, value: Any, cost: int = 1):
+        self.pop(key)
+        if cost > self.max_cost:
+            return  # bigger than the whole budget - always read from disk
+        self._items[key] = (value, cost)
+        self.cost += cost
+        while self.cost > self.max_cost:
+            _, (_, evicted_cost) = self._items.popitem(last=False)
+            self.cost -= evicted_cost
+            self.evicted += 1
+
+    def pop(self, key: str):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.cost -= item[1]
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class CustomPathStore:
+    """
+    Custom paths in an SQLite file, with the recently used ones kept in memory.
+
+    Simulations are content-addressed: each is stored once under
+    simulation_key() of its normalized config, and every path drawn along the
+    same route points at it. Creating a path whose simulation is cached skips
+    the simulation entirely (see peek_simulation / get_simulation).
+
+    Listing and path details read only the small metadata columns. Simulation
+    payloads (flight path, detections, animation frames) are loaded on demand
+    into an LRU cache bounded by their JSON size, so memory stays flat however
+    many paths exist. Paths not opened for ttl_seconds are deleted, and with
+    them any simulation no remaining path uses.
+
+    The database runs in WAL mode and each thread gets its own connection, so
+    the API's I/O threads and several server processes can share one file.
+    Paths never change after creation; a path deleted by another process may
+    still be served from this process's cache until its next last-access
+    write (at most TOUCH_INTERVAL seconds). Returned objects are shared
+    between requests and must be treated as read-only.
+
+    Methods block on disk I/O - call them from a worker thread (except
+    peek_simulation, which only looks in memory).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._simulations = _LRU(max_cache_bytes)  # key -> payload dict
+        self._paths = _LRU(MAX_CACHED_PATHS)  # path id -> (metadata dict, time of last access write)
+        self._last_expire = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.simulation_memory_hits = 0
+        self.simulation_disk_hits = 0
+        self.simulation_misses = 0
+        self.expired = 0
+        self._created = False
+
+    @property
+    def max_cache_bytes(self) -> int:
+        return self._simulations.max_cost
+
+    @property
+    def cache_bytes(self) -> int:
+        return self._simulations.cost
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            # The file and tables are created by the first write, not when the
+            # store is constructed, so importing the app or only reading
+            # (see _reader) leaves the data directory alone
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                if not self._created:
+                    db.executescript(SCHEMA)
+                    self._created = True
+            self._local.db = db
+        return db
+
+    def _reader(self) -> Optional[sqlite3.Connection]:
+        """Connection for lookups, or None while the database file does not exist yet."""
+        if getattr(self._local, "db", None) is None and not self.path.exists():
+            return None  # nothing stored - don't create the file just to read it
+        return self._db()
+
+    # -------------------------------------------------------------------------
+    # Simulations
+    # -------------------------------------------------------------------------
+
+    def peek_simulation(self, key: str) -> Optional[Dict]:
+        """Get a simulation from memory only (never blocks); None if not cached here."""
+        with self._lock:
+            payload = self._simulations.get(key)
+            if payload is not None:
+                self.simulation_memory_hits += 1
+        return payload
+
+    def get_simulation(self, key: str) -> Optional[Dict]:
+        """Get a simulation payload from memory or disk, or None if it was never run."""
+        payload = self.peek_simulation(key)
+        if payload is not None:
+            return payload
+        payload = self._load_simulation(key)
+        with self._lock:
+            if payload is None:
+                self.simulation_misses += 1
+            else:
+                self.simulation_disk_hits += 1
+        return payload
+
+    def _load_simulation(self, key: str) -> Optional[Dict]:
+        db = self._reader()
+        if db is None:
+            return None
+        row = db.execute("SELECT payload_size, payload FROM simulations WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        size, blob = row
+        payload = json.loads(zlib.decompress(blob))
+        with self._lock:
+            self._simulations.put(key, payload, size)
+        return payload
+
+    def put_simulation(self, key: str, payload: Dict):
+        """Store a simulation result (flight_path, detections, animation_data) under its key."""
+        payload = {field: payload[field] for field in PAYLOAD_FIELDS}
+        data = dumps_json(payload)
+        now = time.time()
+        self._db().execute(
+            "INSERT OR IGNORE INTO simulations VALUES (?, ?, ?, ?, ?)",
+            (key, now, now, len(data), zlib.compress(data, 1)),
+        )
+        with self._lock:
+            self._simulations.put(key, payload, len(data))
+
+    # -------------------------------------------------------------------------
+    # Paths
+    # -------------------------------------------------------------------------
+
+    def put(self, path: Dict):
+        """
+        Store a new path.
+
+        Args:
+            path: Dict with id, name, config, created_at, detection_count and
+                the simulation_key of a simulation already stored with put_simulation
+        """
+        now = time.time()
+        meta = {
+            "id": path["id"],
+            "name": path["name"],
+            "config": path["config"],
+            "waypoint_count": len(path["config"].get("waypoints", [])),
+            "detection_count": path["detection_count"],
+            "created_at": path["created_at"],
+            "simulation_key": path["simulation_key"],
+        }
+        self._db().execute(
+            "INSERT OR REPLACE INTO custom_paths VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                meta["id"], meta["name"], meta["created_at"], now, meta["waypoint_count"],
+                meta["detection_count"], dumps_json(meta["config"]).decode("utf-8"), meta["simulation_key"],
+            ),
+        )
+        with self._lock:
+            self._paths.put(meta["id"], (meta, now))
+        self.expire_if_due()
+
+    def info(self, path_id: str) -> Optional[Dict]:
+        """
+        Get a path's metadata and config without loading its simulation.
+
+        Returns:
+            Dict with id, name, config, waypoint_count, detection_count,
+            created_at and simulation_key, or None
+        """
+        now = time.time()
+        with self._lock:
+            cached = self._paths.get(path_id)
+        if cached is not None:
+            meta, touched = cached
+            if now - touched < TOUCH_INTERVAL:
+                return meta
+            if self._touch(path_id, meta["simulation_key"], now):
+                with self._lock:
+                    self._paths.put(path_id, (meta, now))
+                return meta
+            with self._lock:
+                self._paths.pop(path_id)  # deleted elsewhere
+            return None
+
+        db = self._reader()
+        if db is None:
+            return None
+        row = db.execute(
+            "SELECT name, created_at, waypoint_count, detection_count, config, simulation_key "
+            "FROM custom_paths WHERE id = ?",
+            (path_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        name, created_at, waypoint_count, detection_count, config, key = row
+        meta = {
+            "id": path_id,
+            "name": name,
+            "config": json.loads(config),
+            "waypoint_count": waypoint_count,
+            "detection_count": detection_count,
+            "created_at": created_at,
+            "simulation_key": key,
+        }
+        self._touch(path_id, key, now)
+        with self._lock:
+            self._paths.put(path_id, (meta, now))
+        return meta
+
+    def get(self, path_id: str) -> Optional[Dict]:
+        """Get a full path (id, name, config, created_at and PAYLOAD_FIELDS), or None."""
+        meta = self.info(path_id)
+        if meta is None:
+            return None
+
+        key = meta["simulation_key"]
+        with self._lock:
+            payload = self._simulations.get(key)
+            if payload is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if payload is None:
+            payload = self._load_simulation(key)
+            if payload is None:
+                return None
+        return {
+            "id": path_id,
+            "name": meta["name"],
+            "config": meta["config"],
+            "created_at": meta["created_at"],
+            **_named(payload, meta["name"]),
+        }
+
+    def list(self) -> List[Dict]:
+        """Summaries of every stored path, oldest first."""
+        db = self._reader()
+        if db is None:
+            return []
+        rows = db.execute(
+            "SELECT id, name, waypoint_count, detection_count, created_at FROM custom_paths ORDER BY created_at"
+        ).fetchall()
+        return [
+            {
+                "id": path_id,
+                "name": name,
+                "waypoint_count": waypoint_count,
+                "detection_count": detection_count,
+                "created_at": created_at,
+            }
+            for path_id, name, waypoint_count, detection_count, created_at in rows
+        ]
+
+    def delete(self, path_id: str) -> bool:
+        """Delete a path (its simulation stays cached for others); False if it did not exist."""
+        with self._lock:
+            self._paths.pop(path_id)
+        db = self._reader()
+        if db is None:
+            return False
+        return db.execute("DELETE FROM custom_paths WHERE id = ?", (path_id,)).rowcount > 0
+
+    def _touch(self, path_id: str, key: str, now: float) -> bool:
+        """Record an access for TTL purposes; False if the path no longer exists."""
+        db = self._db()
+        db.execute("UPDATE simulations SET accessed_at = ? WHERE key = ?", (now, key))
+        return db.execute("UPDATE custom_paths SET accessed_at = ? WHERE id = ?", (now, path_id)).rowcount > 0
+
+    def expire(self) -> int:
+        """
+        Delete paths not accessed within ttl_seconds, then simulations that no
+        path uses and nobody reused within ttl_seconds.
+
+        Returns:
+            Number of paths removed
+        """
+        now = time.time()
+        self._last_expire = now
+        cutoff = now - self.ttl_seconds
+        db = self._reader()
+        if db is None:
+            return 0
+        expired = [row[0] for row in db.execute("SELECT id FROM custom_paths WHERE accessed_at < ?", (cutoff,))]
+        if expired:
+            db.execute("DELETE FROM custom_paths WHERE accessed_at < ?", (cutoff,))
+        orphans = [row[0] for row in db.execute(
+            "SELECT key FROM simulations WHERE accessed_at < ? "
+            "AND key NOT IN (SELECT simulation_key FROM custom_paths)",
+            (cutoff,),
+        )]
+        if orphans:
+            db.executemany("DELETE FROM simulations WHERE key = ?", [(key,) for key in orphans])
+        with self._lock:
+            for path_id in expired:
+                self._paths.pop(path_id)
+            for key in orphans:
+                self._simulations.pop(key)
+            self.expired += len(expired)
+        return len(expired)
+
+    def expire_if_due(self):
+        """Run expire() if the last sweep was more than EXPIRE_INTERVAL ago."""
+        if time.time() - self._last_expire >= EXPIRE_INTERVAL:
+            self.expire()
+
+    def stats(self) -> Dict:
+        """Get stored/cached counts, path cache counters and simulation cache hit rates."""
+        db = self._reader()
+        if db is None:
+            stored = simulations = 0
+        else:
+            stored = db.execute("SELECT COUNT(*) FROM custom_paths").fetchone()[0]
+            simulations = db.execute("SELECT COUNT(*) FROM simulations").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            simulation_hits = self.simulation_memory_hits + self.simulation_disk_hits
+            simulation_lookups = simulation_hits + self.simulation_misses
+            return {
+                "stored_paths": stored,
+                "stored_simulations": simulations,
+                "cached_paths": len(self._paths),
+                "cached_simulations": len(self._simulations),
+                "cache_bytes": self._simulations.cost,
+                "max_cache_bytes": self._simulations.max_cost,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evicted": self._simulations.evicted,
+                "expired": self.expired,
+                "ttl_seconds": self.ttl_seconds,
+                "simulation_cache": {
+                    "memory_hits": self.simulation_memory_hits,
+                    "disk_hits": self.simulation_disk_hits,
+                    "misses": self.simulation_misses,
+                    "hit_rate": round(simulation_hits / simulation_lookups, 4) if simulation_lookups else 0.0,
+                },
+            }
@@ -0,0 +1,264 @@
+"""
+Sylva API Responses
+Response helpers for large GeoJSON payloads
+TamAir - Conrad Challenge 2026
+"""
+
+import gzip
+import hashlib
+import json
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from api.detection_index import DetectionTable
+
+try:
+    import brotli
+except ImportError:  # Optional - gzip is always available
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # Optional - falls back to the standard json module
+    orjson = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+GEOJSON_SEQ_MEDIA_TYPE = "application/geo+json-seq"
+
+# Streamed output formats: name -> (media type, record prefix)
+STREAM_FORMATS = {
+    "ndjson": (NDJSON_MEDIA_TYPE, b""),
+    "geojsonseq": (GEOJSON_SEQ_MEDIA_TYPE, b"\x1e"),  # RFC 8142 record separator
+}
+
+# Features serialized per chunk written to the socket
+STREAM_CHUNK_SIZE = 500
+
+
+# =============================================================================
+# FAST JSON
+# =============================================================================
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for large payloads that are already in their final shape.
+
+    Returning one of these from an endpoint skips response_model validation
+    and jsonable_encoder entirely - the content is written straight to bytes.
+    Keep response_model on the route so the OpenAPI schema is unchanged.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+# =============================================================================
+# STREAMED OUTPUT
+# =============================================================================
+
+def negotiate_stream_format(format: Optional[str], accept: Optional[str]) -> Optional[str]:
+    """
+    Decide whether a request wants streamed line-delimited output.
+
+    An explicit ?format= wins over the Accept header.
+
+    Returns:
+        'ndjson', 'geojsonseq', or None for a regular JSON body
+
+    Raises:
+        ValueError: For an unknown format name
+    """
+    if format:
+        if format == "json":
+            return None
+        if format not in STREAM_FORMATS:
+            raise ValueError(f"Unknown format: {format}")
+        return format
+
+    accept = accept or ""
+    if GEOJSON_SEQ_MEDIA_TYPE in accept:
+        return "geojsonseq"
+    if NDJSON_MEDIA_TYPE in accept:
+        return "ndjson"
+    return None
+
+
+def _iter_feature_lines(table: DetectionTable, indices: np.ndarray, prefix: bytes) -> Iterator[bytes]:
+    """Serialize features one line at a time, yielding a chunk every STREAM_CHUNK_SIZE."""
+    for start in range(0, len(indices), STREAM_CHUNK_SIZE):
+        features = table.features_at(indices[start:start + STREAM_CHUNK_SIZE])
+        yield b"".join(prefix + dumps_json(feature) + b"\n" for feature in features)
+
+
+def stream_features(
+    table: DetectionTable,
+    indices: np.ndarray,
+    format: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """
+    Stream table rows as NDJSON or GeoJSON text sequences.
+
+    Features are looked up and serialized one chunk at a time while the
+    response is being sent, so peak memory does not grow with the size of the
+    result and the first bytes go out immediately.
+    """
+    media_type, prefix = STREAM_FORMATS[format]
+    return StreamingResponse(
+        _iter_feature_lines(table, indices, prefix),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+# =============================================================================
+# SERVER-SENT EVENTS
+# =============================================================================
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+async def _iter_sse(events: AsyncIterator[Optional[Tuple[str, Any]]]) -> AsyncIterator[bytes]:
+    async for item in events:
+        if item is None:
+            yield b": keep-alive\n\n"
+        else:
+            name, data = item
+            yield b"event: " + name.encode("utf-8") + b"\ndata: " + dumps_json(data) + b"\n\n"
+
+
+def event_stream(events: AsyncIterator[Optional[Tuple[str, Any]]]) -> StreamingResponse:
+    """
+    Send (event name, JSON data) pairs as a text/event-stream response.
+
+    A None item writes a comment line, which keeps proxies from closing an
+    idle stream.
+    """
+    return StreamingResponse(
+        _iter_sse(events),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# =============================================================================
+# PRECOMPRESSED FILE RESPONSES
+# =============================================================================
+
+# Preferred content codings, best first
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+
+class StaticPayload:
+    """
+    A data file served byte-for-byte, with every encoding computed up front.
+
+    Built once per file version (see DatasetStore.derive), so requests never
+    re-parse, re-serialize or re-compress the file.
+    """
+
+    def __init__(self, body: bytes, mtime: float):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.mtime = int(mtime)
+
+        self.bodies = {"identity": body}
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(compressed) < len(body):
+            self.bodies["gzip"] = compressed
+        if brotli is not None:
+            compressed = brotli.compress(body, quality=11)
+            if len(compressed) < len(body):
+                self.bodies["br"] = compressed
+
+        # Strong validators must differ between content codings
+        self.etags = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in self.bodies
+        }
+
+    def choose_encoding(self, accept_encoding: Optional[str]) -> str:
+        """Pick the best available encoding allowed by an Accept-Encoding header."""
+        accepted = _parse_accept_encoding(accept_encoding or "")
+        for encoding in ENCODING_PREFERENCE:
+            if encoding not in self.bodies:
+                continue
+            q = accepted.get(encoding, accepted.get("*", 1.0 if encoding == "identity" else 0.0))
+            if q > 0:
+                return encoding
+        return "identity"
+
+    def not_modified(self, request: Request) -> bool:
+        """Check If-None-Match (or If-Modified-Since when no ETag was sent)."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = _parse_etags(if_none_match)
+            return "*" in tags or any(tag in tags for tag in self.etags.values())
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= self.mtime
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse 'gzip, br;q=0.9' into {'gzip': 1.0, 'br': 0.9}."""
+    accepted = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def _parse_etags(header: str) -> List[str]:
+    """Parse an If-None-Match list, dropping weak prefixes (weak comparison)."""
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def static_response(request: Request, payload: StaticPayload, media_type: str = "application/json") -> Response:
+    """Serve a precompressed payload, answering 304 when the client copy is current."""
+    encoding = payload.choose_encoding(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": payload.etags[encoding],
+        "Last-Modified": payload.last_modified,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    if payload.not_modified(request):
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=payload.bodies[encoding], media_type=media_type, headers=headers)
@@ -0,0 +1,142 @@
+"""
+Sylva Spatial Index
+Sparse uniform grid over detection points for bounding-box queries
+TamAir - Conrad Challenge 2026
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+BBox = Tuple[float, float, float, float]  # west, south, east, north
+
+# Target average number of points per occupied grid cell
+POINTS_PER_CELL = 16
+MIN_CELL_DEG = 0.0002  # ~20 m
+MAX_CELL_DEG = 1.0
+
+
+def parse_bbox(value: str) -> BBox:
+    """
+    Parse a 'west,south,east,north' query string.
+
+    Raises:
+        ValueError: If the string is malformed or out of range
+    """
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ValueError("bbox must be 'west,south,east,north'")
+
+    west, south, east, north = (float(p) for p in parts)
+
+    if not (-180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError("bbox longitudes must be between -180 and 180")
+    if not (-90 <= south <= north <= 90):
+        raise ValueError("bbox latitudes must satisfy -90 <= south <= north <= 90")
+
+    return west, south, east, north
+
+
+def _auto_cell_size(lon: np.ndarray, lat: np.ndarray) -> float:
+    """Pick a cell size so occupied cells hold about POINTS_PER_CELL points."""
+    n = len(lon)
+    span = max(float(np.ptp(lon)), float(np.ptp(lat)), MIN_CELL_DEG)
+
+    # Start coarse, then size cells from the area the points actually occupy
+    cell = min(MAX_CELL_DEG, max(MIN_CELL_DEG, span / max(1.0, np.sqrt(n))))
+    keys = np.floor(lon / cell).astype(np.int64) * 1_000_003 + np.floor(lat / cell).astype(np.int64)
+    occupied_area = len(np.unique(keys)) * cell * cell
+
+    cell = np.sqrt(occupied_area * POINTS_PER_CELL / n)
+    return float(min(MAX_CELL_DEG, max(MIN_CELL_DEG, cell)))
+
+
+class GridIndex:
+    """
+    Static grid index over lon/lat points.
+
+    Points are bucketed into square cells and sorted by (row, column), so every
+    row of cells inside a query box is one contiguous slice of the sorted
+    order. A query does two binary searches per occupied row, then an exact
+    coordinate check on the candidates - cost follows the number of points
+    returned, not the size of the dataset.
+    """
+
+    def __init__(self, lon: np.ndarray, lat: np.ndarray, cell_size: Optional[float] = None):
+        self.lon = lon
+        self.lat = lat
+        n = len(lon)
+
+        if n == 0:
+            self.cell_size = cell_size or MAX_CELL_DEG
+            self.order = np.empty(0, dtype=np.int64)
+            self.keys = np.empty(0, dtype=np.int64)
+            self.rows = np.empty(0, dtype=np.int64)
+            self.ix_min = self.ix_max = 0
+            return
+
+        self.cell_size = cell_size or _auto_cell_size(lon, lat)
+
+        ix = np.floor(lon / self.cell_size).astype(np.int64)
+        iy = np.floor(lat / self.cell_size).astype(np.int64)
+        self.ix_min, self.ix_max = int(ix.min()), int(ix.max())
+        self._width = self.ix_max - self.ix_min + 1
+
+        keys = iy * self._width + (ix - self.ix_min)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+        self.rows = np.unique(iy)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _query_range(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        """Row indices inside a box that does not cross the antimeridian."""
+        if not len(self.order):
+            return self.order
+
+        iy0 = int(np.floor(south / self.cell_size))
+        iy1 = int(np.floor(north / self.cell_size))
+        ix0 = max(int(np.floor(west / self.cell_size)), self.ix_min)
+        ix1 = min(int(np.floor(east / self.cell_size)), self.ix_max)
+        if ix0 > ix1:
+            return np.empty(0, dtype=np.int64)
+
+        # Only rows that actually contain points
+        rows = self.rows[np.searchsorted(self.rows, iy0, "left"):np.searchsorted(self.rows, iy1, "right")]
+        if not len(rows):
+            return np.empty(0, dtype=np.int64)
+
+        starts = np.searchsorted(self.keys, rows * self._width + (ix0 - self.ix_min), "left")
+        ends = np.searchsorted(self.keys, rows * self._width + (ix1 - self.ix_min), "right")
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Concatenate the [start, end) slices without a Python loop
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        candidates = self.order[np.arange(total) + offsets]
+
+        lon = self.lon[candidates]
+        lat = self.lat[candidates]
+        inside = (lon >= west) & (lon <= east) & (lat >= south) & (lat <= north)
+        return candidates[inside]
+
+    def query(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        """
+        Find all points inside a bounding box.
+
+        Boxes with west > east are treated as crossing the antimeridian.
+
+        Returns:
+            Sorted row indices of the matching points
+        """
+        if west > east:
+            result = np.concatenate([
+                self._query_range(west, south, 180.0, north),
+                self._query_range(-180.0, south, east, north),
+            ])
+        else:
+            result = self._query_range(west, south, east, north)
+        return np.sort(result)
@@ -0,0 +1,357 @@
+"""
+Sylva Vector Tiles
+Mapbox Vector Tile (MVT 2.1) encoding for detections, clusters and flight paths
+TamAir - Conrad Challenge 2026
+"""
+
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from api.detection_index import DetectionTable
+from simulation.geo import lonlat_to_tile_pixels, tile_bounds
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+EXTENT = 4096
+BUFFER = 64  # tile units drawn past each edge so symbols and lines do not clip
+MAX_ZOOM = 22
+
+# Thinning: above this many points, keep one point per THIN_CELL x THIN_CELL units
+MAX_POINTS_PER_TILE = 2000
+THIN_CELL = 16  # 4096 / 16 = 256 cells per side, about one per screen pixel
+
+# Geometry types and commands (MVT spec 4.3)
+GEOM_POINT = 1
+GEOM_LINESTRING = 2
+CMD_MOVE_TO = 1
+CMD_LINE_TO = 2
+
+
+# =============================================================================
+# PROTOBUF WRITER
+# =============================================================================
+
+def _varint(value: int) -> bytes:
+    value &= 0xFFFFFFFFFFFFFFFF  # negative int64 -> two's complement
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _bytes_field(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed_field(field: int, values: Sequence[int]) -> bytes:
+    return _bytes_field(field, b"".join(_varint(v) for v in values))
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _command(command: int, count: int) -> int:
+    return (command & 0x7) | (count << 3)
+
+
+def _encode_value(value: Any) -> bytes:
+    """Encode a property value as a tile Value message."""
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        if value >= 0:
+            return _key(5, 0) + _varint(value)  # uint_value
+        return _key(6, 0) + _varint(_zigzag(value))  # sint_value
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)  # double_value
+    return _bytes_field(1, str(value).encode("utf-8"))  # string_value
+
+
+class LayerBuilder:
+    """Collects features for one tile layer, sharing its key and value tables."""
+
+    def __init__(self, name: str, extent: int = EXTENT):
+        self.name = name
+        self.extent = extent
+        self.keys: Dict[str, int] = {}
+        self.values: Dict[Any, int] = {}
+        self.features: List[bytes] = []
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def _tags(self, properties: Dict) -> List[int]:
+        tags = []
+        for key, value in properties.items():
+            if value is None or isinstance(value, (dict, list)):
+                continue
+            key_id = self.keys.setdefault(key, len(self.keys))
+            value_id = self.values.setdefault((type(value), value), len(self.values))
+            tags.extend((key_id, value_id))
+        return tags
+
+    def add_feature(self, geom_type: int, geometry: List[int], properties: Dict, feature_id: Optional[int] = None):
+        """Add a feature with an already command-encoded geometry."""
+        message = b""
+        if feature_id is not None:
+            message += _key(1, 0) + _varint(feature_id)
+        tags = self._tags(properties)
+        if tags:
+            message += _packed_field(2, tags)
+        message += _key(3, 0) + _varint(geom_type)
+        message += _packed_field(4, geometry)
+        self.features.append(message)
+
+    def encode(self) -> bytes:
+        message = _key(15, 0) + _varint(2)  # version
+        message += _bytes_field(1, self.name.encode("utf-8"))
+        message += b"".join(_bytes_field(2, feature) for feature in self.features)
+        message += b"".join(_bytes_field(3, key.encode("utf-8")) for key in self.keys)
+        message += b"".join(_bytes_field(4, _encode_value(value)) for _, value in self.values)
+        message += _key(5, 0) + _varint(self.extent)
+        return message
+
+
+def encode_tile(layers: Sequence[LayerBuilder]) -> bytes:
+    """Serialize non-empty layers into a tile; an empty tile is zero bytes."""
+    return b"".join(_bytes_field(3, layer.encode()) for layer in layers if len(layer))
+
+
+# =============================================================================
+# GEOMETRY
+# =============================================================================
+
+def _point_geometry(px: int, py: int) -> List[int]:
+    return [_command(CMD_MOVE_TO, 1), _zigzag(px), _zigzag(py)]
+
+
+def _line_geometry(runs: List[np.ndarray]) -> List[int]:
+    """Encode one or more integer vertex runs as a (multi) LineString."""
+    geometry: List[int] = []
+    cx = cy = 0
+    for run in runs:
+        # Drop vertices that land on the same tile unit as the previous one
+        keep = np.ones(len(run), dtype=bool)
+        keep[1:] = np.any(run[1:] != run[:-1], axis=1)
+        run = run[keep]
+        if len(run) < 2:
+            continue
+
+        deltas = np.diff(run, axis=0, prepend=[[cx, cy]])
+        zz = ((deltas << 1) ^ (deltas >> 63)).tolist()
+        geometry += [_command(CMD_MOVE_TO, 1), *zz[0], _command(CMD_LINE_TO, len(run) - 1)]
+        for dx, dy in zz[1:]:
+            geometry += (dx, dy)
+        cx, cy = int(run[-1, 0]), int(run[-1, 1])
+    return geometry
+
+
+def clip_line(px: np.ndarray, py: np.ndarray, low: float, high: float) -> List[np.ndarray]:
+    """
+    Clip a polyline to the square [low, high] (Liang-Barsky, all segments at once).
+
+    Returns:
+        Visible runs as (k, 2) float arrays
+    """
+    if len(px) < 2:
+        return []
+
+    x0, y0 = px[:-1], py[:-1]
+    dx, dy = np.diff(px), np.diff(py)
+    t0 = np.zeros(len(dx))
+    t1 = np.ones(len(dx))
+    visible = np.ones(len(dx), dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x0 - low), (dx, high - x0), (-dy, y0 - low), (dy, high - y0)):
+            r = q / p
+            visible &= ~((p == 0) & (q < 0))
+            t0 = np.where(p < 0, np.maximum(t0, r), t0)
+            t1 = np.where(p > 0, np.minimum(t1, r), t1)
+    visible &= t0 <= t1
+
+    runs = []
+    current: List[List[float]] = []
+    for i in np.flatnonzero(visible).tolist():
+        start = [x0[i] + t0[i] * dx[i], y0[i] + t0[i] * dy[i]]
+        end = [x0[i] + t1[i] * dx[i], y0[i] + t1[i] * dy[i]]
+        # A segment continues the run if the previous one ended unclipped at its start
+        if current and t0[i] == 0 and visible[i - 1] and t1[i - 1] == 1:
+            current.append(end)
+        else:
+            if current:
+                runs.append(np.array(current))
+            current = [start, end]
+    if current:
+        runs.append(np.array(current))
+    return runs
+
+
+# =============================================================================
+# LAYERS
+# =============================================================================
+
+def thin_points(px: np.ndarray, py: np.ndarray, rank: np.ndarray, cell: int = THIN_CELL):
+    """
+    Keep the highest-ranked point per cell x cell block of tile units.
+
+    Returns:
+        Tuple of (kept positions into the inputs, sorted; points merged into each)
+    """
+    cx = np.floor_divide(px, cell).astype(np.int64)
+    cy = np.floor_divide(py, cell).astype(np.int64)
+    cells = (cy - cy.min()) * (int(cx.max() - cx.min()) + 1) + (cx - cx.min())
+
+    order = np.argsort(-np.nan_to_num(rank, nan=-np.inf), kind="stable")
+    _, first, counts = np.unique(cells[order], return_index=True, return_counts=True)
+    kept = order[first]
+    by_position = np.argsort(kept)
+    return kept[by_position], counts[by_position]
+
+
+def point_layer(
+    name: str,
+    table: DetectionTable,
+    z: int,
+    x: int,
+    y: int,
+    properties: Optional[Sequence[str]] = None,
+    max_points: int = MAX_POINTS_PER_TILE,
+) -> LayerBuilder:
+    """
+    Encode the points of a table that fall inside a tile.
+
+    When a tile holds more than max_points, points are thinned to one per
+    small block (keeping the heaviest), and survivors carry a point_count.
+
+    Args:
+        properties: Property names to copy onto features (None copies every scalar)
+    """
+    layer = LayerBuilder(name)
+    rows = table.spatial_index.query(*tile_bounds(z, x, y, BUFFER / EXTENT))
+    if not len(rows):
+        return layer
+
+    px, py = lonlat_to_tile_pixels(table.lon[rows], table.lat[rows], z, x, y, EXTENT)
+    ipx = np.round(px).astype(np.int64)
+    ipy = np.round(py).astype(np.int64)
+
+    counts = None
+    if len(rows) > max_points:
+        kept, counts = thin_points(ipx, ipy, table.weight[rows])
+        rows, ipx, ipy = rows[kept], ipx[kept], ipy[kept]
+
+    features = table.features_at(rows)
+    for i, feature in enumerate(features):
+        props = feature.get("properties") or {}
+        if properties is not None:
+            props = {key: props[key] for key in properties if key in props}
+        if counts is not None:
+            props = {**props, "point_count": int(counts[i])}
+        layer.add_feature(GEOM_POINT, _point_geometry(int(ipx[i]), int(ipy[i])), props, int(rows[i]))
+    return layer
+
+
+def feature_layer(
+    name: str,
+    features: List[Dict],
+    z: int,
+    x: int,
+    y: int,
+    properties: Optional[Sequence[str]] = None,
+) -> LayerBuilder:
+    """Encode a small list of GeoJSON Point/LineString features, clipping lines to the tile."""
+    layer = LayerBuilder(name)
+    west, south, east, north = tile_bounds(z, x, y, BUFFER / EXTENT)
+
+    for feature_id, feature in enumerate(features):
+        geometry = feature.get("geometry") or {}
+        coords = np.asarray(geometry.get("coordinates") or [], dtype=np.float64)
+        if coords.size == 0:
+            continue
+        coords = coords.reshape(-1, coords.shape[-1])[:, :2]
+
+        lon, lat = coords[:, 0], coords[:, 1]
+        if lon.max() < west or lon.min() > east or lat.max() < south or lat.min() > north:
+            continue
+
+        props = feature.get("properties") or {}
+        if properties is not None:
+            props = {key: props[key] for key in properties if key in props}
+
+        px, py = lonlat_to_tile_pixels(lon, lat, z, x, y, EXTENT)
+        if geometry["type"] == "Point":
+            layer.add_feature(GEOM_POINT, _point_geometry(int(round(px[0])), int(round(py[0]))), props, feature_id)
+        elif geometry["type"] == "LineString":
+            runs = [np.round(run).astype(np.int64) for run in clip_line(px, py, -BUFFER, EXTENT + BUFFER)]
+            encoded = _line_geometry(runs)
+            if encoded:
+                layer.add_feature(GEOM_LINESTRING, encoded, props, feature_id)
+    return layer
+
+
+def valid_tile(z: int, x: int, y: int) -> bool:
+    """Check a tile address is inside the XYZ pyramid."""
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class TileCache:
+    """
+    Thread-safe LRU cache of rendered tiles.
+
+    Keys should include the source file versions, so regenerated data never
+    serves stale tiles - old entries simply age out.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,263 @@
+"""
+Sylva Workers
+Thread and process pools that keep blocking work off the event loop
+TamAir - Conrad Challenge 2026
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+CPU_COUNT = os.cpu_count() or 1
+IO_WORKERS = min(32, CPU_COUNT + 4)  # file reads mostly wait on the disk
+CPU_WORKERS = max(1, min(4, CPU_COUNT - 1))  # leave a core for the event loop
+MAX_CPU_BACKLOG = 16  # CPU jobs queued or running before new ones are refused
+
+
+class PoolBusy(Exception):
+    """Raised when the CPU pool already has MAX_CPU_BACKLOG jobs in flight."""
+
+
+# Set in every CPU worker by _init_worker; progress reports travel back through it
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+class ProgressReporter:
+    """
+    Picklable progress callback passed to CPU jobs as progress(stage, fraction).
+
+    Reports are sent back to the server process, at most one per stage and
+    percent, so calling it from a tight loop is cheap.
+    """
+
+    def __init__(self, token: int):
+        self.token = token
+        self._last: Optional[Tuple[str, int]] = None
+
+    def __call__(self, stage: str, fraction: float):
+        step = (stage, int(fraction * 100))
+        if step != self._last and _progress_queue is not None:
+            self._last = step
+            _progress_queue.put((self.token, stage, fraction))
+
+
+class WorkerPools:
+    """
+    Run blocking calls from async handlers without stalling the event loop.
+
+    File reads and writes go to a thread pool: they spend their time waiting on
+    the disk, and threads share the in-memory dataset cache. Pure-Python CPU
+    work (flight path and detection simulation) goes to a process pool, since
+    threads would still hold the GIL and stall the loop just the same.
+
+    Both pools are bounded: at most io_workers threads and cpu_workers
+    processes run at once, and at most max_cpu_backlog CPU jobs may be waiting
+    or running - further ones raise PoolBusy instead of queueing without limit.
+    Callers that have already accepted the work (background jobs) pass
+    wait=True to queue for a free slot instead; a freed slot goes to the
+    longest-waiting of them before any new request.
+    The process pool starts on first use with the "spawn" method, so workers
+    never inherit locks held by the server's threads.
+
+    CPU jobs can report progress: run_cpu(..., on_progress=callback) passes a
+    ProgressReporter as the job's progress argument, and a listener thread
+    hands each report to callback on the caller's event loop.
+    """
+
+    def __init__(self, io_workers: int = IO_WORKERS, cpu_workers: int = CPU_WORKERS,
+                 max_cpu_backlog: int = MAX_CPU_BACKLOG):
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers
+        self.max_cpu_backlog = max_cpu_backlog
+        self._io = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="sylva-io")
+        self._cpu: Optional[Executor] = None
+        self.cpu_mode = "process"
+        self._lock = threading.Lock()
+        self._progress_queue = None
+        self._listeners: Dict[int, Tuple[asyncio.AbstractEventLoop, Callable[[str, float], None]]] = {}
+        self._tokens = itertools.count(1)
+        self._slot_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self.io_tasks = 0
+        self.cpu_tasks = 0
+        self.cpu_in_flight = 0
+        self.cpu_rejected = 0
+        self.cpu_restarts = 0
+
+    def _cpu_pool(self) -> Executor:
+        with self._lock:
+            if self._cpu is None:
+                try:
+                    context = multiprocessing.get_context("spawn")
+                    if self._progress_queue is None:
+                        self._start_listener(context.Queue())
+                    self._cpu = ProcessPoolExecutor(
+                        max_workers=self.cpu_workers, mp_context=context,
+                        initializer=_init_worker, initargs=(self._progress_queue,),
+                    )
+                except (OSError, NotImplementedError):
+                    # No process support (some sandboxes) - threads still unblock I/O-bound parts
+                    self.cpu_mode = "thread"
+                    if self._progress_queue is None:
+                        self._start_listener(queue.SimpleQueue())
+                    self._cpu = ThreadPoolExecutor(
+                        max_workers=self.cpu_workers, thread_name_prefix="sylva-cpu",
+                        initializer=_init_worker, initargs=(self._progress_queue,),
+                    )
+            return self._cpu
+
+    def _start_listener(self, progress_queue):
+        self._progress_queue = progress_queue
+        threading.Thread(target=self._listen, args=(progress_queue,), name="sylva-progress", daemon=True).start()
+
+    def _listen(self, progress_queue):
+        """Forward progress reports from the workers to their callers' loops."""
+        while True:
+            report = progress_queue.get()
+            if report is None:
+                return
+            token, stage, fraction = report
+            listener = self._listeners.get(token)
+            if listener is None:
+                continue  # job already finished
+            loop, callback = listener
+            try:
+                loop.call_soon_threadsafe(callback, stage, fraction)
+            except RuntimeError:
+                pass  # caller's loop is closed
+
+    def _restart_cpu_pool(self, broken: Executor):
+        with self._lock:
+            if self._cpu is broken:
+                self._cpu = None
+                self.cpu_restarts += 1
+        broken.shutdown(wait=False)
+
+    async def _wait_for_slot(self, waiter: Tuple[asyncio.AbstractEventLoop, asyncio.Future]):
+        """Wait until _release_slot hands a CPU backlog slot to this queued waiter."""
+        future = waiter[1]
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._slot_waiters:
+                    self._slot_waiters.remove(waiter)
+                    raise
+            if future.done() and not future.cancelled():
+                self._release_slot()  # the slot arrived just as we were cancelled
+            raise  # otherwise _grant passes it on
+
+    def _grant(self, future: asyncio.Future):
+        """Hand a freed slot to a waiter, or pass it on if the waiter gave up."""
+        if future.done():
+            self._release_slot()
+        else:
+            future.set_result(None)
+
+    def _release_slot(self):
+        """Free a CPU backlog slot, giving it to the longest waiter if there is one."""
+        with self._lock:
+            if not self._slot_waiters:
+                self.cpu_in_flight -= 1
+                return
+            loop, future = self._slot_waiters.popleft()
+        try:
+            loop.call_soon_threadsafe(self._grant, future)
+        except RuntimeError:
+            self._release_slot()  # waiter's loop is closed
+
+    async def run_io(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking I/O call in the thread pool and await its result."""
+        self.io_tasks += 1
+        return await asyncio.get_running_loop().run_in_executor(self._io, partial(func, *args, **kwargs))
+
+    async def run_cpu(self, func: Callable, *args,
+                      on_progress: Optional[Callable[[str, float], None]] = None,
+                      wait: bool = False, **kwargs) -> Any:
+        """
+        Run a CPU-heavy call in a worker process and await its result.
+
+        func, its arguments and its result must be picklable (func must be a
+        module-level function).
+
+        Args:
+            on_progress: Called on this loop with (stage, fraction) whenever
+                func reports through the progress=ProgressReporter it is given
+            wait: Queue for a free slot when the backlog is full instead of
+                raising PoolBusy
+
+        Raises:
+            PoolBusy: When max_cpu_backlog jobs are already waiting or running
+                and wait is False
+        """
+        loop = asyncio.get_running_loop()
+        waiter = None
+        with self._lock:
+            if self.cpu_in_flight >= self.max_cpu_backlog or self._slot_waiters:
+                if not wait:
+                    self.cpu_rejected += 1
+                    raise PoolBusy(f"{self.cpu_in_flight} jobs already queued")
+                waiter = (loop, loop.create_future())
+                self._slot_waiters.append(waiter)
+            else:
+                self.cpu_in_flight += 1
+            self.cpu_tasks += 1
+        if waiter is not None:
+            await self._wait_for_slot(waiter)
+
+        token = None
+        if on_progress is not None:
+            token = next(self._tokens)
+            self._listeners[token] = (loop, on_progress)
+            kwargs["progress"] = ProgressReporter(token)
+        call = partial(func, *args, **kwargs)
+        try:
+            pool = self._cpu_pool()
+            try:
+                return await loop.run_in_executor(pool, call)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); retry once on a fresh pool
+                self._restart_cpu_pool(pool)
+                return await loop.run_in_executor(self._cpu_pool(), call)
+        finally:
+            self._listeners.pop(token, None)
+            self._release_slot()
+
+    def shutdown(self):
+        """Stop both pools (pending CPU jobs are cancelled)."""
+        self._io.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            cpu, self._cpu = self._cpu, None
+            progress_queue, self._progress_queue = self._progress_queue, None
+        if cpu is not None:
+            cpu.shutdown(wait=False, cancel_futures=True)
+        if progress_queue is not None:
+            progress_queue.put(None)  # stop the listener
+
+    def stats(self) -> Dict:
+        """Get pool sizes and task counters."""
+        with self._lock:
+            return {
+                "io_workers": self.io_workers,
+                "cpu_workers": self.cpu_workers,
+                "cpu_mode": self.cpu_mode,
+                "io_tasks": self.io_tasks,
+                "cpu_tasks": self.cpu_tasks,
+                "cpu_in_flight": self.cpu_in_flight,
+                "cpu_waiting": len(self._slot_waiters),
+                "cpu_rejected": self.cpu_rejected,
+                "cpu_restarts": self.cpu_restarts,
+                "max_cpu_backlog": self.max_cpu_backlog,
+            }
@@ -0,0 +1,169 @@
+"""
+Sylva Binary Frame Benchmark
+Round-trips live demo frames through FrameEncoder and decode_frame, offline and over /ws/live
+TamAir - Conrad Challenge 2026
+"""
+
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from api.live_demo import BINARY_SUBPROTOCOL, FLAG_KEYFRAME, POSITION_SCALE, FrameEncoder, decode_frame
+from api.main import DATA_DIR, app, demo_plans, load_demo_plan
+from api.responses import dumps_json
+
+LOCATION = "stinson_beach"
+
+
+def fixed(lat: float, lon: float) -> Tuple[int, int]:
+    """A position in the protocol's 1e-7 degree units."""
+    return int(round(lat * POSITION_SCALE)), int(round(lon * POSITION_SCALE))
+
+
+def frame_message(frames: List[Dict], frame_idx: int, new: List[Dict], shown: int) -> Dict:
+    """A frame message shaped like the ones the location demo sends."""
+    frame = frames[frame_idx]
+    return {
+        "type": "frame",
+        "frame_index": frame_idx,
+        "position": {"lat": frame["lat"], "lon": frame["lon"], "altitude": frame.get("altitude", 120)},
+        "elapsed_seconds": frame.get("elapsed_seconds", 0),
+        "progress": frame_idx / len(frames),
+        "total_shown": shown,
+        "current_waypoint": frame_idx * 5 // len(frames),
+        "new_detections": new,
+        "detection_event": bool(new) and shown % 5 == 0,
+    }
+
+
+def check(decoded: Dict, message: Dict):
+    """Assert a decoded frame carries everything the JSON frame did (floats at f32 precision)."""
+    position = message["position"]
+    new = message["new_detections"]
+    assert decoded["frame_index"] == message["frame_index"]
+    assert decoded["position"] == fixed(position["lat"], position["lon"]), (decoded["position"], position)
+    assert decoded["reveal"] == (message["total_shown"] - len(new), len(new))
+    assert decoded["current_waypoint"] == message["current_waypoint"]
+    assert decoded["detection_event"] == message["detection_event"]
+    for key, value in [("progress", message["progress"]), ("elapsed_seconds", message["elapsed_seconds"]),
+                       ("altitude", position["altitude"])]:
+        assert decoded[key] == np.float32(value), (key, decoded[key], value)
+
+
+def offline(frames: List[Dict], schedule) -> Dict:
+    """
+    Encode a playback with a skip, a far jump and a restart, and decode it back.
+
+    Every chained message is decoded with the previous position, every
+    standalone keyframe without one, and both must match the JSON frame.
+    """
+    n = len(frames)
+    # Play, skip ahead (deltas still fit), jump across the flight (keyframe), then restart
+    order = list(range(0, 300)) + list(range(320, 400)) + list(range(n // 2, n // 2 + 200)) + [None] + list(range(0, 100))
+
+    encoder = FrameEncoder()
+    previous: Optional[Tuple[int, int]] = None
+    shown = 0
+    counts = {"frames": 0, "keyframes": 0, "json_bytes": 0, "binary_bytes": 0}
+    for frame_idx in order:
+        if frame_idx is None:
+            encoder.encode({"type": "demo_start"})  # a new demo starts over from a keyframe
+            previous, shown = None, 0
+            continue
+        new = schedule.detections[shown:schedule.revealed_by(frame_idx)]
+        shown += len(new)
+        message = frame_message(frames, frame_idx, new, shown)
+
+        chained, keyframe = encoder.frame(message)
+        decoded = decode_frame(chained, previous)
+        check(decoded, message)
+        check(decode_frame(keyframe), message)
+        assert chained[1] & FLAG_KEYFRAME or previous is not None
+
+        previous = decoded["position"]
+        counts["frames"] += 1
+        counts["keyframes"] += bool(chained[1] & FLAG_KEYFRAME)
+        counts["json_bytes"] += len(dumps_json(message))
+        counts["binary_bytes"] += len(chained)
+
+    # A delta that does not fit in 16 bits falls back to a keyframe
+    far = frame_message(frames, 0, [], 0)
+    far["position"] = {"lat": far["position"]["lat"] + 0.01, "lon": far["position"]["lon"], "altitude": 120}
+    chained, _ = encoder.frame(far)
+    assert chained[1] & FLAG_KEYFRAME
+    check(decode_frame(chained), far)
+    return counts
+
+
+def receive(ws) -> Tuple[Optional[Dict], Optional[bytes]]:
+    """Next message from a binary-protocol socket: (JSON message, None) or (None, frame bytes)."""
+    message = ws.receive()
+    if message.get("bytes") is not None:
+        return None, message["bytes"]
+    return json.loads(message["text"]), None
+
+
+def live(frames_per_leg: int = 60) -> Dict:
+    """Decode real /ws/live binary frames, across a jump_to_waypoint, against the demo plan."""
+    with TestClient(app).websocket_connect("/ws/live", subprotocols=[BINARY_SUBPROTOCOL]) as ws:
+        ws.send_json({"command": "start", "location": LOCATION, "speed": 1.0})
+        while True:
+            message, _ = receive(ws)
+            if message["type"] == "demo_start":
+                break
+        assert message["protocol"] == BINARY_SUBPROTOCOL
+        catalog = message["detections"]
+        frames = next(iter(demo_plans.values()))[1].frames
+
+        previous, shown, decoded_frames, keyframes = None, 0, 0, 0
+        for leg in range(2):
+            if leg == 1:
+                ws.send_json({"command": "jump_to_waypoint", "waypoint": 2})
+            received = 0
+            while received < frames_per_leg:
+                message, data = receive(ws)
+                if message is not None:
+                    assert message["type"] not in ("error", "demo_complete"), message
+                    if message["type"] == "snapshot":
+                        shown = message["total_shown"]  # detections come from the catalog prefix
+                    continue
+                decoded = decode_frame(data, previous)
+                frame = frames[decoded["frame_index"]]
+                assert decoded["position"] == fixed(frame["lat"], frame["lon"]), (decoded, frame)
+                start, count = decoded["reveal"]
+                assert start == shown and start + count <= len(catalog), (decoded["reveal"], shown)
+                shown += count
+                previous = decoded["position"]
+                keyframes += bool(data[1] & FLAG_KEYFRAME)
+                received += 1
+                decoded_frames += 1
+        ws.send_json({"command": "stop"})
+    return {"frames": decoded_frames, "keyframes": keyframes, "detections": shown}
+
+
+def main():
+    plan = load_demo_plan(
+        DATA_DIR / "flights" / f"{LOCATION}_animation.json",
+        DATA_DIR / "detections" / f"{LOCATION}_detections.geojson",
+    )
+
+    t0 = time.perf_counter()
+    counts = offline(plan.frames, plan.schedule)
+    elapsed = time.perf_counter() - t0
+    print(f"{LOCATION}: {counts['frames']} frames round-tripped in {elapsed * 1000:.0f} ms, "
+          f"{counts['keyframes']} keyframes")
+    print(f"  JSON {counts['json_bytes'] / counts['frames']:.0f} B/frame, "
+          f"binary {counts['binary_bytes'] / counts['frames']:.1f} B/frame "
+          f"({counts['json_bytes'] / counts['binary_bytes']:.0f}x smaller)")
+
+    result = live()
+    print(f"/ws/live: {result['frames']} binary frames decoded across a jump "
+          f"({result['keyframes']} keyframes, {result['detections']} detections revealed)")
+    print("decode_frame matches FrameEncoder for keyframes, deltas and jumps")
+
+
+if __name__ == "__main__":
+    main()
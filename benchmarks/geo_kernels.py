@@ -0,0 +1,126 @@
+"""
+Sylva Geodesic Benchmark
+Scalar haversine against the vectorized kernels in simulation.geo, on the Lake Erie corridor
+TamAir - Conrad Challenge 2026
+"""
+
+import math
+import time
+
+import numpy as np
+
+from simulation.flight_paths import FlightPathGenerator
+from simulation.geo import (
+    EARTH_RADIUS_M,
+    bearing,
+    destination,
+    equirectangular,
+    haversine,
+    pairs_within,
+    pairwise_distances,
+    segment_lengths,
+)
+from simulation.trash_detector import TrashDetector
+
+
+def scalar_haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance one pair at a time, as the simulation classes used to compute it."""
+    lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+    a = (math.sin(delta_lat / 2) ** 2 +
+         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
+    return EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def per_call(func, repeat: int = 5) -> float:
+    """Best wall time of func over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    # Per-point cost of the scalar haversine against the vectorized kernels,
+    # and of detection weighting, on the 430 km Lake Erie corridor
+    waypoints = FlightPathGenerator("lake_erie").generate_path()
+    lats = [wp["lat"] for wp in waypoints]
+    lons = [wp["lon"] for wp in waypoints]
+    lat_arr, lon_arr = np.array(lats), np.array(lons)
+    hotspot_idx = np.linspace(0, len(lats) - 1, max(3, len(lats) // 50), dtype=int)
+    hotspot_lats, hotspot_lons = lat_arr[hotspot_idx], lon_arr[hotspot_idx]
+    n, h = len(lats), len(hotspot_idx)
+
+    legs = segment_lengths(lat_arr, lon_arr)
+    scalar_legs = [scalar_haversine(lats[i], lons[i], lats[i + 1], lons[i + 1]) for i in range(n - 1)]
+    assert np.allclose(legs, scalar_legs, rtol=1e-12, atol=1e-9)
+    print(f"lake_erie corridor: {n} points, {legs.sum() / 1000:.1f} km, {h} hotspots (one per 50 points)")
+
+    loop_legs = per_call(lambda: [scalar_haversine(lats[i], lons[i], lats[i + 1], lons[i + 1]) for i in range(n - 1)])
+    vector_legs = per_call(lambda: segment_lengths(lat_arr, lon_arr))
+    print(f"  leg lengths        scalar {loop_legs / n * 1e9:8.1f} ns/point   vectorized {vector_legs / n * 1e9:6.1f} ns/point"
+          f"   ({loop_legs / vector_legs:.0f}x)")
+
+    # Point x hotspot distances (the detection weighting pattern) on a 1/10 sample for the scalar loop
+    step = 10
+    loop_matrix = per_call(lambda: [[scalar_haversine(lats[i], lons[i], hl, ho)
+                                     for hl, ho in zip(hotspot_lats.tolist(), hotspot_lons.tolist())]
+                                    for i in range(0, n, step)], repeat=1) * step
+    vector_rows = per_call(lambda: [haversine(lats[i], lons[i], hotspot_lats, hotspot_lons) for i in range(n)], repeat=1)
+    vector_matrix = per_call(lambda: pairwise_distances(lat_arr, lon_arr, hotspot_lats, hotspot_lons), repeat=3)
+    print(f"  point x hotspots   scalar {loop_matrix / n * 1e6:8.1f} us/point   one row per point {vector_rows / n * 1e6:6.1f} us/point"
+          f"   full matrix {vector_matrix / n * 1e6:6.2f} us/point   ({loop_matrix / vector_matrix:.0f}x)")
+
+    approx = equirectangular(lat_arr[:-1], lon_arr[:-1], lat_arr[1:], lon_arr[1:])
+    relative = np.max(np.abs(approx - legs) / np.maximum(legs, 1e-9))
+    vector_approx = per_call(lambda: equirectangular(lat_arr[:-1], lon_arr[:-1], lat_arr[1:], lon_arr[1:]))
+    print(f"  equirectangular    {vector_approx / n * 1e9:6.1f} ns/point, max relative error {relative:.1e} on 15 m legs")
+
+    # Bearing and destination round-trip
+    heading = bearing(lat_arr[:-1], lon_arr[:-1], lat_arr[1:], lon_arr[1:])
+    dest_lat, dest_lon = destination(lat_arr[:-1], lon_arr[:-1], heading, legs)
+    error = haversine(dest_lat, dest_lon, lat_arr[1:], lon_arr[1:])
+    assert error.max() < 1e-3, error.max()
+    print(f"  destination(bearing, distance) lands within {error.max() * 1000:.2e} mm of the next point")
+
+    # Detection weighting: every waypoint against every hotspot within range,
+    # as custom paths place one hotspot per 50 waypoints
+    radii = np.random.default_rng(0).integers(80, 201, h).astype(np.float64)
+    matrix = pairwise_distances(lat_arr, lon_arr, hotspot_lats, hotspot_lons)
+    point_idx, center_idx, distances = pairs_within(lat_arr, lon_arr, hotspot_lats, hotspot_lons, radii)
+    inside_i, inside_j = np.nonzero(matrix < radii)
+    assert sorted(zip(point_idx.tolist(), center_idx.tolist())) == sorted(zip(inside_i.tolist(), inside_j.tolist()))
+    sparse = per_call(lambda: pairs_within(lat_arr, lon_arr, hotspot_lats, hotspot_lons, radii))
+    print(f"  pairs within radius  {sparse * 1000:.1f} ms for all {n} x {h} pairs "
+          f"({len(point_idx)} in range), full matrix {vector_matrix * 1000:.0f} ms")
+
+    detector = TrashDetector("lake_erie")
+    detector.hotspots = [
+        {"lat": lat, "lon": lon, "radius_m": radius, "multiplier": 6.0}
+        for lat, lon, radius in zip(hotspot_lats.tolist(), hotspot_lons.tolist(), radii.tolist())
+    ]
+
+    def scalar_weights(points):
+        weights = []
+        for wp in points:
+            weight = 0.3
+            for hotspot in detector.hotspots:
+                distance = scalar_haversine(wp["lat"], wp["lon"], hotspot["lat"], hotspot["lon"])
+                if distance < hotspot["radius_m"]:
+                    weight = max(weight, (1 - distance / hotspot["radius_m"]) * hotspot["multiplier"])
+            weights.append(weight)
+        return weights
+
+    sample = waypoints[::step]
+    assert detector._hotspot_weights(sample, 0.3).tolist() == scalar_weights(sample)
+    loop_weights = per_call(lambda: scalar_weights(sample), repeat=1) * step
+    vector_weights = per_call(lambda: detector._hotspot_weights(waypoints, 0.3))
+    print(f"  detection weights    scalar loop {loop_weights:.1f} s, vectorized {vector_weights * 1000:.1f} ms "
+          f"({loop_weights / vector_weights:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Sylva JSON Response Benchmark
+Serializing detection collections with and without response_model validation
+TamAir - Conrad Challenge 2026
+"""
+
+import time
+from typing import Dict
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from api.models import DetectionResponse
+from api.responses import FastJSONResponse, orjson
+
+
+def make_collection(n: int) -> Dict:
+    """A detection FeatureCollection shaped like a /api/detections response."""
+    rng = np.random.default_rng(42)
+    lon = (-122.7 + rng.random(n) * 0.1).tolist()
+    lat = (37.88 + rng.random(n) * 0.05).tolist()
+    conf = rng.random(n).tolist()
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon[i], lat[i]]},
+            "properties": {
+                "id": f"det_{i:07d}",
+                "category": "plastic_bottles",
+                "category_name": "Plastic Bottles",
+                "confidence": conf[i],
+                "priority": "medium",
+                "estimated_weight_kg": 0.35,
+                "timestamp": "2026-03-15T10:23:45Z",
+                "location": "stinson_beach",
+            },
+        }
+        for i in range(n)
+    ]
+    return {"type": "FeatureCollection", "features": features, "count": n,
+            "next_cursor": None, "filters_applied": None}
+
+
+def validated_path(content: Dict) -> bytes:
+    # What FastAPI does for a dict returned under response_model
+    model = DetectionResponse.model_validate(content)
+    return JSONResponse(jsonable_encoder(model)).body
+
+
+def fast_path(content: Dict) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def timed(fn, content: Dict) -> float:
+    start = time.perf_counter()
+    fn(content)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"Encoder: {'orjson' if orjson is not None else 'json (fallback)'}")
+    print(f"{'features':>10} {'validated (s)':>14} {'fast (s)':>10} {'speedup':>8}")
+    for n in (1_000, 100_000, 1_000_000):
+        content = make_collection(n)
+        slow = timed(validated_path, content)
+        fast = timed(fast_path, content)
+        print(f"{n:>10,} {slow:>14.3f} {fast:>10.3f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Sylva Live Demo Benchmark
+Command-to-effect latency against the real /ws/live endpoint
+TamAir - Conrad Challenge 2026
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from api.main import app, demo_plans
+
+# Frames are slowed to 0.25 s so "within one frame interval" is a meaningful bound
+SPEED = 0.2
+INTERVAL = 0.05 / SPEED
+
+
+def until(ws, message_type):
+    """Read messages until one of the given type arrives."""
+    while True:
+        message = ws.receive_json()
+        if message["type"] == message_type:
+            return message
+
+
+def main():
+    with TestClient(app).websocket_connect("/ws/live") as ws:
+        ws.send_json({"command": "start", "location": "stinson_beach", "speed": SPEED})
+        until(ws, "demo_start")
+        until(ws, "frame")
+
+        # jump_to_waypoint: the snapshot and its first frame arrive without waiting out the sleep
+        t0 = time.perf_counter()
+        ws.send_json({"command": "jump_to_waypoint", "waypoint": 3})
+        jump = until(ws, "snapshot")
+        frame = until(ws, "frame")
+        jump_latency = time.perf_counter() - t0
+        assert frame["frame_index"] == jump["frame_index"], (jump, frame)
+        assert not frame["new_detections"] and len(jump["detections"]) == jump["total_shown"]
+
+        # seek by elapsed time: the snapshot holds exactly what playing up to there would show
+        t0 = time.perf_counter()
+        ws.send_json({"command": "seek", "elapsed_seconds": 60})
+        seek = until(ws, "snapshot")
+        seek_latency = time.perf_counter() - t0
+        schedule = next(iter(demo_plans.values()))[1].schedule
+        seek_frame = schedule.frame_at_elapsed(60)
+        assert seek["frame_index"] == seek_frame, (seek["frame_index"], seek_frame)
+        assert seek["detections"] == schedule.detections[:schedule.revealed_by(seek_frame)]
+
+        # pause: at most the frame already in flight arrives afterwards
+        ws.send_json({"command": "pause"})
+        ws.send_json({"command": "get_state"})
+        state = until(ws, "state")["data"]
+        assert not state["is_running"]
+        paused_at = state["current_frame"]
+
+        t0 = time.perf_counter()
+        ws.send_json({"command": "resume"})
+        frame = until(ws, "frame")
+        resume_latency = time.perf_counter() - t0
+        assert frame["frame_index"] == paused_at + 1, (paused_at, frame["frame_index"])
+
+        # speed: a slow frame sleep is cut short by the new speed
+        ws.send_json({"command": "speed", "speed": 0.001})
+        until(ws, "frame")
+        t0 = time.perf_counter()
+        ws.send_json({"command": "speed", "speed": 1.0})
+        until(ws, "frame")
+        speed_latency = time.perf_counter() - t0
+
+        # reset: rewinds to the first frame and tells the client to clear its map
+        t0 = time.perf_counter()
+        ws.send_json({"command": "reset"})
+        jump = until(ws, "snapshot")
+        reset_latency = time.perf_counter() - t0
+        assert jump["frame_index"] == 0 and jump["reset_detections"] and jump["total_shown"] == schedule.revealed_by(0)
+
+    print(f"frame interval {INTERVAL * 1000:.0f} ms")
+    for name, latency in [("jump_to_waypoint", jump_latency), ("seek", seek_latency), ("resume", resume_latency),
+                          ("speed", speed_latency), ("reset", reset_latency)]:
+        print(f"  {name:17s} {latency * 1000:7.1f} ms")
+        assert latency < INTERVAL, f"{name} took {latency:.3f}s (> one frame interval)"
+    print("all commands applied within one frame interval")
+
+
+if __name__ == "__main__":
+    main()
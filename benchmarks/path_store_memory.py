@@ -0,0 +1,107 @@
+"""
+Sylva Custom Path Store Benchmark
+Memory under sustained traffic, restart survival, TTL expiry and shared simulations
+TamAir - Conrad Challenge 2026
+"""
+
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict
+
+from api.path_store import CustomPathStore, normalize_waypoints, simulation_key
+from api.responses import dumps_json
+
+
+def fake_simulation(seed: int, frames: int = 5000) -> Dict:
+    """A simulation payload about the size of a real custom path."""
+    return {
+        "flight_path": {"type": "FeatureCollection", "features": [
+            {"type": "Feature", "geometry": {"type": "LineString", "coordinates": [[-122.6, 37.9], [-122.5, 37.8]]},
+             "properties": {"location": "Custom Path"}},
+        ]},
+        "detections": {"type": "FeatureCollection", "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [-122.6, 37.9]},
+             "properties": {"id": f"{seed}-{i}"}} for i in range(150)
+        ], "properties": {"location": "Custom Path"}},
+        "animation_data": [
+            {"frame": i, "lat": 37.9 - i * 1e-5, "lon": -122.6 + i * 1e-5, "altitude": 120,
+             "elapsed_seconds": i * 0.8, "timestamp": "2026-01-01T10:00:00"} for i in range(frames)
+        ],
+    }
+
+
+def fake_path(store: CustomPathStore, path_id: str, seed: int) -> str:
+    """Store a path the way POST /api/custom-path does; returns its simulation key."""
+    config = {
+        "waypoints": normalize_waypoints([{"lat": 37.9, "lon": -122.6 + seed * 1e-3}, {"lat": 37.8, "lon": -122.5}]),
+        "survey_altitude_m": 120, "survey_speed_ms": 25,
+    }
+    key = simulation_key(config, seed=42)
+    if store.get_simulation(key) is None:
+        store.put_simulation(key, fake_simulation(seed))
+    store.put({
+        "id": path_id, "name": f"Path {path_id}", "created_at": "2026-01-01T00:00:00",
+        "config": config, "detection_count": 150, "simulation_key": key,
+    })
+    return key
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / "paths.db"
+        store = CustomPathStore(db_file, max_cache_bytes=8 * 1024 * 1024)
+        path_size = len(dumps_json(fake_simulation(0)))
+        print(f"each simulation ~{path_size / 1e6:.1f} MB of JSON, cache budget {store.max_cache_bytes / 1e6:.0f} MB")
+
+        tracemalloc.start()
+        ids, samples = [], []
+        for batch in range(6):
+            for _ in range(50):
+                path_id = f"p{len(ids)}"
+                fake_path(store, path_id, seed=len(ids))
+                ids.append(path_id)
+                for _ in range(3):  # reads skew towards recent paths
+                    assert store.get(random.choice(ids[-20:] if random.random() < 0.8 else ids)) is not None
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append(current)
+            print(f"  {len(ids):4d} paths stored: {current / 1e6:6.1f} MB traced, "
+                  f"{store.stats()['cached_simulations']} simulations cached ({store.cache_bytes / 1e6:.1f} MB)")
+        tracemalloc.stop()
+        assert store.cache_bytes <= store.max_cache_bytes
+        assert samples[-1] < samples[1] * 1.5, "memory kept growing"
+
+        # The same route drawn again reuses the stored simulation under its own name
+        key = fake_path(store, "again", seed=7)
+        assert store.stats()["stored_simulations"] == len(ids)
+        again, original = store.get("again"), store.get(ids[7])
+        assert again["animation_data"] is original["animation_data"]
+        assert again["detections"]["properties"]["location"] == "Path again"
+        assert original["detections"]["properties"]["location"] == f"Path {ids[7]}"
+        t0 = time.perf_counter()
+        for _ in range(10000):
+            assert store.peek_simulation(key) is not None
+        print(f"cached simulation lookup: {(time.perf_counter() - t0) / 10000 * 1e6:.2f} us")
+
+        # A restarted (or second) server process sees every path
+        reopened = CustomPathStore(db_file)
+        assert len(reopened.list()) == len(ids) + 1
+        assert reopened.get(ids[0])["animation_data"] == fake_simulation(0)["animation_data"]
+        assert reopened.delete(ids[1]) and reopened.get(ids[1]) is None
+
+        # TTL: paths not opened within ttl_seconds are removed by the next sweep,
+        # along with simulations no remaining path uses
+        short = CustomPathStore(db_file, ttl_seconds=0.5)
+        time.sleep(0.6)
+        short.get(ids[2])  # keeps this one alive
+        removed = short.expire()
+        assert [p["id"] for p in short.list()] == [ids[2]], short.list()
+        assert short.stats()["stored_simulations"] == 1
+        print(f"reopen: {len(ids)} paths survived, TTL sweep removed {removed}")
+        print(store.stats())
+
+
+if __name__ == "__main__":
+    main()
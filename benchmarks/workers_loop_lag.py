@@ -0,0 +1,102 @@
+"""
+Sylva Worker Pool Benchmark
+Event-loop lag while a ~430 km custom corridor is created through the API
+TamAir - Conrad Challenge 2026
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import httpx
+
+import api.main
+from api.path_store import CustomPathStore
+from simulation.data_generator import simulate_custom_path
+
+TICK = 0.01
+MAX_LAG = 0.1
+
+CORRIDOR = [
+    {"lat": 37.77, "lon": -122.42},  # San Francisco
+    {"lat": 36.60, "lon": -121.90},  # Monterey
+    {"lat": 35.28, "lon": -120.66},  # San Luis Obispo
+    {"lat": 34.42, "lon": -119.70},  # Santa Barbara
+]
+
+
+async def measure(work) -> Dict:
+    """Run work while a 10 ms ticker records how late each tick fires."""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.1)
+    t0 = time.perf_counter()
+    extra = await work()
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await ticker_task
+    lags.sort()
+    return {"elapsed": elapsed, "max_lag": lags[-1], "p99_lag": lags[int(len(lags) * 0.99)], **extra}
+
+
+async def compare():
+    """Time the simulation inline on the loop, then through POST /api/custom-path."""
+    transport = httpx.ASGITransport(app=api.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://sylva") as client:
+        async def inline():
+            simulate_custom_path({
+                "name": "inline", "type": "custom", "survey_altitude_m": 120, "survey_speed_ms": 25,
+                "waypoints": [dict(wp, name=f"Point {i + 1}") for i, wp in enumerate(CORRIDOR)],
+                "flight_pattern": "corridor", "corridor_width_m": 50, "population_density": 100,
+            })
+            return {}
+
+        async def offloaded():
+            # Other requests keep being answered while the path is generated
+            served = 0
+            body = {"name": "Lag benchmark", "waypoints": CORRIDOR}
+            create = asyncio.create_task(client.post("/api/custom-path", json=body))
+            while not create.done():
+                assert (await client.get("/api/stats")).status_code == 200
+                served += 1
+                await asyncio.sleep(0.05)
+            response = await create
+            assert response.status_code == 200, response.text
+            return {"requests_served": served, "detections": response.json()["detection_count"]}
+
+        # Start the worker processes first so both runs time only the simulation
+        await api.main.workers.run_cpu(time.sleep, 0)
+        return await measure(inline), await measure(offloaded)
+
+
+def main():
+    # Created paths go to a throwaway database, never to data/custom_paths.db
+    with tempfile.TemporaryDirectory() as tmp:
+        api.main.custom_paths = CustomPathStore(Path(tmp) / "custom_paths.db")
+        try:
+            before, after = asyncio.run(compare())
+        finally:
+            api.main.workers.shutdown()
+
+    print(f"custom path ({len(CORRIDOR)} waypoints, ~430 km), ticker every {TICK * 1000:.0f} ms")
+    for name, result in [("inline", before), ("worker pool", after)]:
+        print(f"  {name:12s} {result['elapsed']:6.2f}s  max lag {result['max_lag'] * 1000:8.1f} ms"
+              f"  p99 lag {result['p99_lag'] * 1000:7.1f} ms")
+    print(f"  {after['requests_served']} /api/stats requests served while generating, "
+          f"{after['detections']} detections")
+    assert after["max_lag"] < MAX_LAG, f"event loop stalled for {after['max_lag']:.3f}s"
+    print(f"event-loop lag stayed under {MAX_LAG * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ TamAir - Conrad Challenge 2026
 """
 
 import json
-import math
 import random
 import uuid
 import os
@@ -17,6 +16,8 @@ import numpy as np
 from .config import LOCATIONS, TRASH_CATEGORIES, DRONE_SPECS, SIMULATION
 from .trash_detector import TrashDetector
 from .flight_paths import FlightPathGenerator
+from .columnar import write_columnar
+from .geo import haversine
 
 
 # Drone fleet configuration
@@ -145,18 +146,6 @@ class AnnualDataGenerator:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         (self.output_dir / "monthly").mkdir(exist_ok=True)
 
-    def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two points in meters."""
-        R = 6371000
-        lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-
-        a = (math.sin(delta_lat / 2) ** 2 +
-             math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
-
     def _get_water_proximity(self, lat: float, lon: float, location: str) -> Dict:
         """Calculate distance to nearest water body and risk level."""
         water_bodies = WATER_BODIES.get(location, [])
@@ -164,11 +153,12 @@ class AnnualDataGenerator:
         min_distance = float('inf')
         nearest_water = None
 
-        for water in water_bodies:
-            distance = self._haversine_distance(lat, lon, water["lat"], water["lon"])
-            if distance < min_distance:
-                min_distance = distance
-                nearest_water = water
+        if water_bodies:
+            distances = haversine(lat, lon, np.array([water["lat"] for water in water_bodies]),
+                                  np.array([water["lon"] for water in water_bodies]))
+            nearest = int(np.argmin(distances))
+            min_distance = float(distances[nearest])
+            nearest_water = water_bodies[nearest]
 
         # Determine risk level
         if min_distance < 25:
@@ -384,12 +374,10 @@ class AnnualDataGenerator:
                     # Count detections within hotspot radius
                     nearby = 0
                     weight = 0
-                    for det in month_detections:
-                        coords = det["geometry"]["coordinates"]
-                        dist = self._haversine_distance(
-                            coords[1], coords[0],
-                            hotspot["lat"], hotspot["lon"]
-                        )
+                    lons = np.array([det["geometry"]["coordinates"][0] for det in month_detections], dtype=np.float64)
+                    lats = np.array([det["geometry"]["coordinates"][1] for det in month_detections], dtype=np.float64)
+                    distances = haversine(lats, lons, hotspot["lat"], hotspot["lon"]).tolist()
+                    for det, dist in zip(month_detections, distances):
                         if dist < hotspot["radius_m"] * 1.5:
                             nearby += 1
                             weight += det["properties"]["estimated_weight_kg"]
@@ -698,10 +686,15 @@ class AnnualDataGenerator:
                 "generated_at": datetime.now().isoformat(),
             },
         }
-        with open(self.output_dir / f"detections_{self.year}.geojson", "w") as f:
+        detections_file = self.output_dir / f"detections_{self.year}.geojson"
+        with open(detections_file, "w") as f:
             json.dump(detections_geojson, f)
         print(f"  Saved detections_{self.year}.geojson ({len(self.detections)} features)")
 
+        # Binary columns next to the GeoJSON, memory-mapped by the API
+        columns_dir = write_columnar(detections_geojson, detections_file)
+        print(f"  Saved {columns_dir.name}/ (columnar sidecar)")
+
         # Save flights log
         with open(self.output_dir / f"flights_{self.year}.json", "w") as f:
             json.dump(self.flights, f, indent=2)
@@ -0,0 +1,203 @@
+"""
+Sylva Clustering
+Hierarchical zoom-level cluster index for detection points
+TamAir - Conrad Challenge 2026
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .geo import TILE_SIZE, world_pixels
+
+CLUSTER_RADIUS_PX = 60  # cluster cell size on screen
+MIN_ZOOM = 0
+MAX_ZOOM = 18  # cells are ~30 m here; deeper zooms reuse this level
+
+# Cluster priority is the highest priority of its members
+PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+RANK_PRIORITY = {rank: name for name, rank in PRIORITY_RANK.items()}
+
+
+class ClusterLevel:
+    """Clusters of one zoom level, sorted by cell (row-major) for range queries."""
+
+    def __init__(self, zoom: int, cx: np.ndarray, cy: np.ndarray, lon: np.ndarray, lat: np.ndarray,
+                 count: np.ndarray, weight: np.ndarray, priority: np.ndarray, row: np.ndarray):
+        self.zoom = zoom
+        self.width = (TILE_SIZE * 2 ** zoom) // CLUSTER_RADIUS_PX + 2
+        self.cx, self.cy = cx, cy
+        self.key = cy * self.width + cx
+        self.lon, self.lat = lon, lat
+        self.count = count
+        self.weight = weight
+        self.priority = priority
+        self.row = row  # source row for single-point clusters, -1 otherwise
+        self.rows = np.unique(cy)
+
+    def __len__(self) -> int:
+        return len(self.key)
+
+    def _cells(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        """Cluster positions whose cell overlaps a box (west <= east)."""
+        (x0, x1), (y1, y0) = world_pixels(np.array([west, east]), np.array([south, north]), self.zoom)
+        cx0, cx1 = int(x0 // CLUSTER_RADIUS_PX), int(x1 // CLUSTER_RADIUS_PX)
+        cy0, cy1 = int(y0 // CLUSTER_RADIUS_PX), int(y1 // CLUSTER_RADIUS_PX)
+
+        rows = self.rows[np.searchsorted(self.rows, cy0, "left"):np.searchsorted(self.rows, cy1, "right")]
+        if not len(rows):
+            return np.empty(0, dtype=np.int64)
+
+        starts = np.searchsorted(self.key, rows * self.width + cx0, "left")
+        ends = np.searchsorted(self.key, rows * self.width + cx1, "right")
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return np.arange(total) + offsets
+
+    def query(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        """
+        Positions of clusters whose centre lies inside a box.
+
+        Boxes with west > east cross the antimeridian. Cost is two binary
+        searches per occupied cell row in view, plus the clusters returned.
+        """
+        if west > east:
+            candidates = np.concatenate([
+                self._cells(west, south, 180.0, north),
+                self._cells(-180.0, south, east, north),
+            ])
+            in_lon = (self.lon[candidates] >= west) | (self.lon[candidates] <= east)
+        else:
+            candidates = self._cells(west, south, east, north)
+            in_lon = (self.lon[candidates] >= west) & (self.lon[candidates] <= east)
+        lat = self.lat[candidates]
+        return np.sort(candidates[in_lon & (lat >= south) & (lat <= north)])
+
+
+def _aggregate(zoom: int, cx: np.ndarray, cy: np.ndarray, lon: np.ndarray, lat: np.ndarray,
+               count: np.ndarray, weight: np.ndarray, priority: np.ndarray, row: np.ndarray) -> ClusterLevel:
+    """Merge entries that share a cell into one cluster each."""
+    width = (TILE_SIZE * 2 ** zoom) // CLUSTER_RADIUS_PX + 2
+    keys, inverse = np.unique(cy * width + cx, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    n = len(keys)
+
+    total = np.bincount(inverse, weights=count, minlength=n)
+    merged_priority = np.full(n, -1, dtype=np.int8)
+    np.maximum.at(merged_priority, inverse, priority)
+    merged_row = np.full(n, -1, dtype=np.int64)
+    np.maximum.at(merged_row, inverse, row)
+
+    total_int = total.astype(np.int64)
+    return ClusterLevel(
+        zoom,
+        keys % width,
+        keys // width,
+        np.bincount(inverse, weights=lon * count, minlength=n) / total,
+        np.bincount(inverse, weights=lat * count, minlength=n) / total,
+        total_int,
+        np.bincount(inverse, weights=weight, minlength=n),
+        merged_priority,
+        np.where(total_int == 1, merged_row, -1),
+    )
+
+
+class ClusterIndex:
+    """
+    Multi-resolution cluster index, in the spirit of supercluster.
+
+    Points are binned into CLUSTER_RADIUS_PX screen cells at MAX_ZOOM; each
+    coarser level merges pairs of cells from the level below (screen cells
+    halve in size per zoom, so levels nest exactly). Every level is sorted by
+    cell, so "clusters at zoom z inside a bbox" is a handful of binary
+    searches. Built once per dataset in O(n log n).
+    """
+
+    def __init__(
+        self,
+        lon: np.ndarray,
+        lat: np.ndarray,
+        weight: Optional[np.ndarray] = None,
+        priority: Optional[Sequence[str]] = None,
+        min_zoom: int = MIN_ZOOM,
+        max_zoom: int = MAX_ZOOM,
+    ):
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        n = len(lon)
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+
+        weight = np.zeros(n) if weight is None else np.nan_to_num(np.asarray(weight, dtype=np.float64))
+        if priority is None:
+            ranks = np.zeros(n, dtype=np.int8)
+        else:
+            ranks = np.array([PRIORITY_RANK.get(p, 0) for p in priority], dtype=np.int8)
+
+        self.levels: Dict[int, ClusterLevel] = {}
+        if n == 0:
+            return
+
+        x, y = world_pixels(lon, lat, max_zoom)
+        level = _aggregate(
+            max_zoom,
+            np.floor(x / CLUSTER_RADIUS_PX).astype(np.int64),
+            np.floor(y / CLUSTER_RADIUS_PX).astype(np.int64),
+            lon, lat, np.ones(n), weight, ranks, np.arange(n),
+        )
+        self.levels[max_zoom] = level
+
+        for zoom in range(max_zoom - 1, min_zoom - 1, -1):
+            level = _aggregate(
+                zoom, level.cx // 2, level.cy // 2, level.lon, level.lat,
+                level.count.astype(np.float64), level.weight, level.priority, level.row,
+            )
+            self.levels[zoom] = level
+
+    def level(self, zoom: int) -> Optional[ClusterLevel]:
+        """Level for a map zoom (clamped to the indexed range)."""
+        if not self.levels:
+            return None
+        return self.levels[min(max(zoom, self.min_zoom), self.max_zoom)]
+
+    def query(self, zoom: int, bbox: Optional[Tuple[float, float, float, float]] = None) -> List[Dict]:
+        """
+        Clusters at a zoom level, optionally inside (west, south, east, north).
+
+        Returns:
+            One dict per cluster: lon, lat, count, weight, priority, and row
+            (source point index when count is 1, else -1)
+        """
+        level = self.level(zoom)
+        if level is None:
+            return []
+        positions = level.query(*bbox) if bbox else np.arange(len(level))
+        return [
+            {
+                "cluster_id": f"{level.zoom}-{cx}-{cy}",
+                "lon": lon,
+                "lat": lat,
+                "count": count,
+                "weight": weight,
+                "priority": RANK_PRIORITY.get(rank, "low"),
+                "row": row,
+            }
+            for cx, cy, lon, lat, count, weight, rank, row in zip(
+                level.cx[positions].tolist(),
+                level.cy[positions].tolist(),
+                level.lon[positions].tolist(),
+                level.lat[positions].tolist(),
+                level.count[positions].tolist(),
+                level.weight[positions].tolist(),
+                level.priority[positions].tolist(),
+                level.row[positions].tolist(),
+            )
+        ]
+
+    def cell_size_m(self, zoom: int, lat: float) -> float:
+        """Ground size of one cluster cell at a zoom level and latitude."""
+        meters_per_px = 40075016.686 * np.cos(np.radians(lat)) / (TILE_SIZE * 2 ** zoom)
+        return float(CLUSTER_RADIUS_PX * meters_per_px)
@@ -0,0 +1,304 @@
+"""
+Sylva Columnar Storage
+Binary column sidecar for detection GeoJSON, opened with memory-mapped NumPy arrays
+TamAir - Conrad Challenge 2026
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+FORMAT_NAME = "sylva-columnar"
+FORMAT_VERSION = 1
+
+SIDECAR_SUFFIX = ".columns"
+META_FILE = "meta.json"
+
+# Column kinds:
+#   float / int / bool - one .npy array of that dtype
+#   str                - int32 codes into a sorted vocabulary (-1 = missing)
+#   json               - like str, for lists and mixed values (vocabulary holds JSON text)
+NUMERIC_KINDS = {"float": np.float64, "int": np.int64, "bool": np.bool_}
+
+
+def sidecar_path(geojson_path: Union[str, Path]) -> Path:
+    """Directory holding the columns for a GeoJSON file (detections_2026.columns/)."""
+    return Path(geojson_path).with_suffix(SIDECAR_SUFFIX)
+
+
+def _flatten(properties: Dict, prefix: Tuple[str, ...], out: Dict[Tuple[str, ...], Any]):
+    """Flatten nested dicts into {('a', 'b'): value} so each leaf gets a column."""
+    for key, value in properties.items():
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            _flatten(value, path, out)
+        else:
+            out[path] = value
+
+
+def _column_kind(values: List[Any]) -> str:
+    """Pick the narrowest kind that round-trips every present value."""
+    present = [v for v in values if v is not None]
+    if not present:
+        return "json"
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return "int"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "float"
+    if all(isinstance(v, str) for v in present):
+        return "str"
+    return "json"
+
+
+def _encode_strings(values: List[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Dictionary-encode strings into (int32 codes, sorted vocabulary); None -> -1."""
+    present = np.array([v is not None for v in values], dtype=bool)
+    strings = np.array([v if v is not None else "" for v in values], dtype=str)
+    vocab, inverse = np.unique(strings[present], return_inverse=True)
+
+    codes = np.full(len(values), -1, dtype=np.int32)
+    codes[present] = inverse
+    return codes, vocab
+
+
+def write_columnar(collection: Dict, geojson_path: Union[str, Path]) -> Path:
+    """
+    Write the binary column sidecar for a detection FeatureCollection.
+
+    Call after the GeoJSON itself has been written - the sidecar records the
+    file's mtime and size so readers can tell when it is out of date.
+
+    Args:
+        collection: FeatureCollection of Point features
+        geojson_path: Path of the GeoJSON file the columns mirror
+
+    Returns:
+        Path of the sidecar directory
+    """
+    geojson_path = Path(geojson_path)
+    features = collection.get("features", [])
+
+    coords = np.array(
+        [f["geometry"]["coordinates"][:2] for f in features],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+    # One row of flattened properties per feature, columns in first-seen order
+    rows = []
+    paths: Dict[Tuple[str, ...], None] = {}
+    for feature in features:
+        flat: Dict[Tuple[str, ...], Any] = {}
+        _flatten(feature.get("properties") or {}, (), flat)
+        rows.append(flat)
+        paths.update(dict.fromkeys(flat))
+
+    target = sidecar_path(geojson_path)
+    staging = target.with_name(target.name + ".tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    np.save(staging / "lon.npy", coords[:, 0])
+    np.save(staging / "lat.npy", coords[:, 1])
+
+    columns = []
+    for index, path in enumerate(paths):
+        values = [row.get(path) for row in rows]
+        missing = [path not in row for row in rows]
+        kind = _column_kind(values)
+        stem = f"c{index:03d}"
+
+        if kind in NUMERIC_KINDS:
+            fill = False if kind == "bool" else 0
+            array = np.array([fill if v is None else v for v in values], dtype=NUMERIC_KINDS[kind])
+            nulls = [v is None for v in values]
+        else:
+            if kind == "json":
+                values = [None if v is None else json.dumps(v) for v in values]
+            array, vocab = _encode_strings(values)
+            np.save(staging / f"{stem}.vocab.npy", vocab)
+            nulls = [False] * len(values)  # missing strings are already code -1
+        np.save(staging / f"{stem}.npy", array)
+
+        column = {"name": ".".join(path), "path": list(path), "kind": kind, "file": stem}
+        # Keep absent keys apart from explicit nulls so features round-trip exactly
+        if any(missing):
+            np.save(staging / f"{stem}.absent.npy", np.array(missing, dtype=bool))
+            column["absent"] = True
+        if any(n and not m for n, m in zip(nulls, missing)):
+            np.save(staging / f"{stem}.null.npy", np.array(nulls, dtype=bool) & ~np.array(missing, dtype=bool))
+            column["null"] = True
+        columns.append(column)
+
+    stat = geojson_path.stat()
+    meta = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "count": len(features),
+        "source": {"file": geojson_path.name, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size},
+        "properties": collection.get("properties"),
+        "columns": columns,
+    }
+    # meta.json goes in last, so a sidecar without it is never opened
+    with open(staging / META_FILE, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    if target.exists():
+        shutil.rmtree(target)
+    staging.rename(target)
+    return target
+
+
+class ColumnarDataset:
+    """
+    Read side of a column sidecar.
+
+    Every array is opened with np.load(mmap_mode="r"), so processes serving the
+    same file share the OS page cache and a query only pages in the columns
+    (and rows) it actually reads. Arrays are opened on first use.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        with open(self.directory / META_FILE) as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != FORMAT_NAME or self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format in {self.directory}")
+
+        self.columns = {column["name"]: column for column in self.meta["columns"]}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._vocab: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return self.meta["count"]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def is_current(self, geojson_path: Union[str, Path]) -> bool:
+        """Check the sidecar was written from the GeoJSON file as it is now."""
+        try:
+            stat = Path(geojson_path).stat()
+        except OSError:
+            return False
+        source = self.meta["source"]
+        return source["mtime_ns"] == stat.st_mtime_ns and source["size"] == stat.st_size
+
+    def _load(self, file: str) -> np.ndarray:
+        array = self._arrays.get(file)
+        if array is None:
+            array = np.load(self.directory / f"{file}.npy", mmap_mode="r")
+            self._arrays[file] = array
+        return array
+
+    @property
+    def lon(self) -> np.ndarray:
+        return self._load("lon")
+
+    @property
+    def lat(self) -> np.ndarray:
+        return self._load("lat")
+
+    def kind(self, name: str) -> str:
+        return self.columns[name]["kind"]
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column array: values for numeric kinds, codes for str/json."""
+        return self._load(self.columns[name]["file"])
+
+    def vocab(self, name: str) -> List[str]:
+        """Vocabulary for a str/json column."""
+        if name not in self._vocab:
+            self._vocab[name] = self._load(self.columns[name]["file"] + ".vocab").tolist()
+        return self._vocab[name]
+
+    def _mask(self, name: str, flag: str, rows: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        column = self.columns[name]
+        if not column.get(flag):
+            return None
+        mask = self._load(f"{column['file']}.{flag}")
+        return mask if rows is None else mask[rows]
+
+    def missing(self, name: str, rows: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Mask of rows with no value (absent key or null), or None if every row has one."""
+        masks = [self._mask(name, flag, rows) for flag in ("absent", "null")]
+        masks = [mask for mask in masks if mask is not None]
+        if not masks:
+            return None
+        return np.logical_or.reduce(masks)
+
+    def values(self, name: str, rows: Optional[np.ndarray] = None) -> List[Any]:
+        """
+        Decode a column to Python values for some rows.
+
+        Absent and null entries both come back as None.
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+        if name not in self.columns:
+            return [None] * len(rows)
+
+        kind = self.kind(name)
+        raw = self.column(name)[rows]
+
+        if kind in NUMERIC_KINDS:
+            values = raw.tolist()
+            missing = self.missing(name, rows)
+            if missing is not None:
+                for i in np.flatnonzero(missing).tolist():
+                    values[i] = None
+            return values
+
+        vocab = self.vocab(name)
+        if kind == "json":
+            vocab = [json.loads(v) for v in vocab]
+        return [vocab[code] if code >= 0 else None for code in raw.tolist()]
+
+    def features_at(self, indices: np.ndarray) -> List[Dict]:
+        """Rebuild GeoJSON Point features for the given rows (fresh dicts)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        lon = self.lon[indices].tolist()
+        lat = self.lat[indices].tolist()
+        n = len(indices)
+        properties: List[Dict] = [{} for _ in range(n)]
+
+        # Decode one column at a time, then scatter into the property dicts
+        for column in self.meta["columns"]:
+            name, path = column["name"], column["path"]
+            values = self.values(name, indices)
+            absent = self._mask(name, "absent", indices)
+            absent_rows = set(np.flatnonzero(absent).tolist()) if absent is not None else ()
+
+            for i in range(n):
+                if i in absent_rows:
+                    continue
+                target = properties[i]
+                for key in path[:-1]:
+                    target = target.setdefault(key, {})
+                target[path[-1]] = values[i]
+
+        return [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon[i], lat[i]]},
+                "properties": properties[i],
+            }
+            for i in range(n)
+        ]
+
+
+def open_sidecar(geojson_path: Union[str, Path]) -> Optional[ColumnarDataset]:
+    """Open the sidecar for a GeoJSON file, or None if missing, unreadable or stale."""
+    directory = sidecar_path(geojson_path)
+    if not (directory / META_FILE).exists():
+        return None
+    try:
+        dataset = ColumnarDataset(directory)
+    except (OSError, ValueError, KeyError):
+        return None
+    return dataset if dataset.is_current(geojson_path) else None
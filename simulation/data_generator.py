@@ -8,11 +8,15 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
 
 from .config import LOCATIONS, SIMULATION
 from .flight_paths import FlightPathGenerator
 from .trash_detector import TrashDetector
+from .columnar import write_columnar
+from .heatmap import build_pyramid, heatmap_intensity, priority_boost, save_pyramid
 
 
 class DataGenerator:
@@ -264,41 +268,27 @@ class DataGenerator:
         Returns:
             List of [lat, lon, intensity] values
         """
-        import math
-        heatmap_data = []
-
-        # Priority multipliers for intensity
-        priority_mult = {
-            "critical": 1.0,
-            "high": 0.75,
-            "medium": 0.5,
-            "low": 0.25
-        }
-
+        lon, lat, weight, priority = [], [], [], []
         for location_key, geojson in self.all_detections.items():
             for feature in geojson["features"]:
                 coords = feature["geometry"]["coordinates"]
-                weight = feature["properties"]["estimated_weight_kg"]
-                priority = feature["properties"].get("priority", "low")
-
-                # Base intensity from weight - spread across full gradient range
-                # Lightweight items (0-0.5kg): 0.05-0.3 intensity (blue/cyan)
-                # Medium items (0.5-2kg): 0.3-0.5 intensity (green/yellow-green)
-                # Large items (2-10kg): 0.5-0.75 intensity (yellow/orange)
-                # Heavy items (10+kg): 0.75-1.0 intensity (red)
-                if weight < 0.5:
-                    base_intensity = 0.05 + (weight / 0.5) * 0.25
-                elif weight < 2.0:
-                    base_intensity = 0.3 + ((weight - 0.5) / 1.5) * 0.2
-                elif weight < 10.0:
-                    base_intensity = 0.5 + ((weight - 2.0) / 8.0) * 0.25
-                else:
-                    base_intensity = 0.75 + min(0.25, (weight - 10.0) / 40.0)
-
-                # Adjust by priority - critical items bump up, low items stay low
-                priority_boost = priority_mult.get(priority, 0.25)
-                intensity = min(1.0, base_intensity * (0.6 + 0.4 * priority_boost))
-                heatmap_data.append([coords[1], coords[0], round(intensity, 3)])
+                lon.append(coords[0])
+                lat.append(coords[1])
+                weight.append(feature["properties"]["estimated_weight_kg"])
+                priority.append(feature["properties"].get("priority", "low"))
+
+        lon = np.array(lon, dtype=np.float64)
+        lat = np.array(lat, dtype=np.float64)
+        intensity = heatmap_intensity(weight, priority_boost(priority))
+        heatmap_data = [[y, x, round(i, 3)] for x, y, i in zip(lon.tolist(), lat.tolist(), intensity.tolist())]
+
+        # Pre-binned cells for every zoom, served by /api/heatmap?zoom=
+        source = self.detections_dir / "all_detections.geojson"
+        save_pyramid(
+            self.summary_dir / "heatmap_pyramid.npz",
+            build_pyramid(lon, lat, intensity),
+            source if source.exists() else None,
+        )
 
         heatmap_path = self.output_dir / "heatmap_data.json"
         with open(heatmap_path, "w") as f:
@@ -307,6 +297,42 @@ class DataGenerator:
         return heatmap_data
 
 
+def simulate_custom_path(custom_config: Dict, progress: Optional[Callable[[str, float], None]] = None) -> Dict:
+    """
+    Generate the flight path, detections and animation for a user-drawn route.
+
+    A plain module-level function so the API can run it in a worker process.
+
+    Args:
+        custom_config: Location-style config with waypoints, altitude and speed
+        progress: Optional callback, called with (stage, overall fraction done)
+
+    Returns:
+        Dictionary with flight_path (GeoJSON), detections (GeoJSON) and animation_data
+    """
+    report = progress or (lambda stage, fraction: None)
+
+    report("flight_path", 0.0)
+    generator = FlightPathGenerator(custom_config=custom_config)
+    generator.generate_path()
+    flight_path = generator.to_geojson()
+
+    report("detections", 0.1)
+    detector = TrashDetector("stinson_beach")
+    detections = detector.simulate_detections(
+        flight_path, custom_config, progress=lambda fraction: report("detections", 0.1 + 0.85 * fraction),
+    )
+
+    report("animation", 0.95)
+    animation_data = generator.to_animation_data()
+
+    return {
+        "flight_path": flight_path,
+        "detections": detections,
+        "animation_data": animation_data,
+    }
+
+
 def main():
     """Run data generation from command line."""
     import argparse
@@ -328,9 +354,23 @@ def main():
         choices=list(LOCATIONS.keys()),
         help="Generate data for specific location only"
     )
+    parser.add_argument(
+        "--columnar",
+        nargs="+",
+        metavar="FILE",
+        help="Only write column sidecars for existing detection GeoJSON files"
+    )
 
     args = parser.parse_args()
 
+    if args.columnar:
+        for file in args.columnar:
+            with open(file) as f:
+                collection = json.load(f)
+            directory = write_columnar(collection, file)
+            print(f"Wrote {directory} ({len(collection.get('features', []))} features)")
+        return
+
     generator = DataGenerator(output_dir=args.output)
 
     if args.location:
@@ -5,12 +5,12 @@ TamAir - Conrad Challenge 2026
 """
 
 import json
-import math
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
 import numpy as np
 
 from .config import LOCATIONS, DRONE_SPECS, SIMULATION
+from .geo import haversine, segment_lengths
 
 
 class FlightPathGenerator:
@@ -95,7 +95,7 @@ class FlightPathGenerator:
             })
 
             # Calculate time to traverse
-            distance = self._haversine_distance(lat, start_lon, lat, end_lon)
+            distance = haversine(lat, start_lon, lat, end_lon)
             travel_time = distance / speed
             current_time += timedelta(seconds=travel_time)
 
@@ -126,6 +126,8 @@ class FlightPathGenerator:
         start_time = datetime.fromisoformat(f"{SIMULATION['start_date']}T10:00:00")
         current_time = start_time
 
+        legs = segment_lengths([wp["lat"] for wp in base_waypoints], [wp["lon"] for wp in base_waypoints])
+
         for i, wp in enumerate(base_waypoints):
             waypoints.append({
                 "lat": wp["lat"],
@@ -140,12 +142,7 @@ class FlightPathGenerator:
 
             # Calculate time to next waypoint
             if i < len(base_waypoints) - 1:
-                next_wp = base_waypoints[i + 1]
-                distance = self._haversine_distance(
-                    wp["lat"], wp["lon"],
-                    next_wp["lat"], next_wp["lon"]
-                )
-                travel_time = distance / speed
+                travel_time = legs[i] / speed
                 current_time += timedelta(seconds=travel_time)
 
         # Interpolate intermediate points for ultra-smooth visualization
@@ -170,27 +167,23 @@ class FlightPathGenerator:
             return waypoints
 
         detailed = []
+        legs = segment_lengths([wp["lat"] for wp in waypoints], [wp["lon"] for wp in waypoints])
 
         for i in range(len(waypoints) - 1):
             wp1 = waypoints[i]
             wp2 = waypoints[i + 1]
 
-            distance = self._haversine_distance(
-                wp1["lat"], wp1["lon"],
-                wp2["lat"], wp2["lon"]
-            )
-
-            num_points = max(2, int(distance / interval_m))
+            num_points = max(2, int(legs[i] / interval_m))
+            t = np.arange(num_points) / num_points
+            lats = (wp1["lat"] + t * (wp2["lat"] - wp1["lat"])).tolist()
+            lons = (wp1["lon"] + t * (wp2["lon"] - wp1["lon"])).tolist()
 
-            for j in range(num_points):
-                t = j / num_points
-                lat = wp1["lat"] + t * (wp2["lat"] - wp1["lat"])
-                lon = wp1["lon"] + t * (wp2["lon"] - wp1["lon"])
+            t1 = datetime.fromisoformat(wp1["timestamp"])
+            span = (datetime.fromisoformat(wp2["timestamp"]) - t1).total_seconds()
 
+            for lat, lon, fraction in zip(lats, lons, t.tolist()):
                 # Interpolate timestamp
-                t1 = datetime.fromisoformat(wp1["timestamp"])
-                t2 = datetime.fromisoformat(wp2["timestamp"])
-                interp_time = t1 + timedelta(seconds=(t2 - t1).total_seconds() * t)
+                interp_time = t1 + timedelta(seconds=span * fraction)
 
                 detailed.append({
                     "lat": lat,
@@ -207,42 +200,13 @@ class FlightPathGenerator:
 
         return detailed
 
-    def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """
-        Calculate the great-circle distance between two points in meters.
-
-        Args:
-            lat1, lon1: First point coordinates
-            lat2, lon2: Second point coordinates
-
-        Returns:
-            Distance in meters
-        """
-        R = 6371000  # Earth's radius in meters
-
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-
-        a = (math.sin(delta_lat / 2) ** 2 +
-             math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-        return R * c
-
     def get_total_distance(self) -> float:
         """Calculate total flight path distance in meters."""
         if len(self.waypoints) < 2:
             return 0
 
-        total = 0
-        for i in range(len(self.waypoints) - 1):
-            total += self._haversine_distance(
-                self.waypoints[i]["lat"], self.waypoints[i]["lon"],
-                self.waypoints[i + 1]["lat"], self.waypoints[i + 1]["lon"]
-            )
-        return total
+        legs = segment_lengths([wp["lat"] for wp in self.waypoints], [wp["lon"] for wp in self.waypoints])
+        return sum(legs.tolist())
 
     def get_flight_duration(self) -> float:
         """Calculate total flight duration in seconds."""
@@ -0,0 +1,240 @@
+"""
+Sylva Geo Helpers
+Vectorized coordinate math shared by the simulation and the API
+TamAir - Conrad Challenge 2026
+"""
+
+import math
+from typing import Tuple, Union
+
+import numpy as np
+
+# Web Mercator is undefined at the poles; tiles stop at this latitude
+MAX_MERCATOR_LAT = 85.05112878
+
+TILE_SIZE = 256  # screen pixels per map tile
+
+EARTH_RADIUS_M = 6371000  # mean radius of the spherical earth model
+
+ArrayLike = Union[float, np.ndarray]
+
+
+# =============================================================================
+# GEODESIC DISTANCES
+# =============================================================================
+#
+# All functions take degrees and metres, accept scalars or arrays (broadcast
+# like any NumPy expression) and treat the earth as a sphere of radius
+# EARTH_RADIUS_M.
+#
+# Accuracy:
+# - The spherical model itself is within 0.5% of WGS84 geodesic distances
+#   (typically 0.1-0.3%), the same model the simulation has always used.
+# - haversine() is well conditioned at every distance; float64 rounding
+#   stays below a millimetre.
+# - equirectangular() projects around the pair's mean latitude. For points
+#   within 10 km of each other at |lat| <= 70 deg it is within 1e-6 of
+#   haversine() (1 cm); within 100 km, 1e-4 (about 10 m). It degrades near
+#   the poles and across the antimeridian - use it only to prefilter or
+#   compare short distances.
+#
+# Scalar calls pay NumPy's per-call overhead (a few microseconds); pass whole
+# arrays of points wherever a loop would otherwise call these per point.
+
+def haversine(lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike) -> np.ndarray:
+    """Great-circle distance in meters between (lat1, lon1) and (lat2, lon2)."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    delta_lat = np.radians(np.subtract(lat2, lat1))
+    delta_lon = np.radians(np.subtract(lon2, lon1))
+
+    a = np.sin(delta_lat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2) ** 2
+    return EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def pairwise_distances(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """
+    Distance matrix in meters between two sets of points.
+
+    Returns:
+        Array of shape (len(lat1), len(lat2)); [i, j] is point i to point j
+    """
+    lat1 = np.asarray(lat1, dtype=np.float64)[:, None]
+    lon1 = np.asarray(lon1, dtype=np.float64)[:, None]
+    return haversine(lat1, lon1, np.asarray(lat2, dtype=np.float64), np.asarray(lon2, dtype=np.float64))
+
+
+def segment_lengths(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Length in meters of each leg of a path (one shorter than the path)."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    return haversine(lat[:-1], lon[:-1], lat[1:], lon[1:])
+
+
+def bearing(lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike) -> np.ndarray:
+    """Initial great-circle bearing in degrees (0 = north, clockwise, [0, 360))."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    delta_lon = np.radians(np.subtract(lon2, lon1))
+
+    y = np.sin(delta_lon) * np.cos(lat2_rad)
+    x = np.cos(lat1_rad) * np.sin(lat2_rad) - np.sin(lat1_rad) * np.cos(lat2_rad) * np.cos(delta_lon)
+    return np.degrees(np.arctan2(y, x)) % 360.0
+
+
+def destination(lat: ArrayLike, lon: ArrayLike, bearing_deg: ArrayLike, distance_m: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Point reached by travelling distance_m along a great circle.
+
+    Returns:
+        (lat, lon) in degrees, lon normalized to [-180, 180)
+    """
+    lat_rad = np.radians(lat)
+    heading = np.radians(bearing_deg)
+    angular = np.asarray(distance_m, dtype=np.float64) / EARTH_RADIUS_M
+
+    dest_lat = np.arcsin(np.sin(lat_rad) * np.cos(angular) + np.cos(lat_rad) * np.sin(angular) * np.cos(heading))
+    dest_lon = np.radians(lon) + np.arctan2(
+        np.sin(heading) * np.sin(angular) * np.cos(lat_rad),
+        np.cos(angular) - np.sin(lat_rad) * np.sin(dest_lat),
+    )
+    return np.degrees(dest_lat), (np.degrees(dest_lon) + 540.0) % 360.0 - 180.0
+
+
+def pairs_within(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    center_lat: np.ndarray,
+    center_lon: np.ndarray,
+    radius_m: np.ndarray,
+    max_candidates: int = 1 << 20,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every (point, center) pair closer than that center's radius.
+
+    The sparse form of pairwise_distances(...) < radius_m: only pairs that
+    can be inside a radius are measured. Points are sorted along the axis
+    (north-south or east-west) with the larger spread and each center only
+    looks at the points within its radius along that axis, so a long path
+    against hundreds of small circles costs a few distances per circle
+    instead of the whole matrix. Distances are exact haversine() values.
+    Radii are meant to be small next to the earth (up to tens of km), and
+    points across the antimeridian from a center are not matched.
+
+    Args:
+        lat, lon: Points, shape (n,)
+        center_lat, center_lon, radius_m: Circles, shape (m,)
+        max_candidates: Pairs measured per batch, bounding memory when many
+            points fall in the same band (e.g. a dense cluster)
+
+    Returns:
+        (point_idx, center_idx, distance_m) arrays, grouped by center
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    center_lat = np.asarray(center_lat, dtype=np.float64)
+    center_lon = np.asarray(center_lon, dtype=np.float64)
+    radius_m = np.broadcast_to(np.asarray(radius_m, dtype=np.float64), center_lat.shape)
+    empty = np.empty(0, dtype=np.intp)
+    if lat.size == 0 or center_lat.size == 0:
+        return empty, empty, np.empty(0)
+
+    # Band half-widths in degrees; distance along a meridian never exceeds the
+    # great-circle distance, and a parallel only by a tiny amount at these
+    # radii, which the 1% margin covers
+    half_lat = np.degrees(radius_m / EARTH_RADIUS_M) * 1.01
+    cos_lat = np.cos(np.radians(np.minimum(np.abs(center_lat) + half_lat, 89.0)))
+    half_lon = half_lat / cos_lat
+    lat_spread = np.ptp(lat)
+    lon_spread = np.ptp(lon) * float(np.cos(np.radians(np.abs(lat).max())))
+    if lat_spread >= lon_spread:
+        axis, center_axis, half = lat, center_lat, half_lat
+    else:
+        axis, center_axis, half = lon, center_lon, half_lon
+
+    order = np.argsort(axis, kind="stable")
+    sorted_axis = axis[order]
+    lo = np.searchsorted(sorted_axis, center_axis - half, side="left")
+    hi = np.searchsorted(sorted_axis, center_axis + half, side="right")
+    counts = hi - lo
+
+    point_parts, center_parts, distance_parts = [], [], []
+    start = 0
+    ends = np.cumsum(counts)
+    while start < center_lat.size:
+        # Take centers until the batch holds max_candidates pairs (at least one center)
+        base = ends[start - 1] if start else 0
+        stop = max(start + 1, int(np.searchsorted(ends, base + max_candidates, side="right")))
+        batch = np.arange(start, stop)
+        batch_counts = counts[batch]
+        center_idx = np.repeat(batch, batch_counts)
+        offsets = np.arange(center_idx.size) - np.repeat(np.cumsum(batch_counts) - batch_counts, batch_counts)
+        point_idx = order[lo[center_idx] + offsets]
+
+        distance = haversine(lat[point_idx], lon[point_idx], center_lat[center_idx], center_lon[center_idx])
+        inside = distance < radius_m[center_idx]
+        point_parts.append(point_idx[inside])
+        center_parts.append(center_idx[inside])
+        distance_parts.append(distance[inside])
+        start = stop
+
+    return np.concatenate(point_parts), np.concatenate(center_parts), np.concatenate(distance_parts)
+
+
+def equirectangular(lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike) -> np.ndarray:
+    """Fast approximate distance in meters (see the accuracy notes above)."""
+    x = np.radians(np.subtract(lon2, lon1)) * np.cos(np.radians(np.add(lat1, lat2) / 2))
+    y = np.radians(np.subtract(lat2, lat1))
+    return EARTH_RADIUS_M * np.hypot(x, y)
+
+
+# =============================================================================
+# WEB MERCATOR TILES
+# =============================================================================
+
+def tile_bounds(z: int, x: int, y: int, buffer: float = 0.0) -> Tuple[float, float, float, float]:
+    """
+    Geographic bounds of an XYZ tile.
+
+    Args:
+        z, x, y: Tile address
+        buffer: Extra margin as a fraction of the tile size
+
+    Returns:
+        (west, south, east, north) in degrees
+    """
+    n = 2 ** z
+    west = (x - buffer) / n * 360.0 - 180.0
+    east = (x + 1 + buffer) / n * 360.0 - 180.0
+    north = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y - buffer) / n))))
+    south = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1 + buffer) / n))))
+    return max(west, -180.0), max(south, -90.0), min(east, 180.0), min(north, 90.0)
+
+
+def world_pixels(lon: np.ndarray, lat: np.ndarray, zoom: int, tile_size: int = TILE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """Global Web Mercator pixel coordinates at a zoom level ((0, 0) is the north-west corner)."""
+    world = tile_size * (2 ** zoom)
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)
+    sin_lat = np.sin(np.radians(lat))
+    x = (lon + 180.0) / 360.0 * world
+    y = (0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * np.pi)) * world
+    return x, y
+
+
+def lonlat_to_tile_pixels(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    z: int,
+    x: int,
+    y: int,
+    extent: int = 4096,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Project lon/lat onto the local pixel grid of a tile.
+
+    (0, 0) is the tile's top-left corner and (extent, extent) its bottom-right;
+    points outside the tile get coordinates outside that range.
+    """
+    px, py = world_pixels(lon, lat, z, extent)
+    return px - x * extent, py - y * extent
@@ -0,0 +1,155 @@
+"""
+Sylva Heatmap
+Detection intensity curve and zoom-aware grid binning for density heatmaps
+TamAir - Conrad Challenge 2026
+"""
+
+import io
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .geo import world_pixels
+
+# Priority multipliers for intensity
+PRIORITY_INTENSITY = {
+    "critical": 1.0,
+    "high": 0.75,
+    "medium": 0.5,
+    "low": 0.25,
+}
+
+HEATMAP_CELL_PX = 16  # screen pixels per heatmap cell side
+PYRAMID_MAX_ZOOM = 16  # deeper zooms are binned on request (they always come with a small bbox)
+MAX_HEATMAP_ZOOM = 22
+
+
+def priority_boost(priorities: Sequence[str]) -> np.ndarray:
+    """Intensity multiplier per priority (unknown priorities count as low)."""
+    return np.array([PRIORITY_INTENSITY.get(p, 0.25) for p in priorities], dtype=np.float64)
+
+
+def heatmap_intensity(weight: np.ndarray, boost: np.ndarray) -> np.ndarray:
+    """
+    Intensity (0-1) for each detection from its weight and priority boost.
+
+    Base intensity spreads weights across the full gradient range:
+    - Lightweight items (0-0.5kg): 0.05-0.3 intensity (blue/cyan)
+    - Medium items (0.5-2kg): 0.3-0.5 intensity (green/yellow-green)
+    - Large items (2-10kg): 0.5-0.75 intensity (yellow/orange)
+    - Heavy items (10+kg): 0.75-1.0 intensity (red)
+
+    Critical items are then bumped up and low-priority items stay low.
+
+    Args:
+        weight: Estimated weight in kg
+        boost: Output of priority_boost
+    """
+    weight = np.asarray(weight, dtype=np.float64)
+    base = np.select(
+        [weight < 0.5, weight < 2.0, weight < 10.0],
+        [
+            0.05 + (weight / 0.5) * 0.25,
+            0.3 + ((weight - 0.5) / 1.5) * 0.2,
+            0.5 + ((weight - 2.0) / 8.0) * 0.25,
+        ],
+        0.75 + np.minimum(0.25, (weight - 10.0) / 40.0),
+    )
+    return np.minimum(1.0, base * (0.6 + 0.4 * boost))
+
+
+def bin_heatmap(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    intensity: np.ndarray,
+    zoom: int,
+    cell_px: int = HEATMAP_CELL_PX,
+) -> np.ndarray:
+    """
+    Sum intensity into square screen-space cells for one zoom level.
+
+    Each cell is placed at the intensity-weighted centroid of its detections,
+    so sparse areas keep their real positions.
+
+    Cell values are sums of per-detection intensities (each 0-1), so they are
+    unbounded: a cell holding n detections can reach n, and low zooms, where
+    cells cover more ground, routinely exceed 1. Clients should scale the
+    gradient to the largest value in view.
+
+    Returns:
+        (k, 3) array of [lat, lon, summed intensity], one row per occupied cell
+    """
+    if not len(lon):
+        return np.empty((0, 3))
+
+    x, y = world_pixels(lon, lat, zoom)
+    cx = np.floor(x / cell_px).astype(np.int64)
+    cy = np.floor(y / cell_px).astype(np.int64)
+    keys = cy * (int(cx.max()) + 1) + cx
+    _, cell = np.unique(keys, return_inverse=True)
+    cell = cell.reshape(-1)
+
+    total = np.bincount(cell, weights=intensity)
+    # Fall back to a plain mean for cells whose intensity sums to zero
+    weights = np.where(total[cell] > 0, intensity, 1.0)
+    norm = np.bincount(cell, weights=weights)
+    cell_lat = np.bincount(cell, weights=lat * weights) / norm
+    cell_lon = np.bincount(cell, weights=lon * weights) / norm
+    return np.column_stack([cell_lat, cell_lon, total])
+
+
+def build_pyramid(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    intensity: np.ndarray,
+    max_zoom: int = PYRAMID_MAX_ZOOM,
+) -> Dict[int, np.ndarray]:
+    """Bin detections at every zoom from 0 to max_zoom (cell values are unbounded sums, see bin_heatmap)."""
+    return {zoom: bin_heatmap(lon, lat, intensity, zoom) for zoom in range(max_zoom + 1)}
+
+
+def save_pyramid(path: Union[str, Path], pyramid: Dict[int, np.ndarray], source: Optional[Union[str, Path]] = None):
+    """
+    Write a pyramid as an .npz with one z<zoom> array per level.
+
+    Args:
+        source: Detection file the pyramid was built from; its mtime and size
+            are stored so readers can detect a stale pyramid
+    """
+    arrays = {f"z{zoom}": cells for zoom, cells in pyramid.items()}
+    if source is not None:
+        stat = Path(source).stat()
+        arrays["source"] = np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+    np.savez_compressed(path, **arrays)
+
+
+def load_pyramid(data: bytes) -> Tuple[Dict[int, np.ndarray], Optional[Tuple[int, int]]]:
+    """
+    Read a pyramid written by save_pyramid.
+
+    Returns:
+        Tuple of ({zoom: cells}, (source mtime_ns, size) or None)
+    """
+    with np.load(io.BytesIO(data)) as npz:
+        levels = {int(name[1:]): npz[name] for name in npz.files if name.startswith("z")}
+        source = tuple(npz["source"].tolist()) if "source" in npz.files else None
+    return levels, source
+
+
+def cells_in_bbox(cells: np.ndarray, bbox: Optional[Tuple[float, float, float, float]]) -> np.ndarray:
+    """Keep cells whose position lies inside (west, south, east, north)."""
+    if bbox is None or not len(cells):
+        return cells
+    west, south, east, north = bbox
+    lat, lon = cells[:, 0], cells[:, 1]
+    in_lon = (lon >= west) & (lon <= east) if west <= east else (lon >= west) | (lon <= east)
+    return cells[in_lon & (lat >= south) & (lat <= north)]
+
+
+def cells_to_list(cells: np.ndarray) -> List[List[float]]:
+    """[[lat, lon, intensity], ...] rounded for JSON."""
+    return [
+        [round(lat, 6), round(lon, 6), round(total, 3)]
+        for lat, lon, total in cells.tolist()
+    ]
@@ -9,7 +9,7 @@ import math
 import random
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
 import numpy as np
 
 from .config import (
@@ -19,6 +19,11 @@ from .config import (
     LOCATIONS,
     SIMULATION,
 )
+from .clustering import ClusterIndex, PRIORITY_RANK
+from .geo import haversine, pairs_within, segment_lengths
+
+# Zoom level used for the *_clusters.geojson files
+CLUSTER_FILE_ZOOM = 13
 
 
 class TrashDetector:
@@ -45,6 +50,7 @@ class TrashDetector:
         np.random.seed(self.seed)
 
         self.detections = []
+        self._hotspot_cache = None  # (hotspots list, its length, arrays) - see _hotspot_arrays
 
         # Define hotspot areas (areas with higher trash density)
         self._define_hotspots()
@@ -362,24 +368,64 @@ class TrashDetector:
                 },
             ]
 
-    def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two points in meters."""
-        R = 6371000
-        lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
+    def _hotspot_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Hotspot lat, lon, radius_m and multiplier as arrays, in self.hotspots order.
+
+        Rebuilt when self.hotspots is replaced or grows; edit hotspots by
+        replacing or appending to the list, not by changing them in place.
+        """
+        cache = self._hotspot_cache
+        if cache is None or cache[0] is not self.hotspots or cache[1] != len(self.hotspots):
+            arrays = tuple(
+                np.array([hotspot[key] for hotspot in self.hotspots], dtype=np.float64)
+                for key in ("lat", "lon", "radius_m", "multiplier")
+            )
+            cache = self._hotspot_cache = (self.hotspots, len(self.hotspots), arrays)
+        return cache[2]
+
+    def _hotspot_distances(self, lat: float, lon: float) -> List[float]:
+        """Distance in meters from a point to each hotspot, in self.hotspots order."""
+        if not self.hotspots:
+            return []
+        hotspot_lats, hotspot_lons, _, _ = self._hotspot_arrays()
+        return haversine(lat, lon, hotspot_lats, hotspot_lons).tolist()
+
+    def _hotspot_weights(self, waypoints: List[Dict], base_weight: float) -> np.ndarray:
+        """
+        Detection weight of each waypoint from its nearest-peaking hotspot.
 
-        a = (math.sin(delta_lat / 2) ** 2 +
-             math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
+        A waypoint within a hotspot's radius gets (1 - distance / radius) *
+        multiplier from it; the weight is the largest of these and base_weight.
+        Only waypoint/hotspot pairs that can be in range are measured (see
+        geo.pairs_within), so dense paths with hundreds of hotspots stay cheap.
+        """
+        weights = np.full(len(waypoints), base_weight, dtype=np.float64)
+        if not self.hotspots or not waypoints:
+            return weights
+
+        hotspot_lats, hotspot_lons, radii, multipliers = self._hotspot_arrays()
+        point_idx, hotspot_idx, distances = pairs_within(
+            [wp["lat"] for wp in waypoints], [wp["lon"] for wp in waypoints],
+            hotspot_lats, hotspot_lons, radii,
+        )
+        # Higher weight near hotspot centers
+        factors = 1 - (distances / radii[hotspot_idx])
+        np.maximum.at(weights, point_idx, factors * multipliers[hotspot_idx])
+        return weights
 
-    def _get_density_multiplier(self, lat: float, lon: float) -> float:
-        """Get detection density multiplier based on proximity to hotspots."""
+    def _get_density_multiplier(self, lat: float, lon: float, distances: Optional[List[float]] = None) -> float:
+        """
+        Get detection density multiplier based on proximity to hotspots.
+
+        Args:
+            distances: This point's _hotspot_distances(), if already computed
+        """
+        if distances is None:
+            distances = self._hotspot_distances(lat, lon)
         max_multiplier = 1.0
 
-        for hotspot in self.hotspots:
-            distance = self._haversine_distance(lat, lon, hotspot["lat"], hotspot["lon"])
+        for hotspot, distance in zip(self.hotspots, distances):
             if distance < hotspot["radius_m"]:
                 # Linear falloff from center
                 factor = 1 - (distance / hotspot["radius_m"])
@@ -388,16 +434,23 @@ class TrashDetector:
 
         return max_multiplier
 
-    def _select_category(self, lat: float = None, lon: float = None) -> str:
-        """Select a trash category based on environment and hotspot-specific probabilities."""
+    def _select_category(self, lat: float = None, lon: float = None,
+                         distances: Optional[List[float]] = None) -> str:
+        """
+        Select a trash category based on environment and hotspot-specific probabilities.
+
+        Args:
+            distances: This point's _hotspot_distances(), if already computed
+        """
         prob_key = f"{self.env_type}_probability"
         categories = list(TRASH_CATEGORIES.keys())
         probabilities = [TRASH_CATEGORIES[cat][prob_key] for cat in categories]
 
         # Check if we're in a hotspot with specific trash types
         if lat is not None and lon is not None:
-            for hotspot in self.hotspots:
-                distance = self._haversine_distance(lat, lon, hotspot["lat"], hotspot["lon"])
+            if distances is None:
+                distances = self._hotspot_distances(lat, lon)
+            for hotspot, distance in zip(self.hotspots, distances):
                 if distance < hotspot["radius_m"] and "primary_trash" in hotspot:
                     # Boost probabilities for primary trash types in this hotspot
                     for i, cat in enumerate(categories):
@@ -412,7 +465,9 @@ class TrashDetector:
 
     def _generate_detection(self, lat: float, lon: float, timestamp: str, flight_id: str) -> Dict:
         """Generate a single trash detection with all metadata including Water Risk Score."""
-        category = self._select_category(lat, lon)
+        # Measured once, shared by the category boost and the hotspot density score
+        distances = self._hotspot_distances(lat, lon)
+        category = self._select_category(lat, lon, distances)
         cat_data = TRASH_CATEGORIES[category]
 
         # Generate size with some variation
@@ -428,7 +483,7 @@ class TrashDetector:
         confidence = np.random.uniform(conf_min, conf_max)
 
         # Calculate priority using Water Risk Scoring Algorithm
-        priority, score_breakdown = self._calculate_priority(lat, lon, weight, size, category)
+        priority, score_breakdown = self._calculate_priority(lat, lon, weight, size, category, distances)
 
         # Add small random offset to exact position (simulating detection uncertainty)
         lat_offset = np.random.uniform(-0.00005, 0.00005)
@@ -467,7 +522,8 @@ class TrashDetector:
             },
         }
 
-    def _calculate_priority(self, lat: float, lon: float, weight: float, size: float, category: str = None) -> Tuple[str, Dict]:
+    def _calculate_priority(self, lat: float, lon: float, weight: float, size: float, category: str = None,
+                            hotspot_distances: Optional[List[float]] = None) -> Tuple[str, Dict]:
         """
         Calculate priority level using Sylva's Water Risk Scoring Algorithm.
 
@@ -555,7 +611,7 @@ class TrashDetector:
 
         # 4. ENVIRONMENTAL CONTEXT SCORE (0-10 points)
         env_score = 0
-        density_mult = self._get_density_multiplier(lat, lon)
+        density_mult = self._get_density_multiplier(lat, lon, hotspot_distances)
 
         if density_mult > 3:
             env_score += 5  # In a major hotspot
@@ -621,25 +677,13 @@ class TrashDetector:
 
         # Distribute detections across the path, weighted by hotspots
         # First, calculate detection probability at each waypoint
-        detection_weights = []
-        for wp in waypoints:
-            weight = 0.1  # Base probability (very low outside hotspots)
-
-            # Check proximity to hotspots
-            for hotspot in self.hotspots:
-                distance = self._haversine_distance(wp["lat"], wp["lon"],
-                                                    hotspot["lat"], hotspot["lon"])
-                if distance < hotspot["radius_m"]:
-                    # Higher weight near hotspot centers
-                    factor = 1 - (distance / hotspot["radius_m"])
-                    weight = max(weight, factor * hotspot["multiplier"])
-
-            detection_weights.append(weight)
+        # (base probability 0.1 - very low outside hotspots)
+        detection_weights = self._hotspot_weights(waypoints, 0.1)
 
         # Normalize weights to probabilities
-        total_weight = sum(detection_weights)
+        total_weight = sum(detection_weights.tolist())
         if total_weight > 0:
-            probs = [w / total_weight for w in detection_weights]
+            probs = detection_weights / total_weight
         else:
             probs = [1 / total_waypoints] * total_waypoints
 
@@ -687,19 +731,17 @@ class TrashDetector:
         """
         zones = []
 
+        det_lons = np.array([det["geometry"]["coordinates"][0] for det in self.detections], dtype=np.float64)
+        det_lats = np.array([det["geometry"]["coordinates"][1] for det in self.detections], dtype=np.float64)
+
         # Create analysis zones from hotspots that have detections nearby
         for hotspot in self.hotspots:
             # Count detections near this hotspot
             nearby_detections = []
             total_weight = 0
 
-            for det in self.detections:
-                coords = det["geometry"]["coordinates"]
-                det_lat, det_lon = coords[1], coords[0]
-                distance = self._haversine_distance(
-                    det_lat, det_lon,
-                    hotspot["lat"], hotspot["lon"]
-                )
+            distances = haversine(det_lats, det_lons, hotspot["lat"], hotspot["lon"]).tolist()
+            for det, distance in zip(self.detections, distances):
                 if distance < hotspot["radius_m"] * 1.5:
                     nearby_detections.append(det)
                     total_weight += det["properties"]["estimated_weight_kg"]
@@ -771,9 +813,7 @@ class TrashDetector:
 
             # Don't place micro-cluster too close to existing hotspots
             too_close = False
-            for hotspot in self.hotspots:
-                dist = self._haversine_distance(wp["lat"], wp["lon"],
-                                                hotspot["lat"], hotspot["lon"])
+            for hotspot, dist in zip(self.hotspots, self._hotspot_distances(wp["lat"], wp["lon"])):
                 if dist < hotspot["radius_m"] * 1.5:
                     too_close = True
                     break
@@ -834,12 +874,12 @@ class TrashDetector:
             "environment_type": self.env_type,
         }
 
-    def get_clusters(self, eps_meters: float = 50, min_samples: int = 5) -> List[Dict]:
+    def get_clusters(self, zoom: int = CLUSTER_FILE_ZOOM, min_samples: int = 3) -> List[Dict]:
         """
-        Identify high-density trash clusters using a simple clustering approach.
+        Identify high-density trash clusters at one level of the zoom-level cluster index.
 
         Args:
-            eps_meters: Maximum distance between points in a cluster
+            zoom: Map zoom whose cluster cells to use (13 is roughly 1 km cells)
             min_samples: Minimum points to form a cluster
 
         Returns:
@@ -848,66 +888,47 @@ class TrashDetector:
         if len(self.detections) < min_samples:
             return []
 
-        # Simple grid-based clustering
-        grid_size = eps_meters / 111320  # Convert meters to degrees (approximate)
-        grid_cells = {}
-
-        for det in self.detections:
-            coords = det["geometry"]["coordinates"]
-            lon, lat = coords[0], coords[1]
-
-            # Assign to grid cell
-            cell_x = int(lon / grid_size)
-            cell_y = int(lat / grid_size)
-            cell_key = (cell_x, cell_y)
-
-            if cell_key not in grid_cells:
-                grid_cells[cell_key] = []
-            grid_cells[cell_key].append(det)
+        index = ClusterIndex(
+            [d["geometry"]["coordinates"][0] for d in self.detections],
+            [d["geometry"]["coordinates"][1] for d in self.detections],
+            [d["properties"]["estimated_weight_kg"] for d in self.detections],
+            [d["properties"]["priority"] for d in self.detections],
+        )
 
-        # Find significant clusters
         clusters = []
-        for cell_key, cell_detections in grid_cells.items():
-            if len(cell_detections) >= min_samples:
-                # Calculate cluster center and stats
-                lats = [d["geometry"]["coordinates"][1] for d in cell_detections]
-                lons = [d["geometry"]["coordinates"][0] for d in cell_detections]
-                weights = [d["properties"]["estimated_weight_kg"] for d in cell_detections]
-
-                center_lat = sum(lats) / len(lats)
-                center_lon = sum(lons) / len(lons)
-
-                # Determine cluster priority
-                total_weight = sum(weights)
-                density = len(cell_detections) / (grid_size * grid_size * 111320 * 111320 / 10000)  # per 100m²
-
-                if density > PRIORITY_THRESHOLDS["critical"]["min_density"]:
-                    priority = "critical"
-                elif density > PRIORITY_THRESHOLDS["high"]["min_density"]:
-                    priority = "high"
-                elif density > PRIORITY_THRESHOLDS["medium"]["min_density"]:
-                    priority = "medium"
-                else:
-                    priority = "low"
+        for cluster in sorted(index.query(zoom), key=lambda c: -c["count"]):
+            if cluster["count"] < min_samples:
+                continue
 
-                clusters.append({
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [center_lon, center_lat],
-                    },
-                    "properties": {
-                        "cluster_id": f"CLU-{len(clusters)+1:03d}",
-                        "detection_count": len(cell_detections),
-                        "total_weight_kg": round(total_weight, 2),
-                        "density_per_100m2": round(density, 2),
-                        "priority": priority,
-                        "radius_m": eps_meters,
-                    },
-                })
+            cell_m = index.cell_size_m(zoom, cluster["lat"])
+            density = cluster["count"] / (cell_m * cell_m / 100)  # per 100m²
+            total_weight = cluster["weight"]
 
-        # Sort by detection count
-        clusters.sort(key=lambda x: -x["properties"]["detection_count"])
+            # Priority from density or total weight, never below the worst item found
+            priority = "low"
+            for level in ("critical", "high", "medium"):
+                thresholds = PRIORITY_THRESHOLDS[level]
+                if density > thresholds["min_density"] or total_weight >= thresholds["min_weight"]:
+                    priority = level
+                    break
+            if PRIORITY_RANK[cluster["priority"]] > PRIORITY_RANK[priority]:
+                priority = cluster["priority"]
+
+            clusters.append({
+                "type": "Feature",
+                "geometry": {
+                    "type": "Point",
+                    "coordinates": [cluster["lon"], cluster["lat"]],
+                },
+                "properties": {
+                    "cluster_id": f"CLU-{len(clusters)+1:03d}",
+                    "detection_count": cluster["count"],
+                    "total_weight_kg": round(total_weight, 2),
+                    "density_per_100m2": round(density, 4),
+                    "priority": priority,
+                    "radius_m": round(cell_m / 2, 1),
+                },
+            })
 
         return clusters
 
@@ -923,7 +944,8 @@ class TrashDetector:
             },
         }
 
-    def simulate_detections(self, flight_path: Dict, config: Dict) -> Dict:
+    def simulate_detections(self, flight_path: Dict, config: Dict,
+                            progress: Optional[Callable[[float], None]] = None) -> Dict:
         """
         Generate detections for a custom flight path.
         Used for user-drawn custom paths.
@@ -936,6 +958,7 @@ class TrashDetector:
         Args:
             flight_path: GeoJSON flight path with LineString
             config: Custom configuration dict
+            progress: Optional callback, called with the fraction (0-1) done
 
         Returns:
             GeoJSON FeatureCollection of detections
@@ -959,22 +982,16 @@ class TrashDetector:
             # Fallback to simulation start date for consistency
             start_time = datetime.fromisoformat(f"{SIMULATION['start_date']}T10:00:00")
 
-        elapsed_seconds = 0
-
         if flight_path.get("features"):
             for feature in flight_path["features"]:
                 if feature["geometry"]["type"] == "LineString":
                     coords = feature["geometry"]["coordinates"]
-                    for i, coord in enumerate(coords):
-                        # Calculate elapsed time based on distance from previous point
-                        if i > 0:
-                            prev_coord = coords[i - 1]
-                            distance = self._haversine_distance(
-                                prev_coord[1], prev_coord[0],
-                                coord[1], coord[0]
-                            )
-                            elapsed_seconds += distance / speed
-
+                    if not coords:
+                        continue
+                    # Elapsed time at each point, from the distance flown so far
+                    lon_lat = np.asarray(coords, dtype=np.float64)
+                    elapsed = np.concatenate(([0.0], np.cumsum(segment_lengths(lon_lat[:, 1], lon_lat[:, 0]) / speed)))
+                    for coord, elapsed_seconds in zip(coords, elapsed.tolist()):
                         timestamp = start_time + timedelta(seconds=elapsed_seconds)
 
                         waypoints.append({
@@ -1008,7 +1025,7 @@ class TrashDetector:
 
         # Generate detections with higher count for custom paths
         flight_id = f"CUSTOM-{uuid.uuid4().hex[:6].upper()}"
-        detections = self._generate_custom_path_detections(waypoints, flight_id, config)
+        detections = self._generate_custom_path_detections(waypoints, flight_id, config, progress)
 
         return {
             "type": "FeatureCollection",
@@ -1020,7 +1037,8 @@ class TrashDetector:
             },
         }
 
-    def _generate_custom_path_detections(self, waypoints: List[Dict], flight_id: str, config: Dict) -> List[Dict]:
+    def _generate_custom_path_detections(self, waypoints: List[Dict], flight_id: str, config: Dict,
+                                         progress: Optional[Callable[[float], None]] = None) -> List[Dict]:
         """
         Generate detections for custom paths with smart placement.
 
@@ -1036,27 +1054,17 @@ class TrashDetector:
         if len(waypoints) == 0:
             return detections
 
-        # Calculate detection probability at each waypoint
-        detection_weights = []
-        for i, wp in enumerate(waypoints):
-            weight = 0.3  # Base probability
+        report = progress or (lambda fraction: None)
 
-            # Check proximity to hotspots
-            for hotspot in self.hotspots:
-                distance = self._haversine_distance(
-                    wp["lat"], wp["lon"],
-                    hotspot["lat"], hotspot["lon"]
-                )
-                if distance < hotspot["radius_m"]:
-                    factor = 1 - (distance / hotspot["radius_m"])
-                    weight = max(weight, factor * hotspot["multiplier"])
-
-            detection_weights.append(weight)
+        # Calculate detection probability at each waypoint (base probability 0.3)
+        report(0.0)
+        detection_weights = self._hotspot_weights(waypoints, 0.3)
+        report(0.1)
 
         # Normalize weights
-        total_weight = sum(detection_weights)
+        total_weight = sum(detection_weights.tolist())
         if total_weight > 0:
-            probs = [w / total_weight for w in detection_weights]
+            probs = detection_weights / total_weight
         else:
             probs = [1 / len(waypoints)] * len(waypoints)
 
@@ -1071,7 +1079,8 @@ class TrashDetector:
         # Generate detections with controlled offset (along path, not into water)
         corridor_width = 30  # meters - narrow corridor along path
 
-        for idx in sorted(selected_indices):
+        for n, idx in enumerate(sorted(selected_indices)):
+            report(0.1 + 0.9 * n / len(selected_indices))
             wp = waypoints[idx]
             lat, lon = wp["lat"], wp["lon"]
             timestamp = wp["timestamp"]